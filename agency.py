@@ -13,6 +13,7 @@ from agents.WebBrowserAgent.WebBrowserAgent import WebBrowserAgent
 from agents.PersonalAssistant.PersonalAssistant import PersonalAssistant
 from agents.WebBrowserAgent.tools.visual_qa import visualizer
 from agents.WebBrowserAgent.tools.text_inspector_tool import TextInspectorTool
+from agents.utils.mdconvert import ConversionCache
 from basic_tools import MarkdownToExcel
 import os
 from dotenv import load_dotenv
@@ -23,7 +24,12 @@ load_dotenv()
 model = LiteLLMModel(model_id=os.getenv('SMART_MODEL'), token=os.getenv('GEMINI_API_KEY'))
 
 text_limit = 100000
-document_inspection_tool = TextInspectorTool(model, text_limit)
+# Files are inspected in this many worker processes, which are killed if a conversion hangs or exhausts memory
+isolation_workers = 2
+conversion_cache = ConversionCache(os.path.join(".cache", "mdconvert"))
+document_inspection_tool = TextInspectorTool(
+    model, text_limit, conversion_cache=conversion_cache, isolation_workers=isolation_workers
+)
 
 AUTHORIZED_IMPORTS = [
     "requests",
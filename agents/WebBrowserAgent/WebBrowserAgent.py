@@ -12,6 +12,7 @@ from .tools.text_web_browser import (
     ArchiveSearchTool,
     FinderTool,
     FindNextTool,
+    GoToSectionTool,
     PageDownTool,
     PageUpTool,
     SearchInformationTool,
@@ -19,6 +20,8 @@ from .tools.text_web_browser import (
     VisitTool,
 )
 from .tools.visual_qa import VisualQATool
+from ..utils.http_cache import HttpCache
+from ..utils.mdconvert import ConversionCache
 
 # Load environment variables
 load_dotenv()
@@ -49,6 +52,7 @@ BROWSER_CONFIG = {
         "timeout": 300,
     },
     "zenrows_key": os.getenv("ZENROWS_API_KEY"),
+    "prefetch_results": 3,
 }
 
 os.makedirs(f"./{BROWSER_CONFIG['downloads_folder']}", exist_ok=True)
@@ -58,10 +62,20 @@ model = LiteLLMModel(model_id=os.getenv('SMART_MODEL'), token=os.getenv('GEMINI_
 
 args = parse_args()
 text_limit = 100000
+# Files are inspected in this many worker processes, which are killed if a conversion hangs or exhausts memory
+isolation_workers = 2
 
-document_inspection_tool = TextInspectorTool(model, text_limit)
+# Converted pages and files are reused across sessions
+conversion_cache = ConversionCache(os.path.join(".cache", "mdconvert"))
 
-browser = SimpleTextBrowser(**BROWSER_CONFIG)
+document_inspection_tool = TextInspectorTool(
+    model, text_limit, conversion_cache=conversion_cache, isolation_workers=isolation_workers
+)
+
+# Fetched pages are replayed while fresh, and revalidated once stale
+http_cache = HttpCache(os.path.join(".cache", "http"))
+
+browser = SimpleTextBrowser(**BROWSER_CONFIG, http_cache=http_cache, conversion_cache=conversion_cache)
 
 WEB_TOOLS = [
     SearchInformationTool(browser),
@@ -70,8 +84,9 @@ WEB_TOOLS = [
     PageDownTool(browser),
     FinderTool(browser),
     FindNextTool(browser),
+    GoToSectionTool(browser),
     ArchiveSearchTool(browser),
-    TextInspectorTool(model, text_limit),
+    TextInspectorTool(model, text_limit, conversion_cache=conversion_cache, isolation_workers=isolation_workers),
     VisualQATool(),
 ]
 
@@ -0,0 +1,340 @@
+import asyncio
+import concurrent.futures
+import functools
+import mimetypes
+import os
+import pathlib
+import threading
+from typing import Any, Callable, Coroutine, Dict, List, Optional, TypeVar, Union
+from urllib.parse import unquote
+
+import httpx
+import requests
+
+from smolagents import Tool
+
+from agents.utils.http_cache import HttpCache
+from agents.utils.http_client import cookie_header, wrap_httpx_response
+from agents.utils.mdconvert import (
+    ConversionCache,
+    FileConversionException,
+    UnsupportedFormatException,
+)
+from .text_web_browser import (
+    ArchiveSearchTool,
+    DownloadTool,
+    FindNextTool,
+    FinderTool,
+    GoToSectionTool,
+    PageDownTool,
+    PageUpTool,
+    SearchInformationTool,
+    SimpleTextBrowser,
+    VisitTool,
+)
+
+T = TypeVar("T")
+
+
+class AsyncTextBrowser(SimpleTextBrowser):
+    """
+    An asyncio counterpart of SimpleTextBrowser, with the same viewport, find and history behavior.
+
+    Pages, searches and downloads are fetched with an `httpx.AsyncClient`, and documents are converted in an executor
+    (and, with isolation workers, in worker processes), so that a slow host or document only holds up its own
+    session. Many browsers can share one event loop and one client. `set_address` and `visit_page` are coroutines;
+    synchronous code, like smolagents tools running in an agent's thread, drives them with `run`.
+    """
+
+    def __init__(
+        self,
+        viewport_size: Optional[int] = 1024 * 8,
+        downloads_folder: Optional[Union[str, None]] = None,
+        zenrows_key: Optional[Union[str, None]] = None,
+        request_kwargs: Optional[Union[Dict[str, Any], None]] = None,
+        http_cache: Optional[HttpCache] = None,
+        conversion_cache: Optional[ConversionCache] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        isolation_workers: int = 0,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        """
+        Initialize the browser on a blank page.
+
+        Args:
+            client: The client to send requests with, which browsers on the same event loop may share. Defaults to one
+                of the browser's own, created on first use
+            executor: The executor documents are converted in. Defaults to the event loop's default executor
+            isolation_workers: The number of worker processes documents are converted in, or 0 to convert them in
+                the executor's threads. Defaults to 0
+            loop: The event loop `run` schedules coroutines on. Defaults to a loop of the browser's own, running in a
+                background thread
+        """
+        request_kwargs = request_kwargs if request_kwargs is not None else {}
+        super().__init__(
+            None,
+            viewport_size,
+            downloads_folder,
+            zenrows_key,
+            request_kwargs,
+            http_cache,
+            conversion_cache=conversion_cache,
+            isolation_workers=isolation_workers,
+        )
+        self._client = client
+        self._owns_client = client is None
+        self._executor = executor
+        self._loop = loop
+        self._loop_lock = threading.Lock()
+
+    def _open_start_page(self) -> None:
+        # The event loop may not be running yet, and a blank page doesn't need it
+        self._enter_address(self.start_page)
+        self._set_page_content("")
+        self._reset_viewport()
+
+    async def set_address(self, uri_or_path: str, filter_year: Optional[int] = None) -> None:
+        uri_or_path = self._enter_address(uri_or_path)
+
+        # Handle special URIs
+        if uri_or_path == "about:blank":
+            self._set_page_content("")
+        elif uri_or_path.startswith("google:"):
+            await self._serpapi_search(uri_or_path[len("google:") :].strip(), filter_year=filter_year)
+        else:
+            await self._fetch_page(uri_or_path)
+
+        self._reset_viewport()
+
+    async def visit_page(self, path_or_uri: str, filter_year: Optional[int] = None) -> str:
+        """Update the address, visit the page, and return the content of the viewport."""
+        await self.set_address(path_or_uri, filter_year=filter_year)
+        return self.viewport
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run one of this browser's coroutines from synchronous code, and return its result."""
+        loop = self._get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coroutine.close()
+            raise RuntimeError("AsyncTextBrowser.run can't block its own event loop: await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    async def aclose(self) -> None:
+        """Close the browser's own client, if it created one."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _serpapi_search(self, query: str, filter_year: Optional[int] = None) -> None:
+        url, params, headers = self._search_request(query, filter_year)
+        try:
+            response = await self._get_client().get(url, params=params, headers=headers)
+            response.raise_for_status()
+            await self._in_executor(self._show_search_results, query, filter_year, response.text)
+
+        except Exception as e:
+            self._set_page_content(f"Error performing search: {str(e)}")
+
+    async def _fetch_page(self, url: str) -> None:
+        download_path = ""
+        response = None
+        try:
+            if url.startswith("file://"):
+                download_path = os.path.normcase(os.path.normpath(unquote(url[7:])))
+                self._show_result(await self._in_executor(self._mdconvert.convert_local, download_path))
+            else:
+                # Send a HTTP request to the URL, unless the cache holds a fresh response
+                response = await self._get_page_async(url)
+                response.raise_for_status()
+
+                # Text or HTML
+                content_type = response.headers.get("content-type", "")
+                if "text/" in content_type.lower():
+                    self._show_result(await self._in_executor(self._mdconvert.convert_response, response))
+                # A download
+                else:
+                    download_path = self._download_path(url, content_type)
+                    # Release the connection even if the download fails part way
+                    try:
+                        with open(download_path, "wb") as fh:
+                            async for chunk in response._httpx_response.aiter_bytes():
+                                fh.write(chunk)
+                    finally:
+                        await response._httpx_response.aclose()
+
+                    # Render it
+                    await self.set_address(pathlib.Path(download_path).as_uri())
+
+        except (UnsupportedFormatException, FileConversionException) as e:
+            print(e)
+            self.page_title = ("Download complete.",)
+            self._set_page_content(f"# Download complete\n\nSaved file to '{download_path}'")
+        except FileNotFoundError:
+            self.page_title = "Error 404"
+            self._set_page_content(f"## Error 404\n\nFile not found: {download_path}")
+        except (requests.exceptions.RequestException, httpx.HTTPError) as request_exception:
+            if response is not None:
+                await self._in_executor(self._show_error, response)
+            else:
+                self.page_title = "Error"
+                self._set_page_content(f"## Error\n\n{str(request_exception)}")
+
+    async def _get_page_async(self, url: str) -> requests.Response:
+        """Like `_get_page`, sending the request with `_send`."""
+        if self._http_cache is None:
+            return await self._send(url, **self._page_request_kwargs())
+        return await self._http_cache.aget(url, fetch=self._send, **self._page_request_kwargs())
+
+    async def _send(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Any = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a GET request, and wrap the response in a requests.Response. Pages and error pages are read in full,
+        while the bodies of downloads are left to stream from `_httpx_response`.
+        """
+        headers = dict(headers or {})
+        cookies = cookie_header(url, cookies)
+        if cookies:
+            headers["Cookie"] = cookies
+
+        client = self._get_client()
+        request = client.build_request(
+            "GET", url, headers=headers, timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+        response = await client.send(request, stream=True, follow_redirects=True)
+        if response.status_code == 200 and "text/" not in response.headers.get("content-type", "").lower():
+            wrapped = wrap_httpx_response(response, content=b"")
+            wrapped._httpx_response = response
+            return wrapped
+
+        try:
+            return wrap_httpx_response(response, content=await response.aread())
+        finally:
+            await response.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the loop `run` schedules coroutines on, starting the browser's own the first time it is needed."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="AsyncTextBrowser", daemon=True).start()
+            return self._loop
+
+    async def _in_executor(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function, like a conversion, in the executor."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+
+class AsyncSearchInformationTool(SearchInformationTool):
+    """SearchInformationTool for an AsyncTextBrowser, which can also be awaited with `aforward`."""
+
+    async def aforward(self, query: str, filter_year: Optional[int] = None) -> str:
+        await self.browser.visit_page(f"google: {query}", filter_year=filter_year)
+        header, content = self.browser._state()
+        return header.strip() + "\n=======================\n" + content
+
+    def forward(self, query: str, filter_year: Optional[int] = None) -> str:
+        return self.browser.run(self.aforward(query, filter_year))
+
+
+class AsyncVisitTool(VisitTool):
+    """VisitTool for an AsyncTextBrowser, which can also be awaited with `aforward`."""
+
+    async def aforward(self, url: str) -> str:
+        await self.browser.visit_page(url)
+        header, content = self.browser._state()
+        return header.strip() + "\n=======================\n" + content
+
+    def forward(self, url: str) -> str:
+        return self.browser.run(self.aforward(url))
+
+
+class AsyncDownloadTool(DownloadTool):
+    """DownloadTool for an AsyncTextBrowser, which can also be awaited with `aforward`."""
+
+    async def aforward(self, url: str) -> str:
+        if "arxiv" in url:
+            url = url.replace("abs", "pdf")
+        response = await self.browser._get_client().get(url, follow_redirects=True)
+        content_type = response.headers.get("content-type", "")
+        extension = mimetypes.guess_extension(content_type)
+        if extension and isinstance(extension, str):
+            new_path = f"./downloads/file{extension}"
+        else:
+            new_path = "./downloads/file.object"
+
+        with open(new_path, "wb") as f:
+            f.write(response.content)
+
+        if "pdf" in extension or "txt" in extension or "htm" in extension:
+            raise Exception("Do not use this tool for pdf or txt or html files: use visit_page instead.")
+
+        return f"File was downloaded and saved under path {new_path}."
+
+    def forward(self, url: str) -> str:
+        return self.browser.run(self.aforward(url))
+
+
+class AsyncArchiveSearchTool(ArchiveSearchTool):
+    """ArchiveSearchTool for an AsyncTextBrowser, which can also be awaited with `aforward`."""
+
+    async def aforward(self, url, date) -> str:
+        no_timestamp_url = f"https://archive.org/wayback/available?url={url}"
+        archive_url = no_timestamp_url + f"&timestamp={date}"
+        # Both lookups are sent at once
+        client = self.browser._get_client()
+        responses = await asyncio.gather(client.get(archive_url), client.get(no_timestamp_url))
+        response, response_notimestamp = [r.json() for r in responses]
+        if "archived_snapshots" in response and "closest" in response["archived_snapshots"]:
+            closest = response["archived_snapshots"]["closest"]
+            print("Archive found!", closest)
+
+        elif "archived_snapshots" in response_notimestamp and "closest" in response_notimestamp["archived_snapshots"]:
+            closest = response_notimestamp["archived_snapshots"]["closest"]
+            print("Archive found!", closest)
+        else:
+            raise Exception(f"Your {url=} was not archived on Wayback Machine, try a different url.")
+        target_url = closest["url"]
+        await self.browser.visit_page(target_url)
+        header, content = self.browser._state()
+        return (
+            f"Web archive for url {url}, snapshot taken at date {closest['timestamp'][:8]}:\n"
+            + header.strip()
+            + "\n=======================\n"
+            + content
+        )
+
+    def forward(self, url, date) -> str:
+        return self.browser.run(self.aforward(url, date))
+
+
+def make_async_web_tools(browser: AsyncTextBrowser) -> List[Tool]:
+    """
+    Return the web tools for an AsyncTextBrowser. Scrolling, finding and jumping to sections don't wait on the
+    network, so those tools are the synchronous ones.
+    """
+    return [
+        AsyncSearchInformationTool(browser),
+        AsyncVisitTool(browser),
+        PageUpTool(browser),
+        PageDownTool(browser),
+        FinderTool(browser),
+        FindNextTool(browser),
+        GoToSectionTool(browser),
+        AsyncArchiveSearchTool(browser),
+    ]
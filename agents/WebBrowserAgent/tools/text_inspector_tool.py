@@ -3,13 +3,14 @@ from typing import Optional
 from smolagents import Tool
 from smolagents.models import MessageRole, Model
 
-from ...utils.mdconvert import MarkdownConverter
+from ...utils.http_client import shared_http_client
+from ...utils.mdconvert import ConversionCache, MarkdownConverter
 
 class TextInspectorTool(Tool):
     name = "inspect_file_as_text"
     description = """
 You cannot load files yourself: instead call this tool to read a file as markdown text and ask questions about it.
-This tool handles the following file extensions: [".html", ".htm", ".xlsx", ".pptx", ".wav", ".mp3", ".m4a", ".flac", ".pdf", ".docx"], and all other types of text files. IT DOES NOT HANDLE IMAGES."""
+This tool handles the following file extensions: [".html", ".htm", ".xlsx", ".pptx", ".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".webm", ".pdf", ".docx"], and all other types of text files. IT DOES NOT HANDLE IMAGES."""
 
     inputs = {
         "file_path": {
@@ -21,17 +22,33 @@ This tool handles the following file extensions: [".html", ".htm", ".xlsx", ".pp
             "type": "string",
             "nullable": True,
         },
+        "section": {
+            "description": "[Optional]: Only read this section of the file: the title of a heading, or a page, slide, sheet or table, like 'page 3', 'slide 2', 'sheet Sales' or 'table 1'.",
+            "type": "string",
+            "nullable": True,
+        },
     }
     output_type = "string"
-    md_converter = MarkdownConverter()
 
-    def __init__(self, model: Model, text_limit: int):
+    def __init__(
+        self,
+        model: Model,
+        text_limit: int,
+        conversion_cache: Optional[ConversionCache] = None,
+        isolation_workers: int = 0,
+    ):
         super().__init__()
         self.model = model
         self.text_limit = text_limit
+        # With isolation workers, files are converted in worker processes, so that one that hangs a converter or
+        # exhausts memory is cut off without stalling the other sessions sharing this tool
+        self.md_converter = MarkdownConverter(
+            requests_session=shared_http_client(), cache=conversion_cache, isolation_workers=isolation_workers
+        )
 
     def forward_initial_exam_mode(self, file_path, question):
-        result = self.md_converter.convert(file_path)
+        # Only the first text_limit characters are shown to the model, so don't extract PDF pages beyond that
+        result = self.md_converter.convert(file_path, pdf_max_chars=self.text_limit if question else None)
 
         if file_path[-4:] in [".png", ".jpg"]:
             raise Exception("Cannot use inspect_file_as_text tool with images: use visualizer instead!")
@@ -72,12 +89,23 @@ This tool handles the following file extensions: [".html", ".htm", ".xlsx", ".pp
         ]
         return self.model(messages).content
 
-    def forward(self, file_path, question: Optional[str] = None) -> str:
-        result = self.md_converter.convert(file_path)
+    def forward(self, file_path, question: Optional[str] = None, section: Optional[str] = None) -> str:
+        # Only the first text_limit characters are shown to the model, so don't extract PDF pages beyond that,
+        # unless a section is asked for, which may start further in
+        pdf_max_chars = self.text_limit if question and not section else None
+        result = self.md_converter.convert(file_path, pdf_max_chars=pdf_max_chars)
 
         if file_path[-4:] in [".png", ".jpg"]:
             raise Exception("Cannot use inspect_file_as_text tool with images: use visualizer instead!")
 
+        if section:
+            found = result.find_section(section)
+            if found is None:
+                titles = [s.name for s in (result.sections or [])[:50]]
+                available = f" Its sections are: {', '.join(titles)}." if titles else " It has no sections."
+                return f"The section '{section}' was not found in {file_path}.{available}"
+            result.text_content = result.text_content[found.start : found.end]
+
         if ".zip" in file_path:
             return result.text_content
 
@@ -1,12 +1,13 @@
 # Shamelessly stolen from Microsoft Autogen team: thanks to them for this great resource!
 # https://github.com/microsoft/autogen/blob/gaia_multiagent_v01_march_1st/autogen/browser_utils.py
+import bisect
 import mimetypes
 import os
 import pathlib
 import re
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import unquote, urljoin, urlparse
 from bs4 import BeautifulSoup
 
@@ -16,13 +17,42 @@ import requests
 from smolagents import Tool
 
 from .cookies import COOKIES
+from agents.utils.http_cache import HttpCache
+from agents.utils.http_client import HttpClient, shared_http_client
+from agents.utils.prefetcher import Prefetcher
 from agents.utils.mdconvert import (
+    ConversionCache,
+    DocumentConverterResult,
     FileConversionException,
     MarkdownConverter,
     UnsupportedFormatException,
 )
 
 
+# The characters a viewport may end on
+_VIEWPORT_BREAK = re.compile(r"[ \t\r\n]")
+
+
+def split_viewports(content: str, viewport_size: int) -> List[Tuple[int, int]]:
+    """
+    Split text into the bounds of viewports of at least `viewport_size` characters, each extended to end on the first
+    whitespace character at or after its last one.
+    """
+    bounds: List[Tuple[int, int]] = []
+    start_idx = 0
+    while start_idx < len(content):
+        end_idx = start_idx + viewport_size
+        if end_idx >= len(content):
+            end_idx = len(content)
+        else:
+            # Adjust to end on a space
+            match = _VIEWPORT_BREAK.search(content, end_idx - 1)
+            end_idx = match.end() if match is not None else len(content)
+        bounds.append((start_idx, end_idx))
+        start_idx = end_idx
+    return bounds
+
+
 class SimpleTextBrowser:
     """(In preview) An extremely simple text-based web browser comparable to Lynx. Suitable for Agentic use."""
 
@@ -33,6 +63,12 @@ class SimpleTextBrowser:
         downloads_folder: Optional[Union[str, None]] = None,
         zenrows_key: Optional[Union[str, None]] = None,
         request_kwargs: Optional[Union[Dict[str, Any], None]] = None,
+        http_cache: Optional[HttpCache] = None,
+        http_client: Optional[HttpClient] = None,
+        prefetch_results: int = 0,
+        prefetch_workers: int = 4,
+        conversion_cache: Optional[ConversionCache] = None,
+        isolation_workers: int = 0,
     ):
         self.start_page: str = start_page if start_page else "about:blank"
         self.viewport_size = viewport_size  # Applies only to the standard uri types
@@ -41,11 +77,26 @@ class SimpleTextBrowser:
         self.page_title: Optional[str] = None
         self.viewport_current_page = 0
         self.viewport_pages: List[Tuple[int, int]] = list()
-        self.set_address(self.start_page)
+        # The conversion result of the current page, whose structural index lets the viewport jump to sections
+        self._page_result: Optional[DocumentConverterResult] = None
+        # The top links of the last search are fetched and converted in the background while the model reads it
+        self.prefetch_results = prefetch_results
+        self._prefetcher: Optional[Prefetcher[DocumentConverterResult]] = (
+            Prefetcher(self._prefetch_page, max_workers=prefetch_workers) if prefetch_results > 0 else None
+        )
+        self._open_start_page()
         self.zenrows_key = zenrows_key
         self.request_kwargs = request_kwargs
         self.request_kwargs["cookies"] = COOKIES
-        self._mdconvert = MarkdownConverter()
+        # Pages, searches, downloads and archive lookups share pooled keep-alive connections
+        self.http_client = http_client if http_client is not None else shared_http_client()
+        # Conversions are only cached when a cache is given, and run in worker processes with isolation workers
+        self._mdconvert = MarkdownConverter(
+            cache=conversion_cache, requests_session=self.http_client, isolation_workers=isolation_workers
+        )
+        # With an HTTP cache, pages are replayed from disk while fresh, and revalidated with their ETag or
+        # Last-Modified date once stale. Pages are only cached when a cache is given
+        self._http_cache = http_cache
         self._page_content: str = ""
 
         self._find_on_page_query: Union[str, None] = None
@@ -58,9 +109,11 @@ class SimpleTextBrowser:
         """Return the address of the current page."""
         return self.history[-1][0]
 
+    def _open_start_page(self) -> None:
+        self.set_address(self.start_page)
+
     def set_address(self, uri_or_path: str, filter_year: Optional[int] = None) -> None:
-        # TODO: Handle anchors
-        self.history.append((uri_or_path, time.time()))
+        uri_or_path = self._enter_address(uri_or_path)
 
         # Handle special URIs
         if uri_or_path == "about:blank":
@@ -70,18 +123,31 @@ class SimpleTextBrowser:
                 uri_or_path[len("google:") :].strip(), filter_year=filter_year
             )
         else:
-            if (
-                not uri_or_path.startswith("http:")
-                and not uri_or_path.startswith("https:")
-                and not uri_or_path.startswith("file:")
-            ):
-                if len(self.history) > 1:
-                    prior_address = self.history[-2][0]
-                    uri_or_path = urljoin(prior_address, uri_or_path)
-                    # Update the address with the fully-qualified path
-                    self.history[-1] = (uri_or_path, self.history[-1][1])
             self._fetch_page(uri_or_path)
 
+        self._reset_viewport()
+
+    def _enter_address(self, uri_or_path: str) -> str:
+        """Add an address to the history, and return it resolved against the previous one if it is relative."""
+        # TODO: Handle anchors
+        self.history.append((uri_or_path, time.time()))
+        self._page_result = None
+
+        if (
+            uri_or_path != "about:blank"
+            and not uri_or_path.startswith("google:")
+            and not uri_or_path.startswith("http:")
+            and not uri_or_path.startswith("https:")
+            and not uri_or_path.startswith("file:")
+        ):
+            if len(self.history) > 1:
+                prior_address = self.history[-2][0]
+                uri_or_path = urljoin(prior_address, uri_or_path)
+                # Update the address with the fully-qualified path
+                self.history[-1] = (uri_or_path, self.history[-1][1])
+        return uri_or_path
+
+    def _reset_viewport(self) -> None:
         self.viewport_current_page = 0
         self.find_on_page_query = None
         self.find_on_page_viewport = None
@@ -112,6 +178,26 @@ class SimpleTextBrowser:
     def page_up(self) -> None:
         self.viewport_current_page = max(self.viewport_current_page - 1, 0)
 
+    def go_to_section(self, query: str) -> Union[str, None]:
+        """
+        Scroll to the viewport where a section of the current document starts: a heading, or e.g. "page 3",
+        "slide 2", "sheet Sales" or "table 1". Returns None if the page has no such section.
+        """
+        if self._page_result is None:
+            return None
+        section = self._page_result.find_section(query)
+        if section is None:
+            return None
+
+        viewport_starts = [start for start, _ in self.viewport_pages]
+        self.viewport_current_page = max(bisect.bisect_right(viewport_starts, section.start) - 1, 0)
+        return self.viewport
+
+    def section_titles(self, limit: int = 50) -> List[str]:
+        """Return the names of the first `limit` sections of the current page, as `go_to_section` accepts them."""
+        sections = self._page_result.sections if self._page_result is not None else None
+        return [s.name for s in (sections or [])[:limit]]
+
     def find_on_page(self, query: str) -> Union[str, None]:
         """Searches for the query from the current viewport forward, looping back to the start if necessary."""
 
@@ -210,19 +296,20 @@ class SimpleTextBrowser:
             return
 
         # Break the viewport into pages
-        self.viewport_pages = []
-        start_idx = 0
-        while start_idx < len(self._page_content):
-            end_idx = min(start_idx + self.viewport_size, len(self._page_content))  # type: ignore[operator]
-            # Adjust to end on a space
-            while end_idx < len(self._page_content) and self._page_content[
-                end_idx - 1
-            ] not in [" ", "\t", "\r", "\n"]:
-                end_idx += 1
-            self.viewport_pages.append((start_idx, end_idx))
-            start_idx = end_idx
+        self.viewport_pages = split_viewports(self._page_content, self.viewport_size)  # type: ignore[arg-type]
 
     def _serpapi_search(self, query: str, filter_year: Optional[int] = None) -> None:
+        url, params, headers = self._search_request(query, filter_year)
+        try:
+            response = self.http_client.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            self._show_search_results(query, filter_year, response.text)
+
+        except Exception as e:
+            self._set_page_content(f"Error performing search: {str(e)}")
+
+    def _search_request(self, query: str, filter_year: Optional[int] = None) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """Return the URL, query parameters and headers of a Zenrows request for a Google search."""
         if self.zenrows_key is None:
             raise ValueError("Missing Zenrows API key.")
 
@@ -240,82 +327,76 @@ class SimpleTextBrowser:
             "js_render": "true",
             "wait_for": ".g",  # Wait for Google search results
         }
-
-        try:
-            response = requests.get(
-                "https://api.zenrows.com/v1/", params=params, headers=headers
+        return "https://api.zenrows.com/v1/", params, headers
+
+    def _show_search_results(self, query: str, filter_year: Optional[int], html: str) -> None:
+        # Parse the HTML response to extract search results
+        soup = BeautifulSoup(html, "html.parser")
+        search_results = soup.select(".g")
+
+        if not search_results:
+            year_filter_message = (
+                f" with filter year={filter_year}"
+                if filter_year is not None
+                else ""
             )
-            response.raise_for_status()
+            self._set_page_content(
+                f"No results found for '{query}'{year_filter_message}. Try with a more general query, or remove the year filter."
+            )
+            return
 
-            # Parse the HTML response to extract search results
-            soup = BeautifulSoup(response.text, "html.parser")
-            search_results = soup.select(".g")
+        def _prev_visit(url):
+            for i in range(len(self.history) - 1, -1, -1):
+                if self.history[i][0] == url:
+                    return f"You previously visited this page {round(time.time() - self.history[i][1])} seconds ago.\n"
+            return ""
 
-            if not search_results:
-                year_filter_message = (
-                    f" with filter year={filter_year}"
-                    if filter_year is not None
-                    else ""
-                )
-                self._set_page_content(
-                    f"No results found for '{query}'{year_filter_message}. Try with a more general query, or remove the year filter."
-                )
-                return
+        web_snippets: List[str] = []
+        links: List[str] = []
+        for idx, result in enumerate(search_results, 1):
+            try:
+                title_elem = result.select_one("h3")
+                link_elem = result.select_one("a")
+                snippet_elem = result.select_one(".VwiC3b")
 
-            def _prev_visit(url):
-                for i in range(len(self.history) - 1, -1, -1):
-                    if self.history[i][0] == url:
-                        return f"You previously visited this page {round(time.time() - self.history[i][1])} seconds ago.\n"
-                return ""
-
-            web_snippets: List[str] = []
-            for idx, result in enumerate(search_results, 1):
-                try:
-                    title_elem = result.select_one("h3")
-                    link_elem = result.select_one("a")
-                    snippet_elem = result.select_one(".VwiC3b")
-
-                    if title_elem and link_elem:
-                        title = title_elem.text
-                        link = link_elem["href"]
-                        snippet = snippet_elem.text if snippet_elem else ""
-
-                        redacted_version = (
-                            f"{idx}. [{title}]({link})\n{_prev_visit(link)}{snippet}"
-                        )
-                        web_snippets.append(redacted_version)
-                except Exception as e:
-                    continue
-
-            content = (
-                f"A Google search for '{query}' found {len(web_snippets)} results:\n\n## Web Results\n"
-                + "\n\n".join(web_snippets)
-            )
+                if title_elem and link_elem:
+                    title = title_elem.text
+                    link = link_elem["href"]
+                    snippet = snippet_elem.text if snippet_elem else ""
 
-            self._set_page_content(content)
+                    redacted_version = (
+                        f"{idx}. [{title}]({link})\n{_prev_visit(link)}{snippet}"
+                    )
+                    web_snippets.append(redacted_version)
+                    links.append(link)
+            except Exception as e:
+                continue
+
+        content = (
+            f"A Google search for '{query}' found {len(web_snippets)} results:\n\n## Web Results\n"
+            + "\n\n".join(web_snippets)
+        )
 
-        except Exception as e:
-            self._set_page_content(f"Error performing search: {str(e)}")
+        self._set_page_content(content)
+        if self._prefetcher is not None:
+            web_links = [link for link in links if link.startswith(("http:", "https:"))]
+            self._prefetcher.prefetch(web_links[: self.prefetch_results])
 
     def _fetch_page(self, url: str) -> None:
+        if self._prefetcher is not None:
+            res = self._prefetcher.take(url)
+            if res is not None:
+                self._show_result(res)
+                return
+
         download_path = ""
         try:
             if url.startswith("file://"):
                 download_path = os.path.normcase(os.path.normpath(unquote(url[7:])))
-                res = self._mdconvert.convert_local(download_path)
-                self.page_title = res.title
-                self._set_page_content(res.text_content)
+                self._show_result(self._mdconvert.convert_local(download_path))
             else:
-                # Prepare the request parameters
-                request_kwargs = (
-                    self.request_kwargs.copy()
-                    if self.request_kwargs is not None
-                    else {}
-                )
-                request_kwargs["stream"] = True
-
-                # Send a HTTP request to the URL
-                response = requests.get(url, **request_kwargs)
+                # Send a HTTP request to the URL, unless the cache holds a fresh response
+                response = self._get_page(url)
                 response.raise_for_status()
 
                 # If the HTTP request was successful
@@ -323,43 +404,10 @@ class SimpleTextBrowser:
 
                 # Text or HTML
                 if "text/" in content_type.lower():
-                    res = self._mdconvert.convert_response(response)
-                    self.page_title = res.title
-                    self._set_page_content(res.text_content)
+                    self._show_result(self._mdconvert.convert_response(response))
                 # A download
                 else:
-                    # Try producing a safe filename
-                    fname = None
-                    download_path = None
-                    try:
-                        fname = pathvalidate.sanitize_filename(
-                            os.path.basename(urlparse(url).path)
-                        ).strip()
-                        download_path = os.path.abspath(
-                            os.path.join(self.downloads_folder, fname)
-                        )
-
-                        suffix = 0
-                        while os.path.exists(download_path) and suffix < 1000:
-                            suffix += 1
-                            base, ext = os.path.splitext(fname)
-                            new_fname = f"{base}__{suffix}{ext}"
-                            download_path = os.path.abspath(
-                                os.path.join(self.downloads_folder, new_fname)
-                            )
-
-                    except NameError:
-                        pass
-
-                    # No suitable name, so make one
-                    if fname is None:
-                        extension = mimetypes.guess_extension(content_type)
-                        if extension is None:
-                            extension = ".download"
-                        fname = str(uuid.uuid4()) + extension
-                        download_path = os.path.abspath(
-                            os.path.join(self.downloads_folder, fname)
-                        )
+                    download_path = self._download_path(url, content_type)
 
                     # Open a file for writing
                     with open(download_path, "wb") as fh:
@@ -387,28 +435,100 @@ class SimpleTextBrowser:
             self._set_page_content(f"## Error 404\n\nFile not found: {download_path}")
         except requests.exceptions.RequestException as request_exception:
             try:
-                self.page_title = f"Error {response.status_code}"
-
-                # If the error was rendered in HTML we might as well render it
-                content_type = response.headers.get("content-type", "")
-                if content_type is not None and "text/html" in content_type.lower():
-                    res = self._mdconvert.convert(response)
-                    self.page_title = f"Error {response.status_code}"
-                    self._set_page_content(
-                        f"## Error {response.status_code}\n\n{res.text_content}"
-                    )
-                else:
-                    text = ""
-                    for chunk in response.iter_content(
-                        chunk_size=512, decode_unicode=True
-                    ):
-                        text += chunk
-                    self.page_title = f"Error {response.status_code}"
-                    self._set_page_content(f"## Error {response.status_code}\n\n{text}")
+                self._show_error(response)
             except NameError:
                 self.page_title = "Error"
                 self._set_page_content(f"## Error\n\n{str(request_exception)}")
 
+    def _page_request_kwargs(self) -> Dict[str, Any]:
+        # Prepare the request parameters
+        request_kwargs = (
+            self.request_kwargs.copy()
+            if self.request_kwargs is not None
+            else {}
+        )
+        request_kwargs["stream"] = True
+        return request_kwargs
+
+    def _get_page(self, url: str) -> requests.Response:
+        """Send a GET request for a page, unless the HTTP cache, if there is one, holds a fresh response."""
+        if self._http_cache is None:
+            return self.http_client.get(url, **self._page_request_kwargs())
+        return self._http_cache.get(url, fetch=self.http_client.get, **self._page_request_kwargs())
+
+    def _prefetch_page(self, url: str, cancelled: Callable[[], bool]) -> Optional[DocumentConverterResult]:
+        """Fetch and convert a search result in the background. Downloads are left for the visit to save."""
+        response = self._get_page(url)
+        try:
+            if not response.ok or "text/" not in response.headers.get("content-type", "").lower() or cancelled():
+                return None
+            return self._mdconvert.convert_response(response)
+        finally:
+            response.close()
+
+    def _show_result(self, res: DocumentConverterResult) -> None:
+        """Show a converted page."""
+        self.page_title = res.title
+        self._set_page_content(res.text_content)
+        self._page_result = res
+
+    def _download_path(self, url: str, content_type: str) -> str:
+        """Return a path in the downloads folder that is not taken yet, named after the URL if possible."""
+        # Try producing a safe filename
+        fname = None
+        download_path = None
+        try:
+            fname = pathvalidate.sanitize_filename(
+                os.path.basename(urlparse(url).path)
+            ).strip()
+            download_path = os.path.abspath(
+                os.path.join(self.downloads_folder, fname)
+            )
+
+            suffix = 0
+            while os.path.exists(download_path) and suffix < 1000:
+                suffix += 1
+                base, ext = os.path.splitext(fname)
+                new_fname = f"{base}__{suffix}{ext}"
+                download_path = os.path.abspath(
+                    os.path.join(self.downloads_folder, new_fname)
+                )
+
+        except NameError:
+            pass
+
+        # No suitable name, so make one
+        if fname is None:
+            extension = mimetypes.guess_extension(content_type)
+            if extension is None:
+                extension = ".download"
+            fname = str(uuid.uuid4()) + extension
+            download_path = os.path.abspath(
+                os.path.join(self.downloads_folder, fname)
+            )
+        return download_path
+
+    def _show_error(self, response: requests.Response) -> None:
+        """Show the page of an HTTP error."""
+        self.page_title = f"Error {response.status_code}"
+
+        # If the error was rendered in HTML we might as well render it
+        content_type = response.headers.get("content-type", "")
+        if content_type is not None and "text/html" in content_type.lower():
+            res = self._mdconvert.convert(response)
+            self.page_title = f"Error {response.status_code}"
+            self._set_page_content(
+                f"## Error {response.status_code}\n\n{res.text_content}"
+            )
+        else:
+            text = ""
+            for chunk in response.iter_content(
+                chunk_size=512, decode_unicode=True
+            ):
+                text += chunk
+            self.page_title = f"Error {response.status_code}"
+            self._set_page_content(f"## Error {response.status_code}\n\n{text}")
+
     def _state(self) -> Tuple[str, str]:
         header = f"Address: {self.address}\n"
         if self.page_title is not None:
@@ -494,7 +614,7 @@ DO NOT use this tool for .pdf or .txt or .htm files: for these types of files us
     def forward(self, url: str) -> str:
         if "arxiv" in url:
             url = url.replace("abs", "pdf")
-        response = requests.get(url)
+        response = self.browser.http_client.get(url)
         content_type = response.headers.get("content-type", "")
         extension = mimetypes.guess_extension(content_type)
         if extension and isinstance(extension, str):
@@ -532,8 +652,8 @@ class ArchiveSearchTool(Tool):
     def forward(self, url, date) -> str:
         no_timestamp_url = f"https://archive.org/wayback/available?url={url}"
         archive_url = no_timestamp_url + f"&timestamp={date}"
-        response = requests.get(archive_url).json()
-        response_notimestamp = requests.get(no_timestamp_url).json()
+        response = self.browser.http_client.get(archive_url).json()
+        response_notimestamp = self.browser.http_client.get(no_timestamp_url).json()
         if (
             "archived_snapshots" in response
             and "closest" in response["archived_snapshots"]
@@ -594,6 +714,36 @@ class PageDownTool(Tool):
         return header.strip() + "\n=======================\n" + content
 
 
+class GoToSectionTool(Tool):
+    name = "go_to_section"
+    description = "Scroll the viewport to the start of a section of the current document, and return the new viewport content."
+    inputs = {
+        "section": {
+            "type": "string",
+            "description": "The title of a heading, or a page, slide, sheet or table, like 'page 3', 'slide 2', 'sheet Sales' or 'table 1'.",
+        }
+    }
+    output_type = "string"
+
+    def __init__(self, browser):
+        super().__init__()
+        self.browser = browser
+
+    def forward(self, section: str) -> str:
+        result = self.browser.go_to_section(section)
+        header, content = self.browser._state()
+
+        if result is None:
+            titles = self.browser.section_titles()
+            available = f" Its sections are: {', '.join(titles)}." if titles else ""
+            return (
+                header.strip()
+                + f"\n=======================\nThe section '{section}' was not found on this page.{available}"
+            )
+        else:
+            return header.strip() + "\n=======================\n" + content
+
+
 class FinderTool(Tool):
     name = "find_on_page_ctrl_f"
     description = "Scroll the viewport to the first occurrence of the search string. This is equivalent to Ctrl+F."
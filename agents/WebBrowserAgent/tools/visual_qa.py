@@ -6,7 +6,6 @@ import uuid
 from io import BytesIO
 from typing import Optional
 
-import requests
 from dotenv import load_dotenv
 from huggingface_hub import InferenceClient
 from PIL import Image
@@ -14,6 +13,8 @@ from transformers import AutoProcessor
 
 from smolagents import Tool, tool
 
+from ...utils.http_client import shared_http_client
+
 
 load_dotenv(override=True)
 
@@ -74,7 +75,7 @@ def encode_image(image_path):
         }
 
         # Send a HTTP request to the URL
-        response = requests.get(image_path, **request_kwargs)
+        response = shared_http_client().get(image_path, **request_kwargs)
         response.raise_for_status()
         content_type = response.headers.get("content-type", "")
 
@@ -175,7 +176,7 @@ def visualizer(image_path: str, question: Optional[str] = None) -> str:
         ],
         "max_tokens": 1000,
     }
-    response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
+    response = shared_http_client().post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
     try:
         output = response.json()["choices"][0]["message"]["content"]
     except Exception:
@@ -1 +1,12 @@
-from .WebBrowserAgent import WebBrowserAgent
+# The agent pulls in the browser tools and their model dependencies, so it is only imported when first accessed.
+# Importing a utility such as agents.utils.mdconvert does not pay for it
+
+
+def __getattr__(name):
+    if name == "WebBrowserAgent":
+        from .WebBrowserAgent import WebBrowserAgent
+
+        # Importing the subpackage or submodule of the same name bound it here: bind the class over it
+        globals()[name] = WebBrowserAgent
+        return WebBrowserAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+class DiskLRUCache:
+    """
+    A small, size-bounded, on-disk key/value store with least-recently-used eviction.
+
+    Every entry is a single file named after its key. Recency is tracked with the file's modification time, which
+    is refreshed on every hit, so the cache survives restarts and can be shared between processes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: The directory holding the cache entries. It is created on first write.
+            max_bytes: Upper bound on the total size of all entries. The least recently used entries are evicted
+                beyond it.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[str, int]] = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the bytes stored under `key`, or None. A hit marks the entry as most recently used."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+            os.utime(path, None)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key`, evicting the least recently used entries if the cache grows too large."""
+        if len(data) > self.max_bytes:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write atomically, so concurrent readers never see a partial entry
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(handle, "wb") as fh:
+                fh.write(data)
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            sizes = self._load_sizes()
+            sizes[key] = len(data)
+            self._evict(sizes)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            for key in list(self._load_sizes()):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters, plus the current number of entries and their total size."""
+        with self._lock:
+            sizes = self._load_sizes()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(sizes),
+                "bytes": sum(sizes.values()),
+            }
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Locks can't be pickled, and another process must rescan the directory, which may change under it
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_sizes"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _load_sizes(self) -> Dict[str, int]:
+        """Lazily scan the directory for existing entries. Must be called with the lock held."""
+        if self._sizes is None:
+            self._sizes = {}
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.is_file() and not entry.name.startswith("."):
+                        self._sizes[entry.name] = entry.stat().st_size
+        return self._sizes
+
+    def _evict(self, sizes: Dict[str, int]) -> None:
+        """Drop the least recently used entries until the cache fits. Must be called with the lock held."""
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        def _mtime(key: str) -> float:
+            try:
+                return os.path.getmtime(self._path(key))
+            except OSError:
+                return 0.0
+
+        for key in sorted(sizes, key=_mtime):
+            if total <= self.max_bytes:
+                break
+            total -= sizes[key]
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Delete a single entry. Must be called with the lock held."""
+        self._load_sizes().pop(key, None)
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
@@ -0,0 +1,137 @@
+import atexit
+import json
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class ExifTool:
+    """
+    A long-lived exiftool process in `-stay_open` mode, which reads metadata for many files without paying for Perl's
+    startup on each of them.
+
+    Requests are written to the process's stdin as argument lines ending with `-execute`, and the JSON output is read
+    back up to exiftool's `{ready}` marker. A lock serializes requests, so one instance can be shared between threads.
+    The process is started on first use, and restarted if it dies.
+    """
+
+    def __init__(self, executable: Optional[str] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            executable: The path of the exiftool executable. Defaults to the one found on the PATH
+        """
+        self.executable = executable if executable is not None else shutil.which("exiftool")
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether exiftool is installed."""
+        return self.executable is not None
+
+    def get_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata of a file, or None if exiftool is not installed or cannot read it."""
+        return self.get_metadata_batch([path])[0]
+
+    def get_metadata_batch(self, paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Return the metadata of many files, read by a single exiftool request, in the order of `paths`."""
+        if not self.available or not paths:
+            return [None] * len(paths)
+
+        # Arguments are sent one per line, so paths holding a newline are read with a one-shot process instead
+        batch = [path for path in paths if "\n" not in path]
+        metadata: Dict[str, Dict[str, Any]] = {}
+        if batch:
+            try:
+                metadata.update(self._execute(["-json", *batch]))
+            except (OSError, ValueError):
+                self.close()
+        results = []
+        for path in paths:
+            if "\n" in path:
+                results.append(self._run_once(path))
+            else:
+                results.append(metadata.get(path))
+        return results
+
+    def close(self) -> None:
+        """Stop the exiftool process, if it is running."""
+        with self._lock:
+            self._stop()
+
+    def _execute(self, args: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Run one request, and return the metadata it printed keyed by source file."""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+
+            self._requests += 1
+            ready = f"{{ready{self._requests}}}"
+            self._process.stdin.write("\n".join(args) + f"\n-execute{self._requests}\n")
+            self._process.stdin.flush()
+
+            lines = []
+            while True:
+                line = self._process.stdout.readline()
+                if not line:
+                    self._stop()
+                    raise OSError("exiftool exited unexpectedly")
+                if line.rstrip() == ready:
+                    break
+                lines.append(line)
+
+        output = "".join(lines).strip()
+        # Nothing is printed when none of the files could be read
+        return {entry["SourceFile"]: entry for entry in json.loads(output)} if output else {}
+
+    def _start(self) -> None:
+        self._stop()
+        self._process = subprocess.Popen(
+            [self.executable, "-stay_open", "True", "-@", "-", "-common_args", "-charset", "filename=utf8"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def _stop(self) -> None:
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        try:
+            if process.poll() is None:
+                process.stdin.write("-stay_open\nFalse\n")
+                process.stdin.flush()
+                process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            process.stdin.close()
+            process.stdout.close()
+
+    def _run_once(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            result = subprocess.run([self.executable, "-json", path], capture_output=True, text=True).stdout
+            return json.loads(result)[0]
+        except Exception:
+            return None
+
+
+_shared_exiftool: Optional[ExifTool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_exiftool() -> ExifTool:
+    """Return the process-wide ExifTool instance, which is stopped at exit."""
+    global _shared_exiftool
+    with _shared_lock:
+        if _shared_exiftool is None:
+            _shared_exiftool = ExifTool()
+            atexit.register(_shared_exiftool.close)
+        return _shared_exiftool
@@ -0,0 +1,247 @@
+import email.utils
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .disk_cache import DiskLRUCache
+
+# Response headers that a 304 Not Modified refreshes on the stored response
+_REVALIDATED_HEADERS = ["cache-control", "date", "etag", "expires", "last-modified", "age", "vary"]
+
+# Response headers that describe the body as it was sent, rather than the decoded body that is stored
+_TRANSFER_HEADERS = ["content-encoding", "content-length", "transfer-encoding"]
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into lower-cased directives and their values, if any."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date into a timestamp, or None."""
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(int(value), 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+class HttpCache:
+    """
+    A private HTTP cache for GET requests, stored on disk with least-recently-used eviction.
+
+    Only successful text responses are stored, which are read in full anyway, while downloads stream past the cache.
+    A stored response is replayed without a request for as long as it is fresh according to its `Cache-Control:
+    max-age` or `Expires` header (or, lacking both, for a tenth of its age since `Last-Modified`, up to a day). Once
+    stale, it is revalidated with `If-None-Match` or `If-Modified-Since`, and a 304 Not Modified replays it. Responses
+    marked `no-store`, or with `Vary: *`, are never stored, and `no-cache` ones are revalidated on every use.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = os.path.join(".cache", "http"),
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        max_entry_bytes: int = 8 * 1024 * 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: The directory holding the cached responses. Defaults to ".cache/http"
+            max_bytes: Upper bound on the total size of the cached responses. Defaults to 256 MiB
+            ttl: The number of seconds stored responses are fresh for, overriding their headers, or None to follow
+                them. Responses marked `no-store` are still not stored. Defaults to None
+            max_entry_bytes: The largest response body that is stored. Defaults to 8 MiB
+        """
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self._store = DiskLRUCache(cache_dir, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self._stats = {"fresh": 0, "revalidated": 0, "fetched": 0}
+
+    def get(
+        self, url: str, fetch: Callable[..., requests.Response] = requests.get, **request_kwargs: Any
+    ) -> requests.Response:
+        """
+        Return the response to a GET request for `url`, from the cache if it holds a fresh one, and otherwise by
+        calling `fetch(url, **request_kwargs)`. Responses replayed from the cache have `from_cache` set.
+        """
+        key, entry, request_kwargs, replayed = self._prepare(url, request_kwargs)
+        if replayed is not None:
+            return replayed
+        return self._complete(key, entry, fetch(url, **request_kwargs))
+
+    async def aget(
+        self, url: str, fetch: Callable[..., Awaitable[requests.Response]], **request_kwargs: Any
+    ) -> requests.Response:
+        """Like `get`, with a coroutine function to send requests. Text responses it returns must be read already."""
+        key, entry, request_kwargs, replayed = self._prepare(url, request_kwargs)
+        if replayed is not None:
+            return replayed
+        return self._complete(key, entry, await fetch(url, **request_kwargs))
+
+    def _prepare(
+        self, url: str, request_kwargs: Dict[str, Any]
+    ) -> Tuple[str, Optional[Tuple[Dict[str, Any], bytes]], Dict[str, Any], Optional[requests.Response]]:
+        """
+        Look `url` up. Returns its key, its stored entry, the arguments of the request to send, and the stored
+        response if it is fresh, in which case no request is needed.
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        entry = self._load(key)
+        if entry is None:
+            return key, None, request_kwargs, None
+
+        meta, body = entry
+        if self._is_fresh(meta):
+            self._count("fresh")
+            return key, entry, request_kwargs, self._replay(meta, body)
+
+        # Ask the server whether the stored response is still current
+        headers = dict(request_kwargs.get("headers") or {})
+        if meta["headers"].get("etag"):
+            headers["If-None-Match"] = meta["headers"]["etag"]
+        if meta["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = meta["headers"]["last-modified"]
+        return key, entry, {**request_kwargs, "headers": headers}, None
+
+    def _complete(
+        self, key: str, entry: Optional[Tuple[Dict[str, Any], bytes]], response: requests.Response
+    ) -> requests.Response:
+        """Replay the stored response if the server says it is still current, or else store the new one."""
+        if entry is not None and response.status_code == 304:
+            meta, body = entry
+            response.close()
+            meta["headers"].update(
+                {name: value for name, value in response.headers.lower_items() if name in _REVALIDATED_HEADERS}
+            )
+            meta["stored_at"] = time.time()
+            self._save(key, meta, body)
+            self._count("revalidated")
+            return self._replay(meta, body)
+
+        self._count("fetched")
+        response.from_cache = False
+        if self._is_storable(response):
+            # Reading the content leaves it available to iter_content, as if it was still streaming
+            body = response.content
+            if len(body) <= self.max_entry_bytes:
+                meta = {
+                    "url": response.url,
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": {
+                        name: value for name, value in response.headers.lower_items() if name not in _TRANSFER_HEADERS
+                    },
+                    "stored_at": time.time(),
+                }
+                self._save(key, meta, body)
+        return response
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of responses replayed while fresh, revalidated, and fetched in full, plus the store's
+        counters.
+        """
+        with self._lock:
+            return {**self._stats, **self._store.stats()}
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def _is_storable(self, response: requests.Response) -> bool:
+        headers = response.headers
+        if response.status_code != 200 or "text/" not in headers.get("content-type", "").lower():
+            return False
+        if "no-store" in _parse_cache_control(headers.get("cache-control", "")) or headers.get("vary", "") == "*":
+            return False
+        content_length = _parse_int(headers.get("content-length"))
+        if content_length is not None and content_length > self.max_entry_bytes:
+            return False
+        # Responses that are never fresh are only worth keeping if they can be revalidated
+        return (
+            self.ttl is not None
+            or self._freshness_lifetime(headers) > 0
+            or "etag" in headers
+            or "last-modified" in headers
+        )
+
+    def _is_fresh(self, meta: Dict[str, Any]) -> bool:
+        headers = meta["headers"]
+        age = time.time() - meta["stored_at"] + (_parse_int(headers.get("age")) or 0)
+        if self.ttl is not None:
+            return age < self.ttl
+        if "no-cache" in _parse_cache_control(headers.get("cache-control", "")):
+            return False
+        return age < self._freshness_lifetime(headers)
+
+    def _freshness_lifetime(self, headers: Any) -> float:
+        """The number of seconds a response is fresh for, following RFC 9111 section 4.2.1."""
+        directives = _parse_cache_control(headers.get("cache-control", ""))
+        max_age = _parse_int(directives.get("max-age"))
+        if max_age is not None:
+            return max_age
+
+        date = _parse_date(headers.get("date"))
+        expires = headers.get("expires")
+        if expires is not None:
+            expires_at = _parse_date(expires)
+            # Invalid dates, like "0", mean the response has already expired
+            return max(expires_at - (date or time.time()), 0) if expires_at is not None else 0
+
+        last_modified = _parse_date(headers.get("last-modified"))
+        if last_modified is not None:
+            return min(max((date or time.time()) - last_modified, 0) / 10, 24 * 60 * 60)
+        return 0
+
+    def _load(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        data = self._store.get(key)
+        if data is None:
+            return None
+        header, _, body = data.partition(b"\n")
+        try:
+            return json.loads(header.decode("utf-8")), body
+        except ValueError:
+            return None
+
+    def _save(self, key: str, meta: Dict[str, Any], body: bytes) -> None:
+        # JSON escapes newlines, so the first line of an entry holds its metadata and the rest is the body
+        self._store.put(key, json.dumps(meta).encode("utf-8") + b"\n" + body)
+
+    def _replay(self, meta: Dict[str, Any], body: bytes) -> requests.Response:
+        """Build a response from a stored one, which reads like a streamed response that was already consumed."""
+        response = requests.Response()
+        response.url = meta["url"]
+        response.status_code = meta["status"]
+        response.reason = meta["reason"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
@@ -0,0 +1,282 @@
+import atexit
+import collections
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+def _host_of(url: str) -> str:
+    """Return the host of a URL, with its port unless it is a default one."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    return host if parsed.port in (None, 80, 443) else f"{host}:{parsed.port}"
+
+
+def cookie_header(url: str, cookies: Any) -> Optional[str]:
+    """
+    Return the Cookie header that requests would send to `url` from a dict or cookie jar, for clients that can't be
+    given a jar per request. Cookie jars are scoped by domain and path.
+    """
+    if not cookies:
+        return None
+    jar = requests.cookies.merge_cookies(requests.cookies.RequestsCookieJar(), cookies)
+    return requests.cookies.get_cookie_header(jar, requests.Request("GET", url).prepare())
+
+
+def wrap_httpx_response(response: Any, content: Optional[bytes] = None) -> requests.Response:
+    """
+    Wrap an httpx response in a requests.Response. Its body is `content` if it was already read, and is otherwise
+    streamed from the httpx response.
+    """
+    wrapped = requests.Response()
+    wrapped.status_code = response.status_code
+    wrapped.reason = response.reason_phrase
+    wrapped.url = str(response.url)
+    wrapped.headers = CaseInsensitiveDict(response.headers)
+    wrapped.encoding = requests.utils.get_encoding_from_headers(wrapped.headers)
+    if content is not None:
+        wrapped._content = content
+        wrapped._content_consumed = True
+    else:
+        wrapped.raw = _HttpxStream(response)
+    return wrapped
+
+
+class _HttpxStream:
+    """A file-like view of a streamed httpx response's decoded body, read by requests.Response.iter_content."""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self._chunks: Iterator[bytes] = response.iter_bytes()
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        if not data:
+            self.close()
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class HttpClient:
+    """
+    A pooled, keep-alive HTTP client shared by the browser, the converters and the tools, so that requests to a host
+    reuse its open connections instead of paying for DNS, TCP and TLS setup every time.
+
+    Requests take the keyword arguments of `requests.get` and return `requests.Response` objects, whichever backend
+    sends them: a `requests.Session`, or an `httpx.Client`, which can speak HTTP/2. No more than
+    `max_connections_per_host` requests are sent to a host at once, and each host's pool keeps that many connections
+    alive. For streamed responses, the limit is released once the headers are received.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 8,
+        max_hosts: int = 32,
+        backend: str = "requests",
+        http2: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the client, without opening any connection.
+
+        Args:
+            max_connections_per_host: The number of requests sent to a host at once, and of connections kept alive to
+                it. Defaults to 8
+            max_hosts: The number of hosts whose connections are kept alive. Defaults to 32
+            backend: "requests", or "httpx". Defaults to "requests"
+            http2: With the httpx backend, use HTTP/2 where servers support it. Requires the `h2` package.
+                Defaults to False
+            headers: Headers sent with every request, which those of a request override
+        """
+        if backend not in ["requests", "httpx"]:
+            raise ValueError(f"Unknown HTTP backend '{backend}', expected 'requests' or 'httpx'")
+        if http2 and backend != "httpx":
+            raise ValueError("HTTP/2 requires the 'httpx' backend")
+
+        self.max_connections_per_host = max_connections_per_host
+        self.max_hosts = max_hosts
+        self.backend = backend
+        self.http2 = http2
+        self.headers = headers
+        self._connect()
+
+    def _connect(self) -> None:
+        """Set up the backend's connection pools, and empty counters."""
+        if self.backend == "httpx":
+            import httpx
+
+            self._httpx = httpx.Client(
+                http2=self.http2,
+                headers=self.headers,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections_per_host * self.max_hosts,
+                    max_keepalive_connections=self.max_connections_per_host * self.max_hosts,
+                ),
+            )
+            self._session = None
+        else:
+            self._httpx = None
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_hosts, pool_maxsize=self.max_connections_per_host)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            if self.headers:
+                self._session.headers.update(self.headers)
+
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._requests: Dict[str, int] = collections.Counter()
+        self._in_flight: Dict[str, int] = collections.Counter()
+        # Connections seen per host, for the httpx backend which doesn't count the connections it opens
+        self._seen_connections: Dict[str, Set[int]] = collections.defaultdict(set)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections and locks stay with the process that opened them: copies open their own
+        return {
+            name: getattr(self, name) for name in ["max_connections_per_host", "max_hosts", "backend", "http2", "headers"]
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._connect()
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, waiting if `max_connections_per_host` requests to the same host are in flight."""
+        host = _host_of(url)
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.max_connections_per_host)
+
+        with slots:
+            with self._lock:
+                self._requests[host] += 1
+                self._in_flight[host] += 1
+            try:
+                if self._httpx is not None:
+                    return self._send_httpx(method, url, **kwargs)
+                return self._session.request(method, url, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight[host] -= 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return, per host, the number of requests sent and in flight, of connections opened since the client was
+        created, and of idle connections kept alive.
+        """
+        with self._lock:
+            stats = {
+                host: {"requests": count, "in_flight": self._in_flight[host], "connections_opened": 0, "idle": 0}
+                for host, count in self._requests.items()
+            }
+
+        if self._httpx is not None:
+            for connection in self._httpx_connections():
+                host = self._connection_host(connection)
+                if host in stats:
+                    stats[host]["idle"] += connection.is_idle()
+            with self._lock:
+                for host, seen in self._seen_connections.items():
+                    if host in stats:
+                        stats[host]["connections_opened"] = len(seen)
+        else:
+            for adapter in set(self._session.adapters.values()):
+                for key in adapter.poolmanager.pools.keys():
+                    pool = adapter.poolmanager.pools.get(key)
+                    if pool is None:
+                        continue
+                    host = _host_of(f"{pool.scheme}://{pool.host}:{pool.port}")
+                    if host in stats:
+                        stats[host]["connections_opened"] += pool.num_connections
+                        idle = list(pool.pool.queue) if pool.pool is not None else []
+                        stats[host]["idle"] += sum(1 for connection in idle if connection is not None)
+        return stats
+
+    def close(self) -> None:
+        """Close all pooled connections, once the client is no longer needed."""
+        if self._httpx is not None:
+            self._httpx.close()
+        else:
+            self._session.close()
+
+    def _send_httpx(
+        self,
+        method: str,
+        url: str,
+        params: Any = None,
+        data: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Any = None,
+        json: Any = None,
+        timeout: Any = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+    ) -> requests.Response:
+        """Send a request with httpx, and wrap the response in a requests.Response."""
+        headers = dict(headers or {})
+        cookies = cookie_header(url, cookies)
+        if cookies:
+            headers["Cookie"] = cookies
+
+        request = self._httpx.build_request(
+            method, url, params=params, data=data, headers=headers, json=json, timeout=timeout
+        )
+        response = self._httpx.send(request, stream=True, follow_redirects=allow_redirects)
+        connection = response.extensions.get("network_stream")
+        if connection is not None:
+            with self._lock:
+                self._seen_connections[_host_of(url)].add(id(connection))
+
+        wrapped = wrap_httpx_response(response)
+        if not stream:
+            # Read the body now, as requests does, which releases the connection
+            wrapped.content
+        return wrapped
+
+    def _httpx_connections(self) -> List[Any]:
+        """The connections in httpx's pool, which doesn't expose them publicly."""
+        pool = getattr(self._httpx._transport, "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    @staticmethod
+    def _connection_host(connection: Any) -> str:
+        origin = connection._origin
+        return _host_of(f"{origin.scheme.decode('ascii')}://{origin.host.decode('ascii')}:{origin.port}")
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def shared_http_client() -> HttpClient:
+    """Return the process-wide HttpClient, whose connections are closed at exit."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+            atexit.register(_shared_client.close)
+        return _shared_client
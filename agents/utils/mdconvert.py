@@ -1,37 +1,47 @@
 # This is copied from Magentic-one's great repo: https://github.com/microsoft/autogen/blob/v0.4.4/python/packages/autogen-magentic-one/src/autogen_magentic_one/markdown_browser/mdconvert.py
 # Thanks to Microsoft researchers for open-sourcing this!
 # type: ignore
+import array
 import base64
-import copy
-import html
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
+import io
 import json
 import mimetypes
 import os
+import queue
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import traceback
 import zipfile
-from typing import Any, Dict, List, Optional, Union
+from io import StringIO
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from urllib.parse import parse_qs, quote, unquote, urlparse, urlunparse
 
-import mammoth
 import markdownify
-import pandas as pd
-import pdfminer
-import pdfminer.high_level
-import pptx
 
 # File-format detection
 import puremagic
-import pydub
 import requests
-import speech_recognition as sr
+import lxml.etree
+import lxml.html
 from bs4 import BeautifulSoup
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.formatters import SRTFormatter
+
+# The backends of the other converters (mammoth, openpyxl, pandas, pdfminer, pptx, pydub, speech_recognition and
+# youtube_transcript_api) take a large share of the import time, so each converter imports its own on first use
+
+from .disk_cache import DiskLRUCache
+from .exiftool import shared_exiftool
+from .http_client import HttpClient
+from .worker_pool import WorkerCrashedError, WorkerPool, worker_context
 
 
 class _CustomMarkdownify(markdownify.MarkdownConverter):
@@ -91,12 +101,18 @@ class _CustomMarkdownify(markdownify.MarkdownConverter):
 
     def convert_img(self, el: Any, text: str, convert_as_inline: bool) -> str:
         """Same as usual converter, but removes data URIs"""
+        return self._image_markdown(
+            el.attrs.get("alt", None), el.attrs.get("src", None), el.attrs.get("title", None), el.parent.name, convert_as_inline
+        )
 
-        alt = el.attrs.get("alt", None) or ""
-        src = el.attrs.get("src", None) or ""
-        title = el.attrs.get("title", None) or ""
+    def _image_markdown(
+        self, alt: Optional[str], src: Optional[str], title: Optional[str], parent_name: Optional[str], convert_as_inline: bool
+    ) -> str:
+        alt = alt or ""
+        src = src or ""
+        title = title or ""
         title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
-        if convert_as_inline and el.parent.name not in self.options["keep_inline_images_in"]:
+        if convert_as_inline and parent_name not in self.options["keep_inline_images_in"]:
             return alt
 
         # Remove dataURIs
@@ -109,20 +125,451 @@ class _CustomMarkdownify(markdownify.MarkdownConverter):
         return super().convert_soup(soup)  # type: ignore
 
 
+def _lxml_inline_conversion(markup_fn: Any) -> Any:
+    """The lxml counterpart of markdownify's abstract_inline_conversion."""
+
+    def implementation(self, el, text, convert_as_inline):
+        markup_prefix = markup_fn(self)
+        if markup_prefix.startswith("<") and markup_prefix.endswith(">"):
+            markup_suffix = "</" + markup_prefix[1:]
+        else:
+            markup_suffix = markup_prefix
+        if any(parent.tag in _CODE_TAGS for parent in el.iterancestors()):
+            return text
+        prefix, suffix, text = markdownify.chomp(text)
+        if not text:
+            return ""
+        return "%s%s%s%s%s" % (prefix, markup_prefix, text, markup_suffix, suffix)
+
+    return implementation
+
+
+_HEADING_TAG_RE = re.compile(r"h[1-6]")
+_NEWLINE_WHITESPACE_RE = re.compile(r"[\t \r\n]*[\r\n][\t \r\n]*")
+_WHITESPACE_RE = re.compile(r"[\t ]+")
+_BLOCK_TAGS = frozenset(["p", "blockquote", "ol", "ul", "li", "table", "thead", "tbody", "tfoot", "tr", "td", "th"])
+_CODE_TAGS = frozenset(["pre", "code", "kbd", "samp"])
+
+# The kinds of child nodes seen by _LxmlMarkdownify: text and comments (which, as in BeautifulSoup, are siblings
+# but produce no output), and elements
+_TEXT_NODE, _COMMENT_NODE, _ELEMENT_NODE = 0, 1, 2
+
+
+def _markdown_table_cell(text: str) -> str:
+    """Format the text of a table cell the way markdownify renders the text of a <td> or <th> element."""
+    text = _NEWLINE_WHITESPACE_RE.sub("\n", text)
+    text = _WHITESPACE_RE.sub(" ", text)
+    text = text.replace("*", r"\*").replace("_", r"\_")
+    return text.strip().replace("\n", " ")
+
+
+def _markdown_table(header: List[str], rows: Iterable[List[str]]) -> str:
+    """
+    Render a table straight to Markdown, with the same output as markdownify converting an HTML table whose first row
+    holds `header` in <th> cells and the remaining rows <td> cells.
+    """
+    lines = ["|" + "".join(" %s |" % _markdown_table_cell(cell) for cell in header)]
+    lines.append("| " + " | ".join(["---"] * len(header)) + " |")
+    for row in rows:
+        lines.append("|" + "".join(" %s |" % _markdown_table_cell(cell) for cell in row))
+    return "\n".join(lines)
+
+
+def _remove_whitespace_inside(name: Optional[str]) -> bool:
+    return name is not None and (name in _BLOCK_TAGS or _HEADING_TAG_RE.match(name) is not None)
+
+
+def _remove_whitespace_outside(name: Optional[str]) -> bool:
+    return name == "pre" or _remove_whitespace_inside(name)
+
+
+class _LxmlMarkdownify(_CustomMarkdownify):
+    """
+    A faster engine producing the same Markdown as _CustomMarkdownify, from an lxml.html tree instead of a
+    BeautifulSoup one. It replays markdownify's tree walk, including its whitespace rules, and keeps the overrides
+    of _CustomMarkdownify (headings, links and images); only the conversions that inspect the tree are reimplemented
+    on top of lxml. Elements in `skip_tags` are ignored, as if they had been extracted from the tree.
+    """
+
+    def __init__(self, skip_tags: Iterable[str] = ("script", "style"), **options: Any):
+        super().__init__(**options)
+        self._skip_tags = frozenset(skip_tags)
+
+        # Maps each converted element to its parent's child list and its index there, to answer sibling queries
+        self._positions: Dict[Any, Tuple[List[Tuple[int, Any, Any]], int]] = {}
+
+    def convert_tree(self, el: Any) -> str:
+        """Convert the children of an lxml element."""
+        try:
+            return self._process_element(el, convert_as_inline=False, children_only=True)
+        finally:
+            self._positions.clear()
+
+    def _children(self, el: Any) -> List[Tuple[int, Any, Any]]:
+        """List the (kind, tag name, node) children of an element, with lxml's text and tails as text nodes."""
+        children = []
+        if el.text:
+            children.append((_TEXT_NODE, None, el.text))
+        for child in el:
+            if not isinstance(child.tag, str):
+                # Comments and processing instructions
+                children.append((_COMMENT_NODE, None, child.text or ""))
+            elif child.tag not in self._skip_tags:
+                children.append((_ELEMENT_NODE, child.tag, child))
+            if child.tail:
+                children.append((_TEXT_NODE, None, child.tail))
+        return children
+
+    def _process_element(
+        self, el: Any, convert_as_inline: bool, children_only: bool = False, in_pre: bool = False, in_code: bool = False
+    ) -> str:
+        """Same as markdownify's process_tag, with `in_pre` and `in_code` telling whether an ancestor is <pre> or code."""
+        text = ""
+        name = el.tag
+
+        # markdown headings or cells can't include block elements (elements w/newlines)
+        convert_children_as_inline = convert_as_inline
+        if not children_only and (_HEADING_TAG_RE.match(name) is not None or name in ("td", "th")):
+            convert_children_as_inline = True
+
+        # Remove whitespace-only text nodes just before, after or inside block-level elements. Like markdownify,
+        # the node following each removed one is not examined, since BeautifulSoup iterates the list it removes from
+        children = self._children(el)
+        remove_inside = _remove_whitespace_inside(name)
+        i = 0
+        while i < len(children):
+            kind, _, node = children[i]
+            if kind != _ELEMENT_NODE and node.strip() == "":
+                previous_child = children[i - 1] if i > 0 else None
+                next_child = children[i + 1] if i + 1 < len(children) else None
+                if (
+                    (remove_inside and (previous_child is None or next_child is None))
+                    or (previous_child is not None and _remove_whitespace_outside(previous_child[1]))
+                    or (next_child is not None and _remove_whitespace_outside(next_child[1]))
+                ):
+                    del children[i]
+            i += 1
+
+        # Convert the children first
+        in_pre = in_pre or name == "pre"
+        in_code = in_code or name in _CODE_TAGS
+        for i, (kind, child_name, node) in enumerate(children):
+            if kind == _TEXT_NODE:
+                previous_child = children[i - 1] if i > 0 else None
+                next_child = children[i + 1] if i + 1 < len(children) else None
+                text += self._process_text(node, previous_child, next_child, remove_inside, in_pre, in_code)
+            elif kind == _ELEMENT_NODE:
+                self._positions[node] = (children, i)
+                text_strip = text.rstrip("\n")
+                newlines_left = len(text) - len(text_strip)
+                next_text = self._process_element(node, convert_children_as_inline, in_pre=in_pre, in_code=in_code)
+                next_text_strip = next_text.lstrip("\n")
+                newlines_right = len(next_text) - len(next_text_strip)
+                newlines = "\n" * max(newlines_left, newlines_right)
+                text = text_strip + newlines + next_text_strip
+
+        if not children_only:
+            convert_fn = getattr(self, "convert_%s" % name, None)
+            if convert_fn and self.should_convert_tag(name):
+                text = convert_fn(el, text, convert_as_inline)
+
+        return text
+
+    def _process_text(
+        self,
+        text: str,
+        previous_child: Optional[Tuple[int, Any, Any]],
+        next_child: Optional[Tuple[int, Any, Any]],
+        remove_inside: bool,
+        in_pre: bool,
+        in_code: bool,
+    ) -> str:
+        """Same as markdownify's process_text."""
+        # normalize whitespace if we're not inside a preformatted element
+        if not in_pre:
+            if self.options["wrap"]:
+                text = markdownify.all_whitespace_re.sub(" ", text)
+            else:
+                text = _NEWLINE_WHITESPACE_RE.sub("\n", text)
+                text = _WHITESPACE_RE.sub(" ", text)
+
+        # escape special characters if we're not inside a preformatted or code element
+        if not in_code:
+            text = self.escape(text)
+
+        # remove leading whitespace at the start or just after a block-level element; remove trailing whitespace at
+        # the end or just before a block-level element.
+        if (previous_child is not None and _remove_whitespace_outside(previous_child[1])) or (
+            remove_inside and previous_child is None
+        ):
+            text = text.lstrip()
+        if (next_child is not None and _remove_whitespace_outside(next_child[1])) or (
+            remove_inside and next_child is None
+        ):
+            text = text.rstrip()
+
+        return text
+
+    def _sibling(self, el: Any, step: int) -> Optional[Tuple[int, Any, Any]]:
+        """Return the previous (step=-1) or next (step=1) child of el's parent, as seen by the conversion."""
+        if el not in self._positions:
+            return None
+        children, index = self._positions[el]
+        index += step
+        return children[index] if 0 <= index < len(children) else None
+
+    def convert_code(self, el: Any, text: str, convert_as_inline: bool) -> str:
+        parent = el.getparent()
+        if parent is not None and parent.tag == "pre":
+            return text
+        return self._convert_inline_code(el, text, convert_as_inline)
+
+    _convert_inline_code = _lxml_inline_conversion(lambda self: "`")
+
+    convert_kbd = convert_code
+    convert_samp = convert_code
+
+    convert_b = _lxml_inline_conversion(lambda self: 2 * self.options["strong_em_symbol"])
+    convert_strong = convert_b
+    convert_em = _lxml_inline_conversion(lambda self: self.options["strong_em_symbol"])
+    convert_i = convert_em
+    convert_del = _lxml_inline_conversion(lambda self: "~~")
+    convert_s = convert_del
+    convert_sub = _lxml_inline_conversion(lambda self: self.options["sub_symbol"])
+    convert_sup = _lxml_inline_conversion(lambda self: self.options["sup_symbol"])
+
+    def convert_img(self, el: Any, text: str, convert_as_inline: bool) -> str:
+        parent = el.getparent()
+        return self._image_markdown(
+            el.get("alt"), el.get("src"), el.get("title"), None if parent is None else parent.tag, convert_as_inline
+        )
+
+    def convert_list(self, el: Any, text: str, convert_as_inline: bool) -> str:
+        # Converting a list to inline is undefined.
+        # Ignoring convert_to_inline for list.
+        next_child = self._sibling(el, 1)
+        before_paragraph = next_child is not None and next_child[1] not in ["ul", "ol"]
+        nested = el.tag == "li" or any(parent.tag == "li" for parent in el.iterancestors())
+        if nested:
+            # remove trailing newline if nested
+            return "\n" + text.rstrip()
+        return "\n\n" + text + ("\n" if before_paragraph else "")
+
+    convert_ul = convert_list
+    convert_ol = convert_list
+
+    def convert_li(self, el: Any, text: str, convert_as_inline: bool) -> str:
+        parent = el.getparent()
+        if parent is not None and parent.tag == "ol":
+            start = parent.get("start")
+            start = int(start) if start and start.isnumeric() else 1
+            bullet = "%s." % (start + self._positions[el][1])
+        else:
+            depth = sum(1 for ancestor in el.iterancestors("ul")) - 1
+            bullets = self.options["bullets"]
+            bullet = bullets[depth % len(bullets)]
+        bullet = bullet + " "
+        text = (text or "").strip()
+        text = self.indent(text, len(bullet))
+        if text:
+            text = bullet + text[len(bullet) :]
+        return "%s\n" % text
+
+    def convert_td(self, el: Any, text: str, convert_as_inline: bool) -> str:
+        colspan = el.get("colspan")
+        colspan = int(colspan) if colspan is not None and colspan.isdigit() else 1
+        return " " + text.strip().replace("\n", " ") + " |" * colspan
+
+    convert_th = convert_td
+
+    def convert_tr(self, el: Any, text: str, convert_as_inline: bool) -> str:
+        cells = list(el.iterdescendants("td", "th"))
+        parent = el.getparent()
+        grandparent = parent.getparent()
+        is_first_row = self._sibling(el, -1) is None
+        is_headrow = (
+            all(cell.tag == "th" for cell in cells)
+            or (is_first_row and not parent.tag == "tbody")
+            or (
+                is_first_row
+                and parent.tag == "tbody"
+                and (grandparent is None or next(grandparent.iterdescendants("thead"), None) is None)
+            )
+        )
+        overline = ""
+        underline = ""
+        if is_headrow and is_first_row:
+            # first row and is headline: print headline underline
+            full_colspan = 0
+            for cell in cells:
+                colspan = cell.get("colspan")
+                full_colspan += int(colspan) if colspan is not None and colspan.isdigit() else 1
+            underline += "| " + " | ".join(["---"] * full_colspan) + " |" + "\n"
+        elif is_first_row and (
+            parent.tag == "table" or (parent.tag == "tbody" and self._sibling(parent, -1) is None)
+        ):
+            # first row, not headline, and the parent is table or tbody at the beginning of a table.
+            # print empty headline above this row
+            overline += "| " + " | ".join([""] * len(cells)) + " |" + "\n"
+            overline += "| " + " | ".join(["---"] * len(cells)) + " |" + "\n"
+        return overline + "|" + text + "\n" + underline
+
+
+# Conversion sources are either a path on disk, or a binary file-like object holding the payload in memory
+ConversionSource = Union[str, BinaryIO]
+
+
+@contextlib.contextmanager
+def _open_source(source: ConversionSource) -> Iterator[BinaryIO]:
+    """Open a conversion source for binary reading, from its first byte."""
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            yield fh
+    else:
+        source.seek(0)
+        yield source
+
+
+def _read_source_text(source: ConversionSource) -> str:
+    """Read a conversion source as UTF-8 text, with the same newline handling as `open(..., "rt")`."""
+    if isinstance(source, str):
+        with open(source, "rt", encoding="utf-8") as fh:
+            return fh.read()
+
+    source.seek(0)
+    wrapper = io.TextIOWrapper(source, encoding="utf-8")
+    try:
+        return wrapper.read()
+    finally:
+        # Don't let the wrapper close the underlying stream
+        wrapper.detach()
+
+
+@contextlib.contextmanager
+def _source_path(source: ConversionSource, suffix: str = "") -> Iterator[str]:
+    """Yield a path for tools that only read from disk, spilling in-memory sources to a temporary file."""
+    if isinstance(source, str):
+        yield source
+        return
+
+    handle, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(handle, "wb") as fh:
+            source.seek(0)
+            shutil.copyfileobj(source, fh)
+        yield temp_path
+    finally:
+        os.unlink(temp_path)
+
+
+class DocumentSection(NamedTuple):
+    """A span of converted text: the section under a heading, a page, slide or sheet, or a table."""
+
+    # "heading", "page", "slide", "sheet" or "table"
+    kind: str
+    title: str
+    start: int
+    end: int
+    # The level of headings, 0 for other sections
+    level: int = 0
+
+    @property
+    def name(self) -> str:
+        """How the section is referred to: the title of a heading, or e.g. "page 3" for other sections."""
+        return self.title if self.kind == "heading" else f"{self.kind} {self.title}"
+
+
 class DocumentConverterResult:
     """The result of converting a document to text."""
 
-    def __init__(self, title: Union[str, None] = None, text_content: str = ""):
+    def __init__(
+        self,
+        title: Union[str, None] = None,
+        text_content: str = "",
+        page_offsets: Optional[List[Tuple[int, int]]] = None,
+        sections: Optional[List[DocumentSection]] = None,
+        cacheable: bool = True,
+    ):
         self.title: Union[str, None] = title
         self.text_content: str = text_content
+        # For paged documents: (1-based page number, offset of the page's first character in text_content)
+        self.page_offsets: Optional[List[Tuple[int, int]]] = page_offsets
+        # The structural index of text_content, in document order. Converters may add sections that can't be told
+        # from the Markdown (e.g., sheets), with `end` equal to `start`: MarkdownConverter indexes headings, pages,
+        # slides and tables, and computes where every section ends
+        self.sections: Optional[List[DocumentSection]] = sections
+        # False for results that fell back on a placeholder after a failure that may be temporary (e.g., a
+        # transcription service that was unreachable), which must not be replayed from the cache in later sessions
+        self.cacheable: bool = cacheable
+
+    def find_section(self, query: str) -> Optional[DocumentSection]:
+        """
+        Return the first section whose title, or kind and title (e.g., "page 3"), matches `query` ignoring case, or
+        else the first whose title contains it. Returns None if there is no such section.
+        """
+        query = query.strip().lower()
+        sections = self.sections or []
+        for section in sections:
+            if query in (section.title.lower(), f"{section.kind} {section.title}".lower()):
+                return section
+        for section in sections:
+            if query and query in section.title.lower():
+                return section
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation of the result."""
+        return {
+            "title": self.title,
+            "text_content": self.text_content,
+            "page_offsets": self.page_offsets,
+            "sections": self.sections,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DocumentConverterResult":
+        """Rebuild a result from the output of `to_dict`."""
+        page_offsets = data.get("page_offsets")
+        sections = data.get("sections")
+        return cls(
+            title=data.get("title"),
+            text_content=data.get("text_content", ""),
+            page_offsets=None if page_offsets is None else [tuple(p) for p in page_offsets],
+            sections=None if sections is None else [DocumentSection(*s) for s in sections],
+        )
 
 
 class DocumentConverter:
     """Abstract superclass of all DocumentConverters."""
 
+    # Bump when a change to a converter alters its output, so that cached conversions are invalidated
+    version: str = "1"
+
+    # Converters with side effects (e.g., extracting files to disk) must not have their results replayed from a cache
+    cacheable: bool = True
+
+    # Converters that keep state between conversions (e.g., the archive members they listed) must run in the process
+    # that uses it, rather than in an isolated worker process
+    isolatable: bool = True
+
+    # The file extensions this converter handles, used to dispatch files straight to it. Converters that declare
+    # none are tried for every extension
+    file_extensions: List[str] = []
+
+    # An optional regular expression that the source URL must match for this converter to be tried
+    url_pattern: Optional[str] = None
+
+    # The least number of seconds a conversion is given in an isolated worker, for converters whose conversions take
+    # much longer than MarkdownConverter's isolation_timeout (e.g., transcribing recordings)
+    min_isolation_timeout: float = 0.0
+
     def convert(self, local_path: str, **kwargs: Any) -> Union[None, DocumentConverterResult]:
         raise NotImplementedError()
 
+    def cache_options(self) -> Dict[str, Any]:
+        """The constructor options that alter this converter's output. They are part of conversion cache keys."""
+        return {}
+
 
 class PlainTextConverter(DocumentConverter):
     """Anything with content type text/plain"""
@@ -137,35 +584,86 @@ class PlainTextConverter(DocumentConverter):
         # elif "text/" not in content_type.lower():
         #     return None
 
-        text_content = ""
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            text_content = fh.read()
+        text_content = _read_source_text(local_path)
         return DocumentConverterResult(
             title=None,
             text_content=text_content,
         )
 
 
+def _parse_html_source(local_path: ConversionSource, **kwargs: Any) -> BeautifulSoup:
+    """
+    Parse an HTML source with the parser named by the `html_parser` option ("html.parser" or the faster "lxml").
+    Within a single conversion, `MarkdownConverter` passes a shared `parsed_html` dict, so that the HTML-family
+    converters all reuse the same tree instead of re-reading and re-parsing the file.
+    """
+    parser = kwargs.get("html_parser") or "html.parser"
+    parsed_html = kwargs.get("parsed_html")
+    if parsed_html is not None and parser in parsed_html:
+        return parsed_html[parser]
+
+    soup = BeautifulSoup(_read_source_text(local_path), parser)
+    if parsed_html is not None:
+        parsed_html[parser] = soup
+    return soup
+
+
+def _lxml_document(html_content: str) -> Any:
+    """Parse an HTML string into an lxml.html tree, or None if the document is empty."""
+    # Parse UTF-8 bytes, since lxml rejects strings that carry their own encoding declaration
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    try:
+        return lxml.html.document_fromstring(html_content.encode("utf-8"), parser=parser)
+    except lxml.etree.ParserError:
+        return None
+
+
+def _parse_html_tree(local_path: ConversionSource, **kwargs: Any) -> Any:
+    """Same as _parse_html_source, for the lxml engine: parse an HTML source into an lxml.html tree."""
+    parsed_html = kwargs.get("parsed_html")
+    if parsed_html is not None and "lxml.html" in parsed_html:
+        return parsed_html["lxml.html"]
+
+    root = _lxml_document(_read_source_text(local_path))
+    if parsed_html is not None:
+        parsed_html["lxml.html"] = root
+    return root
+
+
+def _lxml_string(el: Any) -> Optional[str]:
+    """The lxml counterpart of BeautifulSoup's Tag.string: the text of an element with a single text child."""
+    while el is not None and len(el) == 1 and not el.text and not el[0].tail and isinstance(el[0].tag, str):
+        el = el[0]
+    if el is None or len(el) > 0:
+        return None
+    return el.text
+
+
 class HtmlConverter(DocumentConverter):
     """Anything with content type text/html"""
 
+    file_extensions = [".html", ".htm"]
+
     def convert(self, local_path: str, **kwargs: Any) -> Union[None, DocumentConverterResult]:
         # Bail if not html
         extension = kwargs.get("file_extension", "")
         if extension.lower() not in [".html", ".htm"]:
             return None
 
-        result = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            result = self._convert(fh.read())
-
-        return result
+        if kwargs.get("markdown_engine") == "lxml":
+            return self._convert_tree(_parse_html_tree(local_path, **kwargs))
+        return self._convert_soup(_parse_html_source(local_path, **kwargs))
 
-    def _convert(self, html_content: str) -> Union[None, DocumentConverterResult]:
-        """Helper function that converts and HTML string."""
+    def _convert(self, html_content: str, **kwargs: Any) -> Union[None, DocumentConverterResult]:
+        """Helper function that converts and HTML string, with the `html_parser` and `markdown_engine` options."""
 
         # Parse the string
-        soup = BeautifulSoup(html_content, "html.parser")
+        if kwargs.get("markdown_engine") == "lxml":
+            return self._convert_tree(_lxml_document(html_content))
+        return self._convert_soup(BeautifulSoup(html_content, kwargs.get("html_parser") or "html.parser"))
+
+    def _convert_soup(self, soup: BeautifulSoup) -> Union[None, DocumentConverterResult]:
+        """Helper function that converts a parsed HTML document."""
 
         # Remove javascript and style blocks
         for script in soup(["script", "style"]):
@@ -185,10 +683,27 @@ class HtmlConverter(DocumentConverter):
             title=None if soup.title is None else soup.title.string, text_content=webpage_text
         )
 
+    def _convert_tree(self, root: Any) -> Union[None, DocumentConverterResult]:
+        """Same as _convert_soup, for a document parsed by lxml, converted with the lxml engine."""
+        if root is None:
+            return DocumentConverterResult(title=None, text_content="")
+
+        # Print only the main content. Javascript and style blocks are skipped by the engine
+        body_elm = next(root.iter("body"), None)
+        webpage_text = _LxmlMarkdownify().convert_tree(root if body_elm is None else body_elm)
+
+        title_elm = next(root.iter("title"), None)
+        return DocumentConverterResult(
+            title=None if title_elm is None else _lxml_string(title_elm), text_content=webpage_text
+        )
+
 
 class WikipediaConverter(DocumentConverter):
     """Handle Wikipedia pages separately, focusing only on the main document content."""
 
+    file_extensions = [".html", ".htm"]
+    url_pattern = r"^https?:\/\/[a-zA-Z]{2,3}\.wikipedia.org\/"
+
     def convert(self, local_path: str, **kwargs: Any) -> Union[None, DocumentConverterResult]:
         # Bail if not Wikipedia
         extension = kwargs.get("file_extension", "")
@@ -198,10 +713,11 @@ class WikipediaConverter(DocumentConverter):
         if not re.search(r"^https?:\/\/[a-zA-Z]{2,3}\.wikipedia.org\/", url):
             return None
 
+        if kwargs.get("markdown_engine") == "lxml":
+            return self._convert_tree(_parse_html_tree(local_path, **kwargs))
+
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = _parse_html_source(local_path, **kwargs)
 
         # Remove javascript and style blocks
         for script in soup(["script", "style"]):
@@ -230,10 +746,48 @@ class WikipediaConverter(DocumentConverter):
             text_content=webpage_text,
         )
 
+    def _convert_tree(self, root: Any) -> Union[None, DocumentConverterResult]:
+        """Same as convert, for a page parsed by lxml, converted with the lxml engine."""
+        if root is None:
+            return DocumentConverterResult(title=None, text_content="")
+
+        # Print only the main content
+        body_elm = next(iter(root.xpath("//div[@id='mw-content-text']")), None)
+        title_elm = next(
+            iter(root.xpath("//span[contains(concat(' ', normalize-space(@class), ' '), ' mw-page-title-main ')]")), None
+        )
+
+        webpage_text = ""
+        page_title_elm = next(root.iter("title"), None)
+        main_title = None if page_title_elm is None else _lxml_string(page_title_elm)
+
+        if body_elm is not None:
+            # What's the title
+            if title_elm is not None and (title_elm.text or len(title_elm) > 0):
+                main_title = _lxml_string(title_elm)
+                assert isinstance(main_title, str)
+
+            # Convert the page
+            webpage_text = f"# {main_title}\n\n" + _LxmlMarkdownify().convert_tree(body_elm)
+        else:
+            webpage_text = _LxmlMarkdownify().convert_tree(root)
+
+        return DocumentConverterResult(
+            title=main_title,
+            text_content=webpage_text,
+        )
+
+
+# The youtube_transcript_api errors which mean that a video has no transcript to fetch, rather than that fetching failed
+_PERMANENT_TRANSCRIPT_ERRORS = {"TranscriptsDisabled", "NoTranscriptFound", "NoTranscriptAvailable", "VideoUnavailable"}
+
 
 class YouTubeConverter(DocumentConverter):
     """Handle YouTube specially, focusing on the video title, description, and transcript."""
 
+    file_extensions = [".html", ".htm"]
+    url_pattern = r"^https://www\.youtube\.com/watch\?"
+
     def convert(self, local_path: str, **kwargs: Any) -> Union[None, DocumentConverterResult]:
         # Bail if not YouTube
         extension = kwargs.get("file_extension", "")
@@ -244,9 +798,7 @@ class YouTubeConverter(DocumentConverter):
             return None
 
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = _parse_html_source(local_path, **kwargs)
 
         # Read the meta tags
         assert soup.title is not None and soup.title.string is not None
@@ -304,19 +856,24 @@ class YouTubeConverter(DocumentConverter):
             webpage_text += f"\n### Description\n{description}\n"
 
         transcript_text = ""
+        transcript_failed = False
         parsed_url = urlparse(url)  # type: ignore
         params = parse_qs(parsed_url.query)  # type: ignore
         if "v" in params:
             assert isinstance(params["v"][0], str)
             video_id = str(params["v"][0])
             try:
+                from youtube_transcript_api import YouTubeTranscriptApi
+                from youtube_transcript_api.formatters import SRTFormatter
+
                 # Must be a single transcript.
                 transcript = YouTubeTranscriptApi.get_transcript(video_id)  # type: ignore
                 # transcript_text = " ".join([part["text"] for part in transcript])  # type: ignore
                 # Alternative formatting:
                 transcript_text = SRTFormatter().format_transcript(transcript)
-            except Exception:
-                pass
+            except Exception as e:
+                # Videos without transcripts stay that way, unlike network errors or a missing package
+                transcript_failed = type(e).__name__ not in _PERMANENT_TRANSCRIPT_ERRORS
         if transcript_text:
             webpage_text += f"\n### Transcript\n{transcript_text}\n"
 
@@ -326,6 +883,7 @@ class YouTubeConverter(DocumentConverter):
         return DocumentConverterResult(
             title=title,
             text_content=webpage_text,
+            cacheable=not transcript_failed,
         )
 
     def _get(self, metadata: Dict[str, str], keys: List[str], default: Union[str, None] = None) -> Union[str, None]:
@@ -351,175 +909,723 @@ class YouTubeConverter(DocumentConverter):
         return None
 
 
+def _map_ranges_in_processes(
+    render_range: Callable[[Union[str, bytes], int, int], List[Any]],
+    source: ConversionSource,
+    first: int,
+    last: int,
+    workers: int,
+) -> Iterator[Any]:
+    """
+    Split the items `first` to `last` (1-based and inclusive, e.g. pages or slides) of a document into contiguous
+    ranges, call `render_range(document, start, end)` on each of them in a pool of `workers` processes, and yield what
+    they return in order. Used by the parallel engines of PdfConverter and PptxConverter.
+    """
+    # A few ranges per worker, so that one slow range doesn't leave the other workers idle
+    num_items = last - first + 1
+    num_ranges = min(workers * 2, num_items)
+    range_size = -(-num_items // num_ranges)
+    ranges = [(start, min(start + range_size - 1, last)) for start in range(first, last + 1, range_size)]
+
+    # In-memory documents are shipped to the workers as bytes
+    document = source
+    if not isinstance(source, str):
+        with _open_source(source) as fh:
+            document = fh.read()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=worker_context()) as executor:
+        futures = [executor.submit(render_range, document, start, end) for start, end in ranges]
+        for future in futures:
+            yield from future.result()
+
+
+def _iter_pdf_pages(
+    pdf_file: ConversionSource, first_page: int = 1, last_page: Optional[int] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily extract the text of a PDF, one page at a time, yielding (1-based page number, page text) pairs.
+    Joining the text of all pages gives exactly what `pdfminer.high_level.extract_text` returns.
+    """
+    import pdfminer.converter
+    import pdfminer.layout
+    import pdfminer.pdfinterp
+    import pdfminer.pdfpage
+
+    with _open_source(pdf_file) as fp, StringIO() as output_string:
+        rsrcmgr = pdfminer.pdfinterp.PDFResourceManager(caching=True)
+        device = pdfminer.converter.TextConverter(rsrcmgr, output_string, laparams=pdfminer.layout.LAParams())
+        interpreter = pdfminer.pdfinterp.PDFPageInterpreter(rsrcmgr, device)
+
+        for page_number, page in enumerate(pdfminer.pdfpage.PDFPage.get_pages(fp), start=1):
+            if page_number < first_page:
+                continue
+            if last_page is not None and page_number > last_page:
+                break
+
+            interpreter.process_page(page)
+            yield page_number, output_string.getvalue()
+
+            # Start the next page with an empty buffer
+            output_string.seek(0)
+            output_string.truncate(0)
+
+
+def _count_pdf_pages(pdf_file: ConversionSource) -> int:
+    """Count the pages of a PDF without laying any of them out."""
+    import pdfminer.pdfpage
+
+    with _open_source(pdf_file) as fp:
+        return sum(1 for _ in pdfminer.pdfpage.PDFPage.get_pages(fp))
+
+
+def _extract_pdf_page_range(pdf_file: Union[str, bytes], first_page: int, last_page: int) -> List[Tuple[int, str]]:
+    """Extract a contiguous range of pages. Runs in worker processes of the parallel PDF engine."""
+    if isinstance(pdf_file, bytes):
+        pdf_file = io.BytesIO(pdf_file)
+    return list(_iter_pdf_pages(pdf_file, first_page, last_page))
+
+
 class PdfConverter(DocumentConverter):
     """
     Converts PDFs to Markdown. Most style information is ignored, so the results are essentially plain-text.
+
+    Pages are extracted lazily. The `pdf_page_range` option, a (first, last) pair of 1-based inclusive page numbers,
+    limits extraction to part of the document, and the `pdf_max_chars` / `pdf_max_tokens` options stop extraction
+    once enough normalized text has been collected. The offset of every extracted page is recorded in `page_offsets`.
+
+    pdfminer is pure Python and single-threaded. With `parallel_workers` greater than one, documents of at least
+    `parallel_min_pages` pages are split into contiguous page ranges that are extracted in a process pool, then
+    reassembled in page order. Budgeted extractions stay serial, since they usually stop after a few pages.
     """
 
+    version = "2"
+    file_extensions = [".pdf"]
+
+    def __init__(self, parallel_workers: int = 0, parallel_min_pages: int = 50):
+        """
+        Initialize the converter.
+
+        Args:
+            parallel_workers: The number of worker processes extracting pages. 0 or 1 disables the parallel engine.
+                Defaults to 0
+            parallel_min_pages: Documents with fewer pages than this are always extracted serially. Defaults to 50
+        """
+        self.parallel_workers = parallel_workers
+        self.parallel_min_pages = parallel_min_pages
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a PDF
         extension = kwargs.get("file_extension", "")
         if extension.lower() != ".pdf":
             return None
 
+        first_page, last_page = kwargs.get("pdf_page_range") or (1, None)
+        budget = self._char_budget(kwargs.get("pdf_max_chars"), kwargs.get("pdf_max_tokens"))
+
+        if budget is None and self.parallel_workers > 1:
+            page_iterator = self._iter_pages_parallel(local_path, first_page, last_page)
+        else:
+            page_iterator = _iter_pdf_pages(local_path, first_page, last_page)
+
+        pages: List[str] = []
+        page_offsets: List[Tuple[int, int]] = []
+        length = 0
+
+        def collect_pages() -> Iterator[str]:
+            nonlocal length
+            for page_number, text in page_iterator:
+                page_offsets.append((page_number, length))
+                pages.append(text)
+                length += len(text)
+                yield text
+
+        if budget is None:
+            for _ in collect_pages():
+                pass
+        else:
+            # The budget counts the text as MarkdownConverter returns it, once normalized, which can be much shorter
+            # than what pdfminer extracts (e.g., lines padded with spaces)
+            normalized_length = 0
+            for piece in _TextNormalizer().normalize(collect_pages()):
+                normalized_length += len(piece)
+                if normalized_length >= budget:
+                    break
+
         return DocumentConverterResult(
             title=None,
-            text_content=pdfminer.high_level.extract_text(local_path),
+            text_content="".join(pages),
+            page_offsets=page_offsets,
+        )
+
+    def _iter_pages_parallel(
+        self, local_path: str, first_page: int, last_page: Optional[int]
+    ) -> Iterator[Tuple[int, str]]:
+        """Extract pages in a process pool, yielding them in page order."""
+        page_count = _count_pdf_pages(local_path)
+        last_page = page_count if last_page is None else min(last_page, page_count)
+        if last_page - first_page + 1 < max(self.parallel_min_pages, 1):
+            yield from _iter_pdf_pages(local_path, first_page, last_page)
+            return
+
+        yield from _map_ranges_in_processes(
+            _extract_pdf_page_range, local_path, first_page, last_page, self.parallel_workers
         )
 
+    def _char_budget(self, max_chars: Optional[int], max_tokens: Optional[int]) -> Optional[int]:
+        """Combine the character and token budgets. Tokens are approximated as four characters each."""
+        budgets = [b for b in [max_chars, None if max_tokens is None else max_tokens * 4] if b is not None]
+        return min(budgets) if budgets else None
+
 
 class DocxConverter(HtmlConverter):
     """
     Converts DOCX files to Markdown. Style information (e.g.m headings) and tables are preserved where possible.
+
+    Embedded images are never encoded as data URIs. Depending on `image_mode`, they are referenced by a truncated data
+    URI that only gives their type (as markdownify would render it), written once to `image_dir` and referenced by
+    path, or dropped.
     """
 
+    file_extensions = [".docx"]
+
+    def __init__(self, image_mode: str = "truncate", image_dir: str = "downloads/docx_images", engine: str = "html"):
+        """
+        Initialize the converter.
+
+        Args:
+            image_mode: "truncate", "save" or "drop". Defaults to "truncate"
+            image_dir: The directory where images are written in the "save" mode. Each image is written once, named
+                after a hash of its content. Defaults to "downloads/docx_images"
+            engine: "html" converts mammoth's HTML with the HTML-to-Markdown engine. "mammoth" uses mammoth's own
+                Markdown writer, which skips the HTML round-trip, but flattens tables into paragraphs and
+                backslash-escapes punctuation in links. Defaults to "html"
+        """
+        if image_mode not in ["truncate", "save", "drop"]:
+            raise ValueError(f"Unknown image mode '{image_mode}', expected 'truncate', 'save' or 'drop'")
+        if engine not in ["html", "mammoth"]:
+            raise ValueError(f"Unknown DOCX engine '{engine}', expected 'html' or 'mammoth'")
+
+        self.image_mode = image_mode
+        self.image_dir = image_dir
+        self.engine = engine
+        # Results referencing saved images must not be replayed once the images may be gone
+        self.cacheable = image_mode != "save"
+
+    def cache_options(self) -> Dict[str, Any]:
+        return {"image_mode": self.image_mode, "image_dir": self.image_dir, "engine": self.engine}
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a DOCX
         extension = kwargs.get("file_extension", "")
         if extension.lower() != ".docx":
             return None
 
+        import mammoth
+
         result = None
-        with open(local_path, "rb") as docx_file:
-            result = mammoth.convert_to_html(docx_file)
+        with _open_source(local_path) as docx_file:
+            if self.engine == "mammoth":
+                md_content = mammoth.convert_to_markdown(docx_file, convert_image=self._image_converter()).value
+                return DocumentConverterResult(title=None, text_content=md_content.strip())
+
+            result = mammoth.convert_to_html(docx_file, convert_image=self._image_converter())
             html_content = result.value
-            result = self._convert(html_content)
+            result = self._convert(html_content, **kwargs)
 
         return result
 
+    def _image_converter(self) -> Callable[[Any], List[Any]]:
+        """Build mammoth's image handler for the image mode."""
+        import mammoth
+
+        if self.image_mode == "drop":
+            return lambda image: []
+
+        if self.image_mode == "save":
+            return mammoth.images.img_element(lambda image: {"src": self._save_image(image)})
+
+        # A data URI without its payload. The HTML-to-Markdown engines render it as "data:<type>;base64..."
+        return mammoth.images.img_element(lambda image: {"src": f"data:{image.content_type};base64,"})
+
+    def _save_image(self, image: Any) -> str:
+        """Write an image to the image directory, unless an identical one is there already, and return its path."""
+        with image.open() as fh:
+            data = fh.read()
+        extension = mimetypes.guess_extension(image.content_type or "") or ""
+        path = os.path.join(self.image_dir, hashlib.sha256(data).hexdigest()[:16] + extension)
+        if not os.path.exists(path):
+            os.makedirs(self.image_dir, exist_ok=True)
+            with open(path, "wb") as fh:
+                fh.write(data)
+        return path
+
 
 class XlsxConverter(HtmlConverter):
     """
     Converts XLSX files to Markdown, with each sheet presented as a separate Markdown table.
+
+    By default, sheets are read with pandas and rendered straight to Markdown, with the same output as converting
+    `DataFrame.to_html` through markdownify. With `read_only`, XLSX sheets are instead streamed row by row with
+    openpyxl's read-only mode, so that with `max_rows` or `head_tail_rows` large workbooks are converted in bounded
+    memory; cells are then formatted with str() rather than pandas' column formatting.
+
+    Sheets can be capped to their first `max_rows` rows and `max_cols` columns. With `head_tail_rows`, only the first
+    and last rows of longer sheets are kept, followed by the shape of the sheet.
     """
 
+    file_extensions = [".xlsx", ".xls"]
+
+    def __init__(
+        self,
+        read_only: bool = False,
+        max_rows: Optional[int] = None,
+        max_cols: Optional[int] = None,
+        head_tail_rows: Optional[int] = None,
+    ):
+        """
+        Initialize the converter.
+
+        Args:
+            read_only: Stream XLSX sheets with openpyxl instead of loading them with pandas. Defaults to False
+            max_rows: The maximum number of rows kept per sheet, not counting the header. Defaults to None (no cap)
+            max_cols: The maximum number of columns kept per sheet. Defaults to None (no cap)
+            head_tail_rows: Keep only this many rows from the start and the end of each sheet, and report the sheet
+                shape. Defaults to None (keep all rows)
+        """
+        self.read_only = read_only
+        self.max_rows = max_rows
+        self.max_cols = max_cols
+        self.head_tail_rows = head_tail_rows
+
+    def cache_options(self) -> Dict[str, Any]:
+        return {
+            "read_only": self.read_only,
+            "max_rows": self.max_rows,
+            "max_cols": self.max_cols,
+            "head_tail_rows": self.head_tail_rows,
+        }
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a XLSX
         extension = kwargs.get("file_extension", "")
         if extension.lower() not in [".xlsx", ".xls"]:
             return None
 
-        sheets = pd.read_excel(local_path, sheet_name=None)
+        if self.read_only and extension.lower() == ".xlsx":
+            md_content = self._convert_read_only(local_path)
+        else:
+            md_content = self._convert_frames(local_path, **kwargs)
+
+        # Every line that starts a heading is a sheet's: cells are always rendered in table rows
+        md_content = md_content.strip()
+        sheets = [
+            DocumentSection("sheet", m.group(1), m.start(), m.start()) for m in re.finditer(r"^## (.*)$", md_content, re.M)
+        ]
+
+        return DocumentConverterResult(
+            title=None,
+            text_content=md_content,
+            sections=sheets,
+        )
+
+    def _convert_frames(self, local_path: ConversionSource, **kwargs: Any) -> str:
+        """Read the sheets with pandas and render them."""
+        import pandas as pd
+
+        read_kwargs = {}
+        if self.max_rows is not None and self.head_tail_rows is None:
+            # One more row than kept tells whether the sheet was truncated
+            read_kwargs["nrows"] = self.max_rows + 1
+
+        with _open_source(local_path) as fh:
+            sheets = pd.read_excel(fh, sheet_name=None, **read_kwargs)
+
         md_content = ""
         for s in sheets:
             md_content += f"## {s}\n"
-            html_content = sheets[s].to_html(index=False)
-            md_content += self._convert(html_content).text_content.strip() + "\n\n"
+            md_content += self._render_frame(sheets[s], **kwargs) + "\n\n"
+        return md_content
+
+    def _render_frame(self, df: "pandas.DataFrame", **kwargs: Any) -> str:
+        """Render a sheet read by pandas, applying the row and column caps."""
+        import pandas as pd
+        from pandas.io.formats.format import DataFrameFormatter
+        from pandas.io.formats.printing import pprint_thing
+
+        num_rows, num_cols = df.shape
+        if self.max_cols is not None:
+            df = df.iloc[:, : self.max_cols]
+
+        # Only the rows that are kept get formatted
+        elided = self.head_tail_rows is not None and num_rows > 2 * self.head_tail_rows
+        if elided:
+            df = pd.concat([df.iloc[: self.head_tail_rows], df.iloc[num_rows - self.head_tail_rows :]])
+        elif self.max_rows is not None and self.head_tail_rows is None:
+            df = df.iloc[: self.max_rows]
+
+        # Hierarchical or named columns have extra header rows: let pandas and markdownify lay them out
+        if isinstance(df.columns, pd.MultiIndex) or df.columns.name is not None or len(df.columns) == 0:
+            table = self._convert(df.to_html(index=False), **kwargs).text_content.strip()
+        else:
+            formatter = DataFrameFormatter(df, index=False)
+            columns = [formatter.format_col(i) for i in range(len(df.columns))]
+            rows = [list(row) for row in zip(*columns)]
+            if elided:
+                rows.insert(self.head_tail_rows, ["..."] * len(df.columns))
+            table = _markdown_table([pprint_thing(c) for c in df.columns], rows)
 
-        return DocumentConverterResult(
-            title=None,
-            text_content=md_content.strip(),
+        return table + self._summary(num_rows, num_cols, elided, num_rows > len(df) and not elided)
+
+    def _convert_read_only(self, local_path: ConversionSource) -> str:
+        """Stream the sheets with openpyxl and render them."""
+        import openpyxl
+
+        with _open_source(local_path) as fh:
+            workbook = openpyxl.load_workbook(fh, read_only=True, data_only=True)
+            try:
+                md_content = ""
+                for sheet in workbook.worksheets:
+                    md_content += f"## {sheet.title}\n"
+                    md_content += self._render_rows(sheet.iter_rows(values_only=True)) + "\n\n"
+                return md_content
+            finally:
+                workbook.close()
+
+    def _render_rows(self, rows: Iterator[Tuple[Any, ...]]) -> str:
+        """Render the rows of a sheet streamed by openpyxl, keeping only the rows that will be shown in memory."""
+        header = list(next(rows, None) or ())
+        while header and header[-1] is None:
+            header.pop()
+        num_cols = len(header)
+
+        # Name the columns the way pandas does
+        names: List[str] = []
+        seen: Dict[str, int] = {}
+        for i, value in enumerate(header):
+            name = f"Unnamed: {i}" if value is None else str(value)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        width = num_cols if self.max_cols is None else min(num_cols, self.max_cols)
+
+        head: List[List[str]] = []
+        tail: collections.deque = collections.deque(maxlen=self.head_tail_rows)
+        num_rows = 0
+        blank_rows = 0  # Trailing blank rows are dropped, like pandas does
+        truncated = False
+        for values in rows:
+            if all(value is None for value in values):
+                blank_rows += 1
+                continue
+
+            for row in [[None] * width] * blank_rows + [list(values[:width])]:
+                if self.max_rows is not None and self.head_tail_rows is None and num_rows == self.max_rows:
+                    truncated = True
+                    break
+                row = ["NaN" if value is None else str(value) for value in row] + ["NaN"] * (width - len(row))
+                if self.head_tail_rows is None or len(head) < self.head_tail_rows:
+                    head.append(row)
+                else:
+                    tail.append(row)
+                num_rows += 1
+            blank_rows = 0
+            if truncated:
+                break
+
+        # The tail only holds the last head_tail_rows rows past the head
+        elided = self.head_tail_rows is not None and num_rows > 2 * self.head_tail_rows
+        if elided:
+            head.append(["..."] * width)
+        head.extend(tail)
+
+        return _markdown_table(names[:width], head) + self._summary(
+            None if truncated else num_rows, num_cols, elided, truncated
         )
 
+    def _summary(self, num_rows: Optional[int], num_cols: int, elided: bool, truncated: bool) -> str:
+        """Describe what was left out of a sheet, and its shape when `head_tail_rows` is set."""
+        notes = []
+        if self.head_tail_rows is not None:
+            notes.append(f"Shape: {num_rows} rows x {num_cols} columns.")
+
+        shown = []
+        if elided:
+            k = self.head_tail_rows
+            shown.append(f"rows 1-{k} and {num_rows - k + 1}-{num_rows}")
+        elif truncated:
+            shown.append(f"the first {self.max_rows} rows")
+        if self.max_cols is not None and num_cols > self.max_cols:
+            shown.append(f"the first {self.max_cols} of {num_cols} columns")
+        if shown:
+            notes.append("Showing " + " and ".join(shown) + ".")
+
+        return "\n\n" + " ".join(notes) if notes else ""
+
 
 class PptxConverter(HtmlConverter):
     """
     Converts PPTX files to Markdown. Supports heading, tables and images with alt text.
+
+    With `parallel_workers` greater than one, decks of at least `parallel_min_slides` slides are split into
+    contiguous slide ranges that are rendered in a process pool, then reassembled in slide order.
     """
 
+    file_extensions = [".pptx"]
+
+    def __init__(self, parallel_workers: int = 0, parallel_min_slides: int = 200):
+        """
+        Initialize the converter.
+
+        Args:
+            parallel_workers: The number of worker processes rendering slides. 0 or 1 disables parallel rendering.
+                Defaults to 0
+            parallel_min_slides: Decks with fewer slides than this are always rendered serially. Defaults to 200
+        """
+        self.parallel_workers = parallel_workers
+        self.parallel_min_slides = parallel_min_slides
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a PPTX
         extension = kwargs.get("file_extension", "")
         if extension.lower() != ".pptx":
             return None
 
-        md_content = ""
+        import pptx
+
+        with _open_source(local_path) as fh:
+            presentation = pptx.Presentation(fh)
 
-        presentation = pptx.Presentation(local_path)
-        slide_num = 0
-        for slide in presentation.slides:
-            slide_num += 1
-
-            md_content += f"\n\n<!-- Slide number: {slide_num} -->\n"
-
-            title = slide.shapes.title
-            for shape in slide.shapes:
-                # Pictures
-                if self._is_picture(shape):
-                    # https://github.com/scanny/python-pptx/pull/512#issuecomment-1713100069
-                    alt_text = ""
-                    try:
-                        alt_text = shape._element._nvXxPr.cNvPr.attrib.get("descr", "")
-                    except Exception:
-                        pass
-
-                    # A placeholder name
-                    filename = re.sub(r"\W", "", shape.name) + ".jpg"
-                    md_content += "\n![" + (alt_text if alt_text else shape.name) + "](" + filename + ")\n"
-
-                # Tables
-                if self._is_table(shape):
-                    html_table = "<html><body><table>"
-                    first_row = True
-                    for row in shape.table.rows:
-                        html_table += "<tr>"
-                        for cell in row.cells:
-                            if first_row:
-                                html_table += "<th>" + html.escape(cell.text) + "</th>"
-                            else:
-                                html_table += "<td>" + html.escape(cell.text) + "</td>"
-                        html_table += "</tr>"
-                        first_row = False
-                    html_table += "</table></body></html>"
-                    md_content += "\n" + self._convert(html_table).text_content.strip() + "\n"
-
-                # Text areas
-                elif shape.has_text_frame:
-                    if shape == title:
-                        md_content += "# " + shape.text.lstrip() + "\n"
-                    else:
-                        md_content += shape.text + "\n"
-
-            md_content = md_content.strip()
-
-            if slide.has_notes_slide:
-                md_content += "\n\n### Notes:\n"
-                notes_frame = slide.notes_slide.notes_text_frame
-                if notes_frame is not None:
-                    md_content += notes_frame.text
-                md_content = md_content.strip()
+        num_slides = len(presentation.slides)
+        if self.parallel_workers > 1 and num_slides >= max(self.parallel_min_slides, 1):
+            slides = _map_ranges_in_processes(
+                _render_pptx_slide_range, local_path, 1, num_slides, self.parallel_workers
+            )
+        else:
+            slides = [self._render_slide(slide, n) for n, slide in enumerate(presentation.slides, start=1)]
 
         return DocumentConverterResult(
             title=None,
-            text_content=md_content.strip(),
+            text_content="".join(slides).strip(),
         )
 
+    def _render_slide(self, slide: Any, slide_num: int) -> str:
+        """Render one slide, without trailing whitespace."""
+        parts = [f"\n\n<!-- Slide number: {slide_num} -->\n"]
+
+        title = slide.shapes.title
+        for shape in slide.shapes:
+            # Pictures
+            if self._is_picture(shape):
+                # https://github.com/scanny/python-pptx/pull/512#issuecomment-1713100069
+                alt_text = ""
+                try:
+                    alt_text = shape._element._nvXxPr.cNvPr.attrib.get("descr", "")
+                except Exception:
+                    pass
+
+                # A placeholder name
+                filename = re.sub(r"\W", "", shape.name) + ".jpg"
+                parts.append("\n![" + (alt_text if alt_text else shape.name) + "](" + filename + ")\n")
+
+            # Tables
+            if self._is_table(shape):
+                rows = [[cell.text for cell in row.cells] for row in shape.table.rows]
+                parts.append("\n" + _markdown_table(rows[0], rows[1:]) + "\n")
+
+            # Text areas
+            elif shape.has_text_frame:
+                if shape == title:
+                    parts.append("# " + shape.text.lstrip() + "\n")
+                else:
+                    parts.append(shape.text + "\n")
+
+        slide_md = "".join(parts).rstrip()
+
+        if slide.has_notes_slide:
+            notes_frame = slide.notes_slide.notes_text_frame
+            notes = "\n\n### Notes:\n" + (notes_frame.text if notes_frame is not None else "")
+            slide_md += notes.rstrip()
+
+        return slide_md
+
     def _is_picture(self, shape):
-        if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PICTURE:
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+        if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
             return True
-        if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PLACEHOLDER:
+        if shape.shape_type == MSO_SHAPE_TYPE.PLACEHOLDER:
             if hasattr(shape, "image"):
                 return True
         return False
 
     def _is_table(self, shape):
-        if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.TABLE:
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+        if shape.shape_type == MSO_SHAPE_TYPE.TABLE:
             return True
         return False
 
 
+def _render_pptx_slide_range(pptx_file: Union[str, bytes], first_slide: int, last_slide: int) -> List[str]:
+    """Render a contiguous range of slides. Runs in worker processes of the parallel PPTX engine."""
+    import pptx
+
+    if isinstance(pptx_file, bytes):
+        pptx_file = io.BytesIO(pptx_file)
+    slides = pptx.Presentation(pptx_file).slides
+    converter = PptxConverter()
+    return [converter._render_slide(slides[n - 1], n) for n in range(first_slide, last_slide + 1)]
+
+
+# Compressed audio is decoded to 16 kHz mono 16-bit PCM, which is all speech recognition needs
+_SPEECH_SAMPLE_RATE = 16000
+_SPEECH_SAMPLE_WIDTH = 2
+
+# A transcription backend: called with a segment of audio, returns its transcript, or "" if it holds no speech
+Transcriber = Callable[["speech_recognition.AudioData"], str]
+
+
+def _google_transcriber(audio: "speech_recognition.AudioData") -> str:
+    """The default transcription backend: Google's web speech API, through `speech_recognition`."""
+    import speech_recognition as sr
+
+    try:
+        return sr.Recognizer().recognize_google(audio).strip()
+    except sr.UnknownValueError:
+        return ""
+
+
+def _iter_pcm_segments(
+    read_frames: Callable[[int], bytes],
+    sample_rate: int,
+    sample_width: int,
+    segment_seconds: float,
+    search_seconds: float = 5.0,
+) -> Iterator[Tuple[float, bytes]]:
+    """
+    Split mono PCM audio, read with `read_frames(num_frames)`, into segments of at most `segment_seconds`. Each cut is
+    placed in the quietest 20 ms of the segment's last `search_seconds`, so that it falls between words rather than
+    inside one. Yields the start time (in seconds) and the PCM data of each segment, reading one segment at a time.
+    """
+    segment_frames = max(int(segment_seconds * sample_rate), 1)
+    search_frames = min(int(search_seconds * sample_rate), segment_frames // 2)
+    window_frames = max(sample_rate // 50, 1)
+
+    start = 0
+    pending = b""
+    while True:
+        chunks = [pending]
+        size = len(pending)
+        while size < segment_frames * sample_width:
+            chunk = read_frames(segment_frames - size // sample_width)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        data = b"".join(chunks)
+
+        # The end of the audio
+        if size < segment_frames * sample_width:
+            if data:
+                yield start / sample_rate, data
+            return
+
+        cut = segment_frames
+        if search_frames >= window_frames:
+            search_start = segment_frames - search_frames
+            cut = search_start + _quietest_window(
+                data[search_start * sample_width :], sample_rate, sample_width, window_frames
+            )
+        yield start / sample_rate, data[: cut * sample_width]
+        pending = data[cut * sample_width :]
+        start += cut
+
+
+def _quietest_window(pcm: bytes, sample_rate: int, sample_width: int, window_frames: int) -> int:
+    """Return the frame offset of the middle of the window of `pcm` with the least energy."""
+    if sample_width != 2:
+        import speech_recognition as sr
+
+        pcm = sr.AudioData(pcm, sample_rate, sample_width).get_raw_data(convert_width=2)
+    samples = array.array("h", pcm)
+    if sys.byteorder == "big":
+        samples.byteswap()
+
+    best_offset, best_energy = 0, None
+    for offset in range(0, len(samples) - window_frames + 1, window_frames):
+        energy = sum(map(abs, samples[offset : offset + window_frames]))
+        if best_energy is None or energy < best_energy:
+            best_offset, best_energy = offset, energy
+    return best_offset + window_frames // 2
+
+
+def _format_timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
 class MediaConverter(DocumentConverter):
     """
     Abstract class for multi-modal media (e.g., images and audio)
     """
 
     def _get_metadata(self, local_path):
-        exiftool = shutil.which("exiftool")
-        if not exiftool:
+        # A shared exiftool process reads the metadata, to avoid starting Perl for every file
+        exiftool = shared_exiftool()
+        if not exiftool.available:
             return None
-        else:
-            try:
-                result = subprocess.run([exiftool, "-json", local_path], capture_output=True, text=True).stdout
-                return json.loads(result)[0]
-            except Exception:
-                return None
+        with _source_path(local_path) as path:
+            return exiftool.get_metadata(path)
+
+
+# Noted in place of the transcript of a segment that could not be transcribed
+_SEGMENT_ERROR = "[Could not transcribe this segment]"
 
 
 class WavConverter(MediaConverter):
     """
     Converts WAV files to markdown via extraction of metadata (if `exiftool` is installed), and speech transcription (if `speech_recognition` is installed).
+
+    The audio is read one segment at a time, cut at quiet moments, and the segments are transcribed concurrently by
+    the `transcriber` backend. Their transcripts are stitched in order, each line prefixed with its start time.
     """
 
+    version = "2"
+    file_extensions = [".wav"]
+
+    def __init__(
+        self,
+        transcriber: Optional[Transcriber] = None,
+        segment_seconds: float = 30.0,
+        max_workers: int = 4,
+        min_isolation_timeout: float = 4 * 60 * 60.0,
+    ):
+        """
+        Initialize the converter.
+
+        Args:
+            transcriber: The transcription backend, called with each segment as a `speech_recognition.AudioData`, and
+                returning its transcript ("" if it holds no speech). Defaults to Google's web speech API
+            segment_seconds: The longest segment sent to the transcriber, in seconds. Defaults to 30
+            max_workers: The number of segments transcribed concurrently. Defaults to 4
+            min_isolation_timeout: The least number of seconds a recording is given in an isolated worker, instead
+                of MarkdownConverter's isolation_timeout. Transcribing takes a good part of a recording's length, so
+                the default of 4 hours leaves room for recordings of a few hours
+        """
+        self.transcriber = transcriber if transcriber is not None else _google_transcriber
+        self.segment_seconds = segment_seconds
+        self.max_workers = max(max_workers, 1)
+        self.min_isolation_timeout = min_isolation_timeout
+
+    def cache_options(self) -> Dict[str, Any]:
+        return {
+            "transcriber": getattr(self.transcriber, "__qualname__", type(self.transcriber).__qualname__),
+            "segment_seconds": self.segment_seconds,
+        }
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a XLSX
         extension = kwargs.get("file_extension", "")
@@ -547,33 +1653,87 @@ class WavConverter(MediaConverter):
                     md_content += f"{f}: {metadata[f]}\n"
 
         # Transcribe
+        transcribed = False
         try:
             transcript = self._transcribe_audio(local_path)
             md_content += "\n\n### Audio Transcript:\n" + ("[No speech detected]" if transcript == "" else transcript)
+            transcribed = _SEGMENT_ERROR not in transcript
         except Exception:
             md_content += "\n\n### Audio Transcript:\nError. Could not transcribe this audio."
 
+        # Transcripts with failed segments are not cached, so that a later conversion can try them again
         return DocumentConverterResult(
             title=None,
             text_content=md_content.strip(),
+            cacheable=transcribed,
         )
 
     def _transcribe_audio(self, local_path) -> str:
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(local_path) as source:
-            audio = recognizer.record(source)
-            return recognizer.recognize_google(audio).strip()
+        import speech_recognition as sr
+
+        with _open_source(local_path) as fh, sr.AudioFile(fh) as source:
+            segments = _iter_pcm_segments(
+                source.stream.read, source.SAMPLE_RATE, source.SAMPLE_WIDTH, self.segment_seconds
+            )
+            return self._transcribe_segments(segments, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def _transcribe_segments(self, segments: Iterable[Tuple[float, bytes]], sample_rate: int, sample_width: int) -> str:
+        """
+        Transcribe PCM segments in a thread pool, with at most `max_workers` of them waiting besides the one being
+        read, and stitch the transcripts in order. Segments that fail are noted in place, unless every one fails, in
+        which case the error is raised.
+        """
+        import speech_recognition as sr
+
+        lines: List[str] = []
+        errors: List[Exception] = []
+        pending: Deque[Tuple[float, concurrent.futures.Future]] = collections.deque()
+        num_segments = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for start, pcm in segments:
+                num_segments += 1
+                audio = sr.AudioData(pcm, sample_rate, sample_width)
+                pending.append((start, executor.submit(self.transcriber, audio)))
+                if len(pending) > self.max_workers:
+                    self._stitch_segment(*pending.popleft(), lines, errors)
+            while pending:
+                self._stitch_segment(*pending.popleft(), lines, errors)
+
+        if errors and len(errors) == num_segments:
+            raise errors[-1]
+        return "\n".join(lines)
+
+    def _stitch_segment(
+        self, start: float, future: concurrent.futures.Future, lines: List[str], errors: List[Exception]
+    ) -> None:
+        try:
+            text = future.result().strip()
+        except Exception as e:
+            errors.append(e)
+            text = _SEGMENT_ERROR
+        if text:
+            lines.append(f"[{_format_timestamp(start)}] {text}")
+
+
+# Compressed audio containers that can't be demuxed without seeking, like MP4s whose index follows the audio
+_SEEKING_AUDIO_EXTENSIONS = frozenset([".m4a"])
 
 
 class Mp3Converter(WavConverter):
     """
-    Converts MP3 and M4A files to markdown via extraction of metadata (if `exiftool` is installed), and speech transcription (if `speech_recognition` AND `pydub` are installed).
+    Converts MP3, M4A and other compressed audio files to markdown via extraction of metadata (if `exiftool` is installed), and speech transcription (if `speech_recognition` AND `ffmpeg` or `avconv` are installed).
+
+    With ffmpeg, the audio is decoded to 16 kHz mono PCM through a pipe, and transcribed segment by segment while it is
+    being decoded. Otherwise, pydub decodes it in memory, which also takes an external decoder: avconv.
     """
 
+    version = "3"
+    file_extensions = [".mp3", ".m4a", ".aac", ".flac", ".ogg", ".oga", ".opus", ".webm"]
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
-        # Bail if not a MP3
+        # Bail if not a compressed audio file
         extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".mp3", ".m4a"]:
+        if extension.lower() not in self.file_extensions:
             return None
 
         md_content = ""
@@ -597,53 +1757,150 @@ class Mp3Converter(WavConverter):
                     md_content += f"{f}: {metadata[f]}\n"
 
         # Transcribe
-        handle, temp_path = tempfile.mkstemp(suffix=".wav")
-        os.close(handle)
-        try:
-            if extension.lower() == ".mp3":
-                sound = pydub.AudioSegment.from_mp3(local_path)
-            else:
-                sound = pydub.AudioSegment.from_file(local_path, format="m4a")
-            sound.export(temp_path, format="wav")
-
-            _args = dict()
-            _args.update(kwargs)
-            _args["file_extension"] = ".wav"
-
+        transcribed = False
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None and shutil.which("avconv") is None:
+            md_content += "\n\n### Audio Transcript:\nError. Could not transcribe this audio: decoding it requires ffmpeg or avconv."
+        else:
             try:
-                transcript = super()._transcribe_audio(temp_path).strip()
-                md_content += "\n\n### Audio Transcript:\n" + (
-                    "[No speech detected]" if transcript == "" else transcript
-                )
+                if ffmpeg:
+                    transcript = self._transcribe_ffmpeg(ffmpeg, local_path, extension.lower())
+                else:
+                    transcript = self._transcribe_pydub(local_path)
+                md_content += "\n\n### Audio Transcript:\n" + ("[No speech detected]" if transcript == "" else transcript)
+                transcribed = _SEGMENT_ERROR not in transcript
             except Exception:
                 md_content += "\n\n### Audio Transcript:\nError. Could not transcribe this audio."
 
-        finally:
-            os.unlink(temp_path)
-
         # Return the result
         return DocumentConverterResult(
             title=None,
             text_content=md_content.strip(),
+            cacheable=transcribed,
         )
 
+    def _transcribe_ffmpeg(self, ffmpeg: str, local_path: ConversionSource, extension: str) -> str:
+        """Decode the audio with ffmpeg to 16 kHz mono PCM through a pipe, and transcribe it as it is decoded."""
+        command = [ffmpeg, "-v", "error"]
+        if isinstance(local_path, str):
+            command += ["-nostdin", "-i", local_path]
+        elif extension in _SEEKING_AUDIO_EXTENSIONS:
+            # The cache protocol lets ffmpeg seek back in the piped stream, by spooling it to a temporary file of
+            # ffmpeg's own as it is read
+            command += ["-i", "cache:pipe:0"]
+        else:
+            # The other formats are demuxed straight from the pipe, without seeking
+            command += ["-i", "pipe:0"]
+        command += ["-vn", "-f", "s16le", "-ac", "1", "-ar", str(_SPEECH_SAMPLE_RATE), "pipe:1"]
+
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL if isinstance(local_path, str) else subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+            )
+            feeder = None
+            if process.stdin is not None:
+                feeder = threading.Thread(target=_feed_pipe, args=(local_path, process.stdin), daemon=True)
+                feeder.start()
+
+            try:
+                segments = _iter_pcm_segments(
+                    lambda num_frames: process.stdout.read(num_frames * _SPEECH_SAMPLE_WIDTH),
+                    _SPEECH_SAMPLE_RATE,
+                    _SPEECH_SAMPLE_WIDTH,
+                    self.segment_seconds,
+                )
+                transcript = self._transcribe_segments(segments, _SPEECH_SAMPLE_RATE, _SPEECH_SAMPLE_WIDTH)
+            finally:
+                process.stdout.close()
+                process.wait()
+                if feeder is not None:
+                    feeder.join()
+
+            # Keep what was transcribed from partly corrupt files
+            if process.returncode != 0 and transcript == "":
+                stderr.seek(0)
+                message = stderr.read().decode("utf-8", errors="replace").strip()
+                raise FileConversionException(f"ffmpeg could not decode the audio: {message}")
+        return transcript
+
+    def _transcribe_pydub(self, local_path: ConversionSource) -> str:
+        """Decode the audio in memory with pydub, resampled to 16 kHz mono PCM, and transcribe it."""
+        import pydub
+
+        with _open_source(local_path) as fh:
+            sound = pydub.AudioSegment.from_file(fh)
+        sound = sound.set_frame_rate(_SPEECH_SAMPLE_RATE).set_channels(1).set_sample_width(_SPEECH_SAMPLE_WIDTH)
+
+        pcm = io.BytesIO(sound.raw_data)
+        segments = _iter_pcm_segments(
+            lambda num_frames: pcm.read(num_frames * _SPEECH_SAMPLE_WIDTH),
+            _SPEECH_SAMPLE_RATE,
+            _SPEECH_SAMPLE_WIDTH,
+            self.segment_seconds,
+        )
+        return self._transcribe_segments(segments, _SPEECH_SAMPLE_RATE, _SPEECH_SAMPLE_WIDTH)
+
+
+def _feed_pipe(source: ConversionSource, pipe: BinaryIO) -> None:
+    """Copy a conversion source into a subprocess's stdin, and close it. Runs in its own thread."""
+    try:
+        with _open_source(source) as fh:
+            shutil.copyfileobj(fh, pipe)
+    except OSError:
+        # The subprocess exited before reading everything
+        pass
+    finally:
+        try:
+            pipe.close()
+        except OSError:
+            pass
+
 
 class ZipConverter(DocumentConverter):
     """
     Extracts ZIP files to a permanent local directory and returns a listing of extracted files.
+
+    With `lazy`, nothing is extracted up front: members are listed with their sizes straight from the archive's
+    central directory, and each one is only extracted when it is converted (see `extract_member`). In both modes,
+    archives holding more than `max_members` files or `max_total_size` uncompressed bytes are never extracted in full:
+    they are listed lazily, and members extracted on demand may not add up to more than `max_total_size` bytes.
     """
 
-    def __init__(self, extract_dir: str = "downloads"):
+    cacheable = False
+    isolatable = False
+    file_extensions = [".zip"]
+
+    def __init__(
+        self,
+        extract_dir: str = "downloads",
+        lazy: bool = False,
+        max_members: int = 10000,
+        max_total_size: int = 1024 * 1024 * 1024,
+    ):
         """
         Initialize with path to extraction directory.
 
         Args:
             extract_dir: The directory where files will be extracted. Defaults to "downloads"
+            lazy: List the archive without extracting it, and extract members when they are converted. Defaults to False
+            max_members: The maximum number of files extracted and listed per archive. Defaults to 10000
+            max_total_size: The maximum number of uncompressed bytes extracted per archive. Defaults to 1 GiB
         """
         self.extract_dir = extract_dir
+        self.lazy = lazy
+        self.max_members = max_members
+        self.max_total_size = max_total_size
         # Create the extraction directory if it doesn't exist
         os.makedirs(self.extract_dir, exist_ok=True)
 
+        # Maps the listed paths of members that are not extracted yet to their archive and member name, and archives
+        # to the number of bytes extracted from them on demand
+        self._pending_members: Dict[str, Tuple[str, str]] = {}
+        self._extracted_sizes: Dict[str, int] = {}
+
     def convert(self, local_path: str, **kwargs: Any) -> Union[None, DocumentConverterResult]:
         # Bail if not a ZIP file
         extension = kwargs.get("file_extension", "")
@@ -651,19 +1908,27 @@ class ZipConverter(DocumentConverter):
             return None
 
         # Verify it's actually a ZIP file
-        if not zipfile.is_zipfile(local_path):
-            return None
+        with _open_source(local_path) as fh:
+            if not zipfile.is_zipfile(fh):
+                return None
 
-        # Extract all files and build list
-        extracted_files = []
-        with zipfile.ZipFile(local_path, "r") as zip_ref:
-            # Extract all files
-            zip_ref.extractall(self.extract_dir)
-            # Get list of all files
-            for file_path in zip_ref.namelist():
-                # Skip directories
-                if not file_path.endswith("/"):
-                    extracted_files.append(self.extract_dir + "/" + file_path)
+        # Read the central directory, and only extract everything if the archive is within the limits
+        with _open_source(local_path) as fh, zipfile.ZipFile(fh, "r") as zip_ref:
+            members = [info for info in zip_ref.infolist() if not info.is_dir()]
+            total_size = sum(info.file_size for info in members)
+            if len(members) > self.max_members:
+                limit_note = f"the limit of {self.max_members} files"
+            elif total_size > self.max_total_size:
+                limit_note = f"the limit of {self.max_total_size} uncompressed bytes"
+            else:
+                limit_note = None
+
+            if not self.lazy and limit_note is None:
+                zip_ref.extractall(self.extract_dir)
+                extracted_files = [self.extract_dir + "/" + info.filename for info in members]
+
+        if self.lazy or limit_note is not None:
+            return self._list_lazily(local_path, members, total_size, limit_note)
 
         # Sort files for consistent output
         extracted_files.sort()
@@ -675,12 +1940,101 @@ class ZipConverter(DocumentConverter):
 
         return DocumentConverterResult(title="Extracted Files", text_content=md_content.strip())
 
+    def extract_member(self, path: str) -> Union[None, str]:
+        """
+        Extract a member listed by a lazy conversion, given its listed path. Returns the path of the extracted file,
+        or None if `path` is not a pending member.
+        """
+        key = os.path.normpath(path)
+        if key not in self._pending_members:
+            return None
+
+        archive_path, name = self._pending_members[key]
+        with zipfile.ZipFile(archive_path, "r") as zip_ref:
+            info = zip_ref.getinfo(name)
+            extracted_size = self._extracted_sizes.get(archive_path, 0) + info.file_size
+            if extracted_size > self.max_total_size:
+                raise FileConversionException(
+                    f"Extracting '{name}' would exceed the limit of {self.max_total_size} bytes extracted from '{archive_path}'"
+                )
+            extracted_path = zip_ref.extract(info, self.extract_dir)
+
+        self._extracted_sizes[archive_path] = extracted_size
+        del self._pending_members[key]
+        return extracted_path
+
+    def _list_lazily(
+        self, local_path: ConversionSource, members: List[zipfile.ZipInfo], total_size: int, limit_note: Optional[str]
+    ) -> DocumentConverterResult:
+        """List the members of an archive without extracting them, and remember them for `extract_member`."""
+        archive_path = local_path
+        if not isinstance(local_path, str):
+            # In-memory archives are kept (compressed) on disk, to extract their members later
+            with _open_source(local_path) as fh:
+                data = fh.read()
+            archive_dir = os.path.join(self.extract_dir, ".archives")
+            os.makedirs(archive_dir, exist_ok=True)
+            archive_path = os.path.join(archive_dir, hashlib.sha256(data).hexdigest()[:16] + ".zip")
+            with open(archive_path, "wb") as fh:
+                fh.write(data)
+        archive_path = os.path.abspath(archive_path)
+
+        listed = sorted((self.extract_dir + "/" + info.filename, info) for info in members[: self.max_members])
+        for path, info in listed:
+            self._pending_members[os.path.normpath(path)] = (archive_path, info.filename)
+
+        md_content = f"The archive holds {len(members)} files, {total_size} bytes uncompressed."
+        if limit_note is not None:
+            md_content += f" It was not extracted, since it exceeds {limit_note}."
+        md_content += " Each of the following files is extracted when it is opened:\n"
+        for path, info in listed:
+            md_content += f"* {path} ({info.file_size} bytes)\n"
+        if len(members) > len(listed):
+            md_content += f"* ... and {len(members) - len(listed)} more files\n"
+
+        return DocumentConverterResult(title="Archive Contents", text_content=md_content.strip())
+
 
 class ImageConverter(MediaConverter):
     """
     Converts images to markdown via extraction of metadata (if `exiftool` is installed), OCR (if `easyocr` is installed), and description via a multimodal LLM (if an mlm_client is configured).
+
+    Images sent to the multimodal LLM are downscaled to `max_dimension` pixels on their longest side and re-encoded,
+    and their descriptions are cached in memory, keyed by a hash of the image, the model and the prompt.
     """
 
+    file_extensions = [".jpg", ".jpeg", ".png"]
+
+    def __init__(self, max_dimension: Optional[int] = 1568, jpeg_quality: int = 85, description_cache_size: int = 256):
+        """
+        Initialize the converter.
+
+        Args:
+            max_dimension: Larger images are downscaled to this many pixels on their longest side, and re-encoded as
+                JPEG (or PNG, if they have transparency) before they are sent. None sends images as they are.
+                Defaults to 1568
+            jpeg_quality: The quality of re-encoded JPEG images. Defaults to 85
+            description_cache_size: The number of descriptions kept in memory. 0 disables the cache. Defaults to 256
+        """
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+        self.description_cache_size = description_cache_size
+        self._descriptions: "collections.OrderedDict[Tuple[str, str, str], str]" = collections.OrderedDict()
+        self._descriptions_lock = threading.Lock()
+
+    def cache_options(self) -> Dict[str, Any]:
+        return {"max_dimension": self.max_dimension, "jpeg_quality": self.jpeg_quality}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks can't be pickled, e.g. to send the converter to batch conversion workers
+        state = self.__dict__.copy()
+        del state["_descriptions_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._descriptions_lock = threading.Lock()
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a XLSX
         extension = kwargs.get("file_extension", "")
@@ -730,13 +2084,22 @@ class ImageConverter(MediaConverter):
 
         sys.stderr.write(f"MLM Prompt:\n{prompt}\n")
 
-        data_uri = ""
-        with open(local_path, "rb") as image_file:
-            content_type, encoding = mimetypes.guess_type("_dummy" + extension)
-            if content_type is None:
-                content_type = "image/jpeg"
-            image_base64 = base64.b64encode(image_file.read()).decode("utf-8")
-            data_uri = f"data:{content_type};base64,{image_base64}"
+        with _open_source(local_path) as image_file:
+            image_data = image_file.read()
+
+        # The same images tend to be described again and again
+        cache_key = (hashlib.sha256(image_data).hexdigest(), str(model), prompt)
+        with self._descriptions_lock:
+            if cache_key in self._descriptions:
+                self._descriptions.move_to_end(cache_key)
+                return self._descriptions[cache_key]
+
+        content_type, encoding = mimetypes.guess_type("_dummy" + extension)
+        if content_type is None:
+            content_type = "image/jpeg"
+        content_type, image_data = self._downscale_image(content_type, image_data)
+        image_base64 = base64.b64encode(image_data).decode("utf-8")
+        data_uri = f"data:{content_type};base64,{image_base64}"
 
         messages = [
             {
@@ -754,7 +2117,295 @@ class ImageConverter(MediaConverter):
         ]
 
         response = client.chat.completions.create(model=model, messages=messages)
-        return response.choices[0].message.content
+        description = response.choices[0].message.content
+
+        if self.description_cache_size > 0:
+            with self._descriptions_lock:
+                self._descriptions[cache_key] = description
+                while len(self._descriptions) > self.description_cache_size:
+                    self._descriptions.popitem(last=False)
+        return description
+
+    def _downscale_image(self, content_type: str, image_data: bytes) -> Tuple[str, bytes]:
+        """
+        Downscale an image larger than `max_dimension`, and return its new content type and bytes. Images that are
+        small enough, or that Pillow cannot read, are returned as they are.
+        """
+        if self.max_dimension is None:
+            return content_type, image_data
+
+        from PIL import Image, ImageOps
+
+        try:
+            with Image.open(io.BytesIO(image_data)) as image:
+                if max(image.size) <= self.max_dimension:
+                    return content_type, image_data
+
+                # Phone photos are often stored sideways, with their orientation in the EXIF data
+                image = ImageOps.exif_transpose(image)
+                image.thumbnail((self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS)
+
+                output = io.BytesIO()
+                if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+                    image.save(output, format="PNG", optimize=True)
+                    return "image/png", output.getvalue()
+                image.convert("RGB").save(output, format="JPEG", quality=self.jpeg_quality, optimize=True)
+                return "image/jpeg", output.getvalue()
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return content_type, image_data
+
+
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# The lines of converted Markdown that the structural index is built from: code fences, ATX headings, slide markers
+# and table rows
+_STRUCTURE_LINE_RE = re.compile(
+    r"^(?:(?P<fence>```|~~~).*|(?P<hashes>#{1,6})[ \t]+(?P<heading>.*?)[ \t#]*|<!-- Slide number: (?P<slide>\d+) -->|(?P<row>\|.*))$",
+    re.M,
+)
+_MARKDOWN_ESCAPE_RE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!|<>])")
+
+
+def _index_sections(
+    text: str, page_offsets: List[Tuple[int, int]], boundaries: List[DocumentSection]
+) -> List[DocumentSection]:
+    """
+    Build the structural index of normalized Markdown in one scan: headings (outside code blocks), slides and tables,
+    plus the pages of `page_offsets` and the sections added by the converter. A heading's section ends at the next
+    heading of the same or a higher level, or at the next slide or sheet, and a page, slide or sheet at the next one
+    of its kind.
+    """
+    sections = list(boundaries)
+    sections.extend(DocumentSection("page", str(page), offset, offset) for page, offset in page_offsets)
+
+    open_headings: List[int] = []
+    in_fence = None
+    table_start = table_end = None
+    for m in _STRUCTURE_LINE_RE.finditer(text):
+        fence = m.group("fence")
+        if fence is not None:
+            in_fence = None if in_fence == fence else in_fence or fence
+            continue
+        if in_fence is not None:
+            continue
+
+        if m.group("row") is not None:
+            # Consecutive rows form one table
+            if table_end is not None and m.start() == table_end + 1:
+                table_end = m.end()
+                continue
+            if table_start is not None:
+                sections.append(DocumentSection("table", "", table_start, table_end))
+            table_start, table_end = m.start(), m.end()
+        elif m.group("slide") is not None:
+            sections.append(DocumentSection("slide", m.group("slide"), m.start(), m.start()))
+        else:
+            level = len(m.group("hashes"))
+            while open_headings and sections[open_headings[-1]].level >= level:
+                index = open_headings.pop()
+                sections[index] = sections[index]._replace(end=m.start())
+            open_headings.append(len(sections))
+            title = _MARKDOWN_ESCAPE_RE.sub(r"\1", m.group("heading"))
+            sections.append(DocumentSection("heading", title, m.start(), len(text), level))
+    if table_start is not None:
+        sections.append(DocumentSection("table", "", table_start, table_end))
+
+    # Tables need a header and a separator row
+    sections = [s for s in sections if s.kind != "table" or text.count("\n", s.start, s.end) >= 1]
+
+    # Pages, slides and sheets end where the next one of their kind starts
+    next_start: Dict[str, int] = {}
+    for index in sorted(range(len(sections)), key=lambda i: sections[i].start, reverse=True):
+        section = sections[index]
+        if section.kind in ("page", "slide", "sheet"):
+            sections[index] = section._replace(end=next_start.get(section.kind, len(text)))
+            next_start[section.kind] = section.start
+
+    # Headings don't run on into the next slide or sheet
+    container_starts = sorted(s.start for s in sections if s.kind in ("slide", "sheet"))
+    for index, section in enumerate(sections):
+        if section.kind == "heading":
+            position = bisect.bisect_right(container_starts, section.start)
+            if position < len(container_starts) and container_starts[position] < section.end:
+                sections[index] = section._replace(end=container_starts[position])
+
+    sections.sort(key=lambda s: (s.start, -s.end))
+    tables = 0
+    for index, section in enumerate(sections):
+        if section.kind == "table":
+            tables += 1
+            sections[index] = section._replace(title=str(tables))
+    return sections
+
+
+class _TextNormalizer:
+    """
+    Normalizes converted text the way `MarkdownConverter._convert` presents it: trailing whitespace is stripped from
+    every line, and runs of three or more newlines are collapsed to two. The text is processed in a single pass over
+    chunks of any size, buffering only the current line, and sorted character offsets into the input are mapped to
+    the matching offsets in the output. Offsets in stripped whitespace or collapsed blank lines are clamped.
+    """
+
+    def __init__(self, offsets: Iterable[int] = ()):
+        self.offsets = list(offsets)
+        self.mapped_offsets: List[int] = []
+
+        self._next_offset = 0  # Index of the first offset not mapped yet
+        self._out_pos = 0  # Length of the normalized text emitted so far
+        self._pending = -1  # Newlines seen since the last non-empty line (none before the first line)
+        self._line_start = 0  # Offset of the current line in the input
+
+    def normalize(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Yield the normalized text of the concatenated chunks, in pieces."""
+        partial = ""
+        for chunk in chunks:
+            lines = chunk.split("\n")
+            lines[0] = partial + lines[0]
+            partial = lines.pop()
+            if not lines:
+                continue
+
+            # Lines holding an offset are processed one by one, the others as a block
+            block_length = sum(map(len, lines)) + len(lines)
+            if self._next_offset < len(self.offsets) and self.offsets[self._next_offset] < self._line_start + block_length:
+                for line in lines:
+                    piece = self._line(line)
+                    if piece:
+                        yield piece
+            else:
+                piece = self._block(lines, block_length)
+                if piece:
+                    yield piece
+
+        # The last line, and the newlines after it
+        piece = self._line(partial)
+        if piece:
+            yield piece
+        newlines = self._pending if self._pending < 3 else 2
+        self.mapped_offsets.extend([self._out_pos + newlines] * (len(self.offsets) - self._next_offset))
+        self._next_offset = len(self.offsets)
+        if newlines:
+            yield "\n" * newlines
+
+    def _block(self, lines: List[str], block_length: int) -> str:
+        """Consume complete lines of input holding no offset, and return the normalized text to emit."""
+        self._line_start += block_length
+        stripped = [line.rstrip() for line in lines]
+        first = next((i for i, line in enumerate(stripped) if line), None)
+        if first is None:
+            self._pending += len(lines)
+            return ""
+        last = len(stripped) - next(i for i, line in enumerate(reversed(stripped)) if line)
+
+        self._pending += first + 1
+        newlines = self._pending if self._pending < 3 else 2
+        piece = "\n" * newlines + _BLANK_LINES_RE.sub("\n\n", "\n".join(stripped[first:last]))
+        self._out_pos += len(piece)
+        self._pending = len(lines) - last
+        return piece
+
+    def _line(self, line: str) -> str:
+        """Consume one line of input (without its newline) and return the normalized text to emit."""
+        self._pending += 1
+        content = line.rstrip()
+        newlines = self._pending if self._pending < 3 else 2
+
+        line_end = self._line_start + len(line)
+        offsets = self.offsets
+        while self._next_offset < len(offsets) and offsets[self._next_offset] <= line_end:
+            column = max(offsets[self._next_offset] - self._line_start, 0)
+            self.mapped_offsets.append(self._out_pos + newlines + min(column, len(content)))
+            self._next_offset += 1
+        self._line_start = line_end + 1
+
+        if not content:
+            return ""
+        self._out_pos += newlines + len(content)
+        self._pending = 0
+        return "\n" * newlines + content if newlines else content
+
+
+def _option_fingerprint(value: Any) -> Any:
+    """
+    Return a conversion option as it contributes to cache keys: plain values, and lists, tuples and dicts of them, by
+    content, and other objects (e.g., an mlm_client or a requests session) only by their type.
+    """
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    if isinstance(value, (list, tuple)):
+        return [_option_fingerprint(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _option_fingerprint(v) for k, v in value.items()}
+    return type(value).__name__
+
+
+class ConversionCache:
+    """
+    A persistent cache of conversion results. Entries are keyed by a hash of the file bytes, plus the names and
+    versions of the registered converters and the conversion options, so a change to any of them is a cache miss.
+    Results live on disk and are evicted least-recently-used first once the cache grows beyond `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(".cache", "mdconvert"), max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: The directory where cached conversions are stored. Defaults to ".cache/mdconvert"
+            max_bytes: The maximum total size of the cache on disk. Defaults to 512 MiB
+        """
+        self._store = DiskLRUCache(cache_dir, max_bytes=max_bytes)
+
+    def make_key(
+        self,
+        local_path: ConversionSource,
+        extensions: List[Union[str, None]],
+        converters: List["DocumentConverter"],
+        options: Dict[str, Any],
+    ) -> str:
+        """Compute the cache key of converting `local_path` with the given converters and options."""
+        digest = hashlib.sha256()
+        with _open_source(local_path) as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        fingerprint = {
+            "content": digest.hexdigest(),
+            "converters": [[type(c).__name__, c.version, c.cache_options()] for c in converters],
+            "extensions": extensions,
+            "options": {k: _option_fingerprint(v) for k, v in options.items()},
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Union[None, DocumentConverterResult]:
+        """Return the cached result for `key`, or None."""
+        data = self._store.get(key)
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data.decode("utf-8"))
+            return DocumentConverterResult.from_dict(entry["result"])
+        except (ValueError, KeyError):
+            return None
+
+    def put(self, key: str, converter: "DocumentConverter", result: DocumentConverterResult) -> None:
+        """Store the result produced by `converter` under `key`."""
+        entry = {
+            "converter": type(converter).__name__,
+            "version": converter.version,
+            "result": result.to_dict(),
+        }
+        self._store.put(key, json.dumps(entry).encode("utf-8"))
+
+    def clear(self) -> None:
+        """Remove all cached conversions."""
+        self._store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters, and the number and total size of the cached conversions."""
+        return self._store.stats()
 
 
 class FileConversionException(Exception):
@@ -765,16 +2416,79 @@ class UnsupportedFormatException(Exception):
     pass
 
 
+# The converter used by batch conversion workers, set up once per worker process, and the queue on which they
+# announce the conversions they start
+_batch_converter: Optional["MarkdownConverter"] = None
+_batch_started: Optional[Any] = None
+
+
+def _convert_in_this_process(converter: "MarkdownConverter") -> None:
+    """Set up the converter of a worker process, which is daemonic and can't start processes of its own."""
+    converter._workers = None
+    for page_converter in converter._page_converters:
+        # The parallel engines of e.g. PdfConverter and PptxConverter run in a process pool
+        if getattr(page_converter, "parallel_workers", 0) > 1:
+            page_converter.parallel_workers = 1
+
+
+def _init_batch_worker(converter: "MarkdownConverter", started: Any) -> None:
+    global _batch_converter, _batch_started
+    # Batch conversions have their own timeouts
+    _convert_in_this_process(converter)
+    _batch_converter = converter
+    _batch_started = started
+
+
+def _convert_in_batch_worker(index: int, source: str, kwargs: Dict[str, Any]) -> DocumentConverterResult:
+    # Tell the parent which worker runs the conversion, so that it is reported as failed if the worker dies
+    _batch_started.put((index, os.getpid()))
+    return _batch_converter.convert(source, **kwargs)
+
+
+# The converter used by isolated conversion workers, set up once per worker process
+_isolated_converter: Optional["MarkdownConverter"] = None
+
+
+def _init_isolated_worker(converter: "MarkdownConverter") -> None:
+    global _isolated_converter
+    _convert_in_this_process(converter)
+    _isolated_converter = converter
+
+
+def _dispatch_in_isolated_worker(
+    local_path: ConversionSource, extensions: List[Union[str, None]], kwargs: Dict[str, Any]
+) -> Tuple[DocumentConverterResult, int, Dict[str, Dict[str, int]]]:
+    """
+    Convert a source with the worker's converter. Returns the result, the position of the converter that produced it
+    among the registered converters, and the dispatch statistics of this conversion.
+    """
+    converter = _isolated_converter
+    converter._dispatch_stats = {}
+    res, page_converter = converter._dispatch(local_path, extensions, converter._with_default_options(kwargs))
+    return res, converter._page_converters.index(page_converter), converter._dispatch_stats
+
+
 class MarkdownConverter:
     """(In preview) An extremely simple text-based document reader, suitable for LLM use.
     This reader will convert common file-types or webpages to Markdown."""
 
     def __init__(
         self,
-        requests_session: Optional[requests.Session] = None,
+        requests_session: Optional[Union[requests.Session, HttpClient]] = None,
         mlm_client: Optional[Any] = None,
         mlm_model: Optional[Any] = None,
+        cache: Optional[ConversionCache] = None,
+        spill_threshold: int = 32 * 1024 * 1024,
+        html_parser: str = "html.parser",
+        markdown_engine: str = "markdownify",
+        isolation_workers: int = 0,
+        isolation_timeout: Optional[float] = 120.0,
+        isolation_max_rss: Optional[int] = 2 * 1024 * 1024 * 1024,
     ):
+        if markdown_engine not in ["markdownify", "lxml"]:
+            raise ValueError(f"Unknown Markdown engine '{markdown_engine}', expected 'markdownify' or 'lxml'")
+
+        # URLs are fetched with a requests.Session, or any client with the same `get`, like a shared HttpClient
         if requests_session is None:
             self._requests_session = requests.Session()
         else:
@@ -782,9 +2496,40 @@ class MarkdownConverter:
 
         self._mlm_client = mlm_client
         self._mlm_model = mlm_model
+        self._cache = cache
+
+        # The BeautifulSoup parser used for HTML: "html.parser", or the faster "lxml"
+        self._html_parser = html_parser
+
+        # The HTML-to-Markdown engine: "markdownify" walks a BeautifulSoup tree, "lxml" is a faster port of it
+        # working on lxml trees
+        self._markdown_engine = markdown_engine
+
+        # Streams and responses up to this size are converted straight from memory, larger ones spill to disk
+        self._spill_threshold = spill_threshold
+
+        # With isolation workers, conversions run in reusable worker processes, which are killed when a conversion
+        # takes more than isolation_timeout seconds (or the longer min_isolation_timeout of e.g. audio converters) or
+        # isolation_max_rss bytes of memory, so that a pathological file can't hang or exhaust this process. Cache
+        # lookups stay in this process. Workers are started fresh rather than forked, and get a pickled copy of this
+        # converter, with HTTP connections of their own
+        self._workers: Optional[WorkerPool] = None
+        if isolation_workers > 0:
+            self._workers = WorkerPool(
+                isolation_workers,
+                timeout=isolation_timeout,
+                max_rss_bytes=isolation_max_rss,
+                initializer=_init_isolated_worker,
+                initargs=(self,),
+            )
 
         self._page_converters: List[DocumentConverter] = []
 
+        # Maps lower-cased file extensions to the converters that handle them, in priority order
+        self._dispatch_index: Dict[str, List[DocumentConverter]] = {}
+        self._wildcard_converters: List[DocumentConverter] = []
+        self._dispatch_stats: Dict[str, Dict[str, int]] = {}
+
         # Register converters for successful browsing operations
         # Later registrations are tried first / take higher priority than earlier registrations
         # To this end, the most specific converters should appear below the most generic converters
@@ -821,6 +2566,15 @@ class MarkdownConverter:
             return self.convert_response(source, **kwargs)
 
     def convert_local(self, path: str, **kwargs: Any) -> DocumentConverterResult:  # TODO: deal with kwargs
+        # Files listed from an archive without being extracted are extracted when first converted
+        if not os.path.exists(path):
+            for converter in self._page_converters:
+                if isinstance(converter, ZipConverter):
+                    extracted_path = converter.extract_member(path)
+                    if extracted_path is not None:
+                        path = extracted_path
+                        break
+
         # Prepare a list of extensions to try (in order of priority)
         ext = kwargs.get("file_extension")
         extensions = [ext] if ext is not None else []
@@ -839,33 +2593,18 @@ class MarkdownConverter:
         ext = kwargs.get("file_extension")
         extensions = [ext] if ext is not None else []
 
-        # Save the file locally to a temporary file. It will be deleted before this method exits
-        handle, temp_path = tempfile.mkstemp()
-        fh = os.fdopen(handle, "wb")
-        result = None
+        # Buffer the content in memory, or in a temporary file if it is large. The file is deleted before this method exits
+        source = self._buffer_payload(self._iter_stream_chunks(stream))
         try:
-            # Write to the temporary file
-            content = stream.read()
-            if isinstance(content, str):
-                fh.write(content.encode("utf-8"))
-            else:
-                fh.write(content)
-            fh.close()
-
             # Use puremagic to check for more extension options
-            self._append_ext(extensions, self._guess_ext_magic(temp_path))
+            self._append_ext(extensions, self._guess_ext_magic(source))
 
             # Convert
-            result = self._convert(temp_path, extensions, **kwargs)
+            return self._convert(source, extensions, **kwargs)
         # Clean up
         finally:
-            try:
-                fh.close()
-            except Exception:
-                pass
-            os.unlink(temp_path)
-
-        return result
+            if isinstance(source, str):
+                os.unlink(source)
 
     def convert_url(self, url: str, **kwargs: Any) -> DocumentConverterResult:  # TODO: fix kwargs type
         # Send a HTTP request to the URL
@@ -896,39 +2635,338 @@ class MarkdownConverter:
         base, ext = os.path.splitext(urlparse(response.url).path)
         self._append_ext(extensions, ext)
 
-        # Save the file locally to a temporary file. It will be deleted before this method exits
-        handle, temp_path = tempfile.mkstemp()
-        fh = os.fdopen(handle, "wb")
+        # Download the content into memory, or into a temporary file if it is large. The file is deleted before this method exits
+        source = None
         result = None
         try:
-            # Download the file
-            for chunk in response.iter_content(chunk_size=512):
-                fh.write(chunk)
-            fh.close()
+            source = self._buffer_payload(response.iter_content(chunk_size=self._CHUNK_SIZE))
 
             # Use puremagic to check for more extension options
-            self._append_ext(extensions, self._guess_ext_magic(temp_path))
+            self._append_ext(extensions, self._guess_ext_magic(source))
 
             # Convert
-            result = self._convert(temp_path, extensions, url=response.url)
+            _kwargs = dict(kwargs)
+            _kwargs["url"] = response.url
+            result = self._convert(source, extensions, **_kwargs)
         except Exception as e:
             print(f"Error in converting: {e}")
 
         # Clean up
         finally:
-            try:
-                fh.close()
-            except Exception:
-                pass
-            os.unlink(temp_path)
+            if isinstance(source, str):
+                os.unlink(source)
 
         return result
 
-    def _convert(self, local_path: str, extensions: List[Union[str, None]], **kwargs) -> DocumentConverterResult:
+    def convert_many(
+        self,
+        sources: Iterable[str],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[Callable[[int, int, str], None]] = None,
+        **kwargs: Any,
+    ) -> List[Union[DocumentConverterResult, Exception]]:
+        """
+        Convert many paths or URLs in a pool of worker processes.
+
+        Args:
+            sources: The paths or URLs to convert
+            max_workers: The number of worker processes. 0 converts the sources one after the other in this process,
+                without timeouts. Defaults to the number of CPUs
+            timeout: The number of seconds after which a conversion is abandoned, or None to wait for it. Defaults to None
+            progress: Called with the number of finished conversions, the total, and the source just finished
+            kwargs: Passed to `convert` for every source
+
+        Returns:
+            The result of every source, in order, or the exception raised while converting it. Abandoned conversions
+            are reported as a `TimeoutError`.
+        """
+        sources = list(sources)
+        results: List[Union[DocumentConverterResult, Exception]] = [None] * len(sources)
+        for index, result in self.iter_convert_many(sources, max_workers, timeout, progress, **kwargs):
+            results[index] = result
+        return results
+
+    def iter_convert_many(
+        self,
+        sources: Iterable[str],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[Callable[[int, int, str], None]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Tuple[int, Union[DocumentConverterResult, Exception]]]:
+        """
+        Like `convert_many`, but yields the index of each source and its result (or exception) as soon as it is done,
+        in the order conversions finish.
+        """
+        sources = list(sources)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        if max_workers < 1:
+            conversions = self._iter_convert_serially(sources, kwargs)
+        else:
+            conversions = self._iter_convert_in_pool(sources, max_workers, timeout, kwargs)
+
+        for completed, (index, result) in enumerate(conversions, start=1):
+            if progress is not None:
+                progress(completed, len(sources), sources[index])
+            yield index, result
+
+    def _iter_convert_serially(
+        self, sources: List[str], kwargs: Dict[str, Any]
+    ) -> Iterator[Tuple[int, Union[DocumentConverterResult, Exception]]]:
+        for index, source in enumerate(sources):
+            try:
+                yield index, self.convert(source, **kwargs)
+            except Exception as e:
+                yield index, e
+
+    def _iter_convert_in_pool(
+        self, sources: List[str], max_workers: int, timeout: Optional[float], kwargs: Dict[str, Any]
+    ) -> Iterator[Tuple[int, Union[DocumentConverterResult, Exception]]]:
+        """
+        Convert sources in a multiprocessing pool, which unlike concurrent.futures can be terminated when a
+        conversion times out. No more than `max_workers` conversions are submitted at once, so each one starts as it
+        is submitted and its deadline can be counted from then. When a conversion times out, the pool is replaced,
+        and the other conversions it was running are started over in the new pool. When a worker dies (e.g., killed
+        for running out of memory), the pool replaces it, and the conversion it was running is reported as failed.
+        Workers are started like isolation workers, fresh rather than forked, with a pickled copy of this converter.
+        """
+        finished: "queue.Queue[Tuple[int, int, Any]]" = queue.Queue()
+        pending = collections.deque(range(len(sources)))
+        deadlines: Dict[int, float] = {}
+        generation = 0
+
+        def start_pool() -> Tuple[Any, Any, Dict[int, int]]:
+            # Workers write to a SimpleQueue without a feeder thread, so a worker that crashes right after starting a
+            # conversion has still announced it. Each pool has its own queue and map from conversions to worker pids
+            context = worker_context()
+            started = context.SimpleQueue()
+            pool = context.Pool(max_workers, initializer=_init_batch_worker, initargs=(self, started))
+            return pool, started, {}
+
+        pool, started, worker_pids = start_pool()
+        try:
+            while pending or deadlines:
+                while pending and len(deadlines) < max_workers:
+                    index = pending.popleft()
+                    pool.apply_async(
+                        _convert_in_batch_worker,
+                        (index, sources[index], kwargs),
+                        callback=lambda result, i=index, g=generation: finished.put((g, i, result)),
+                        error_callback=lambda error, i=index, g=generation: finished.put((g, i, error)),
+                    )
+                    deadlines[index] = time.monotonic() + timeout if timeout is not None else float("inf")
+
+                # Once a worker announces a conversion, its timeout counts from then rather than from its submission,
+                # which also paid for starting the pool's workers
+                while not started.empty():
+                    index, pid = started.get()
+                    worker_pids[index] = pid
+                    if index in deadlines and timeout is not None:
+                        deadlines[index] = time.monotonic() + timeout
+
+                # Wake up regularly to look for dead workers, whose conversions would otherwise never finish
+                wait = min(max(min(deadlines.values()) - time.monotonic(), 0), self._POOL_POLL_SECONDS)
+                try:
+                    result_generation, index, result = finished.get(timeout=wait)
+                except queue.Empty:
+                    lost = self._lost_conversions(pool, worker_pids, deadlines)
+                    if lost and finished.empty():
+                        for index, exitcode in lost:
+                            del deadlines[index]
+                            status = "" if exitcode is None else f" with code {exitcode}"
+                            yield index, WorkerCrashedError(f"The worker converting '{sources[index]}' exited{status}")
+                        continue
+
+                    now = time.monotonic()
+                    expired = [i for i, deadline in deadlines.items() if deadline <= now]
+                    if not expired:
+                        continue
+
+                    pool.terminate()
+                    pool.join()
+                    generation += 1
+                    for index in expired:
+                        del deadlines[index]
+                        yield index, TimeoutError(f"Converting '{sources[index]}' took more than {timeout} seconds")
+
+                    # Start the conversions that were cut short over, ahead of the others
+                    pending.extendleft(sorted(deadlines, reverse=True))
+                    deadlines.clear()
+                    pool, started, worker_pids = start_pool()
+                    continue
+
+                # Ignore results from a terminated pool, and from conversions already reported as lost
+                if result_generation != generation or index not in deadlines:
+                    continue
+                del deadlines[index]
+                yield index, result
+        finally:
+            pool.terminate()
+            pool.join()
+
+    # How often a batch conversion pool is checked for dead workers, in seconds
+    _POOL_POLL_SECONDS = 0.5
+
+    @staticmethod
+    def _lost_conversions(
+        pool: Any, worker_pids: Dict[int, int], deadlines: Dict[int, float]
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        Return the running conversions whose worker died, with its exit code if it is known. `worker_pids` maps the
+        conversions that workers announced to their pid.
+        """
+        # The pool removes dead workers from its (private) list of processes shortly after they exit
+        workers = {process.pid: process for process in pool._pool}
+        lost = []
+        for index, pid in worker_pids.items():
+            process = workers.get(pid)
+            if index in deadlines and (process is None or process.exitcode is not None):
+                lost.append((index, None if process is None else process.exitcode))
+        return lost
+
+    # Read and write payloads in large chunks
+    _CHUNK_SIZE = 1024 * 1024
+
+    def _iter_stream_chunks(self, stream: Any) -> Iterator[bytes]:
+        """Read a binary or text stream in chunks, encoding text as UTF-8."""
+        while True:
+            chunk = stream.read(self._CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+    def _buffer_payload(self, chunks: Iterable[bytes]) -> ConversionSource:
+        """
+        Collect a payload as an in-memory stream. Once it grows beyond the spill threshold, it is written to a
+        temporary file instead, and the path is returned. The caller is responsible for deleting that file.
+        """
+        buffered: List[bytes] = []
+        size = 0
+        chunks = iter(chunks)
+        for chunk in chunks:
+            buffered.append(chunk)
+            size += len(chunk)
+            if size > self._spill_threshold:
+                handle, temp_path = tempfile.mkstemp()
+                try:
+                    with os.fdopen(handle, "wb") as fh:
+                        fh.writelines(buffered)
+                        buffered = []
+                        for chunk in chunks:
+                            fh.write(chunk)
+                except Exception:
+                    os.unlink(temp_path)
+                    raise
+                return temp_path
+
+        # BytesIO shares the joined buffer rather than copying it
+        return io.BytesIO(b"".join(buffered))
+
+    def _convert(
+        self, local_path: ConversionSource, extensions: List[Union[str, None]], **kwargs
+    ) -> DocumentConverterResult:
+        options = self._with_default_options(kwargs)
+
+        # Replay a previous conversion of the same bytes, if there is one
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache.make_key(local_path, extensions, self._page_converters, options)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if self._workers is not None and self._isolatable(extensions, options.get("url")):
+            # The worker adds the global options itself, rather than being sent e.g. the mlm_client with every call
+            res, converter = self._dispatch_isolated(local_path, extensions, kwargs)
+        else:
+            res, converter = self._dispatch(local_path, extensions, options)
+
+        if cache_key is not None and converter.cacheable and res.cacheable:
+            self._cache.put(cache_key, converter, res)
+        return res
+
+    def _with_default_options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the conversion options, adding the global ones that are not overridden."""
+        kwargs = dict(kwargs)
+        if "mlm_client" not in kwargs and self._mlm_client is not None:
+            kwargs["mlm_client"] = self._mlm_client
+
+        if "mlm_model" not in kwargs and self._mlm_model is not None:
+            kwargs["mlm_model"] = self._mlm_model
+
+        if "html_parser" not in kwargs:
+            kwargs["html_parser"] = self._html_parser
+
+        if "markdown_engine" not in kwargs:
+            kwargs["markdown_engine"] = self._markdown_engine
+        return kwargs
+
+    def _isolatable(self, extensions: List[Union[str, None]], url: Union[str, None]) -> bool:
+        """Whether every converter that may be tried for a source can run in an isolated worker."""
+        return all(
+            converter.isolatable
+            for ext in list(extensions) + [None]
+            for converter in self._converters_for(ext, url)
+        )
+
+    def _isolation_timeout(self, extensions: List[Union[str, None]], url: Union[str, None]) -> Optional[float]:
+        """The timeout of converting a source in an isolated worker, long enough for any converter it may go to."""
+        timeout = self._workers.timeout
+        if timeout is None:
+            return None
+        return max(
+            [timeout]
+            + [
+                converter.min_isolation_timeout
+                for ext in list(extensions) + [None]
+                for converter in self._converters_for(ext, url)
+            ]
+        )
+
+    def _dispatch_isolated(
+        self, local_path: ConversionSource, extensions: List[Union[str, None]], kwargs: Dict[str, Any]
+    ) -> Tuple[DocumentConverterResult, DocumentConverter]:
+        """Run `_dispatch` in an isolation worker, reporting workers that had to be killed as conversion errors."""
+        try:
+            res, index, stats = self._workers.run(
+                _dispatch_in_isolated_worker,
+                local_path,
+                extensions,
+                kwargs,
+                timeout=self._isolation_timeout(extensions, kwargs.get("url")),
+            )
+        except (TimeoutError, MemoryError, WorkerCrashedError) as e:
+            source_name = local_path if isinstance(local_path, str) else "<stream>"
+            raise FileConversionException(f"Could not convert '{source_name}' to Markdown: {e}") from e
+
+        for name, counts in stats.items():
+            totals = self._dispatch_stats.setdefault(name, {"probes": 0, "hits": 0, "errors": 0})
+            for counter, count in counts.items():
+                totals[counter] += count
+        return res, self._page_converters[index]
+
+    def _dispatch(
+        self, local_path: ConversionSource, extensions: List[Union[str, None]], kwargs: Dict[str, Any]
+    ) -> Tuple[DocumentConverterResult, DocumentConverter]:
+        """Try the converters for each extension in turn, and return the first result and the converter it came from."""
+        # Probe each distinct extension once
+        candidate_exts: List[Union[str, None]] = []
+        seen = set()
+        for ext in extensions:
+            if ext is not None and ext.lower() not in seen:
+                seen.add(ext.lower())
+                candidate_exts.append(ext)
+
+        # HTML is parsed at most once per conversion, and the tree shared by all the converters that need it
+        parsed_html: Dict[str, Any] = {}
+
         error_trace = ""
-        for ext in extensions + [None]:  # Try last with no extension
-            for converter in self._page_converters:
-                _kwargs = copy.deepcopy(kwargs)
+        for ext in candidate_exts + [None]:  # Try last with no extension
+            for converter in self._converters_for(ext, kwargs.get("url")):
+                _kwargs = dict(kwargs)
 
                 # Overwrite file_extension appropriately
                 if ext is None:
@@ -937,38 +2975,59 @@ class MarkdownConverter:
                 else:
                     _kwargs.update({"file_extension": ext})
 
-                # Copy any additional global options
-                if "mlm_client" not in _kwargs and self._mlm_client is not None:
-                    _kwargs["mlm_client"] = self._mlm_client
+                _kwargs["parsed_html"] = parsed_html
 
-                if "mlm_model" not in _kwargs and self._mlm_model is not None:
-                    _kwargs["mlm_model"] = self._mlm_model
+                stats = self._dispatch_stats.setdefault(type(converter).__name__, {"probes": 0, "hits": 0, "errors": 0})
+                stats["probes"] += 1
 
                 # If we hit an error log it and keep trying
+                res = None
                 try:
                     res = converter.convert(local_path, **_kwargs)
                 except Exception:
+                    stats["errors"] += 1
                     error_trace = ("\n\n" + traceback.format_exc()).strip()
 
                 if res is not None:
-                    # Normalize the content
-                    res.text_content = "\n".join([line.rstrip() for line in re.split(r"\r?\n", res.text_content)])
-                    res.text_content = re.sub(r"\n{3,}", "\n\n", res.text_content)
+                    stats["hits"] += 1
 
-                    # Todo
-                    return res
+                    # Normalize the content, keeping page offsets pointing at the same characters
+                    self._normalize_result(res)
+                    return res, converter
 
         # If we got this far without success, report any exceptions
+        source_name = local_path if isinstance(local_path, str) else "<stream>"
         if len(error_trace) > 0:
             raise FileConversionException(
-                f"Could not convert '{local_path}' to Markdown. File type was recognized as {extensions}. While converting the file, the following error was encountered:\n\n{error_trace}"
+                f"Could not convert '{source_name}' to Markdown. File type was recognized as {extensions}. While converting the file, the following error was encountered:\n\n{error_trace}"
             )
 
         # Nothing can handle it!
         raise UnsupportedFormatException(
-            f"Could not convert '{local_path}' to Markdown. The formats {extensions} are not supported."
+            f"Could not convert '{source_name}' to Markdown. The formats {extensions} are not supported."
         )
 
+    def _normalize_result(self, res: DocumentConverterResult) -> None:
+        """
+        Normalize the text of a conversion result in place, in one pass over bounded slices of it, keeping page
+        offsets and the sections added by the converter pointing at the same characters. Then index its structure.
+        """
+        text = res.text_content
+        offsets = sorted({offset for _, offset in res.page_offsets or []} | {s.start for s in res.sections or []})
+        normalizer = _TextNormalizer(offsets)
+        chunks = (text[i : i + self._CHUNK_SIZE] for i in range(0, len(text), self._CHUNK_SIZE))
+
+        normalized = io.StringIO()
+        for piece in normalizer.normalize(chunks):
+            normalized.write(piece)
+        res.text_content = normalized.getvalue()
+
+        mapped = dict(zip(offsets, normalizer.mapped_offsets))
+        if res.page_offsets:
+            res.page_offsets = [(page, mapped[offset]) for page, offset in res.page_offsets]
+        boundaries = [s._replace(start=mapped[s.start], end=mapped[s.start]) for s in res.sections or []]
+        res.sections = _index_sections(res.text_content, res.page_offsets or [], boundaries)
+
     def _append_ext(self, extensions, ext):
         """Append a unique non-None, non-empty extension to a list of extensions."""
         if ext is None:
@@ -976,15 +3035,18 @@ class MarkdownConverter:
         ext = ext.strip()
         if ext == "":
             return
-        # if ext not in extensions:
-        if True:
+        if ext not in extensions:
             extensions.append(ext)
 
     def _guess_ext_magic(self, path):
         """Use puremagic (a Python implementation of libmagic) to guess a file's extension based on the first few bytes."""
         # Use puremagic to guess
         try:
-            guesses = puremagic.magic_file(path)
+            if isinstance(path, str):
+                guesses = puremagic.magic_file(path)
+            else:
+                path.seek(0)
+                guesses = puremagic.magic_stream(path)
             if len(guesses) > 0:
                 ext = guesses[0].extension.strip()
                 if len(ext) > 0:
@@ -995,8 +3057,50 @@ class MarkdownConverter:
             pass
         except PermissionError:
             pass
+        except (puremagic.PureError, ValueError):  # Unrecognized or empty content
+            pass
         return None
 
     def register_page_converter(self, converter: DocumentConverter) -> None:
         """Register a page text converter."""
         self._page_converters.insert(0, converter)
+        self._rebuild_dispatch_index()
+
+        # Isolation workers hold a copy of the converters from when they started, so replace them
+        if self._workers is not None:
+            self._workers.close()
+
+    def close(self) -> None:
+        """Stop the isolation workers, if there are any. They are started again by the next conversion."""
+        if self._workers is not None:
+            self._workers.close()
+
+    def dispatch_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return, per converter class, how many times it was probed, how often it succeeded, and how often it raised."""
+        return {name: dict(stats) for name, stats in self._dispatch_stats.items()}
+
+    def _rebuild_dispatch_index(self) -> None:
+        """Map every declared extension to the converters that may handle it, keeping registration priority."""
+        self._wildcard_converters = [c for c in self._page_converters if not c.file_extensions]
+
+        declared = set()
+        for converter in self._page_converters:
+            declared.update(ext.lower() for ext in converter.file_extensions)
+
+        self._dispatch_index = {
+            ext: [
+                c
+                for c in self._page_converters
+                if not c.file_extensions or ext in [e.lower() for e in c.file_extensions]
+            ]
+            for ext in declared
+        }
+
+    def _converters_for(self, ext: Union[str, None], url: Union[str, None]) -> List[DocumentConverter]:
+        """Return the converters worth trying for an extension and source URL, in priority order."""
+        if ext is None:
+            candidates = self._wildcard_converters
+        else:
+            candidates = self._dispatch_index.get(ext.lower(), self._wildcard_converters)
+
+        return [c for c in candidates if c.url_pattern is None or re.search(c.url_pattern, url or "")]
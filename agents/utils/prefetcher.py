@@ -0,0 +1,95 @@
+import concurrent.futures
+import threading
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Prefetcher(Generic[T]):
+    """
+    Loads a batch of keys (e.g., the top links of a search) in a bounded thread pool, ahead of being asked for them.
+
+    Each call to `prefetch` starts a new generation, which cancels the previous one, as does asking for a key outside
+    the current generation: loads that haven't started are dropped, and loads in progress are told through their
+    `cancelled` callback so that they can stop early, and their results are discarded.
+    """
+
+    def __init__(self, load: Callable[[str, Callable[[], bool]], Optional[T]], max_workers: int = 4):
+        """
+        Initialize the prefetcher, without starting any thread.
+
+        Args:
+            load: Called as `load(key, cancelled)` in a worker thread, returning the loaded value, or None if there is
+                nothing worth keeping. `cancelled()` becomes true once the load's generation is cancelled
+            max_workers: The number of keys loaded at once. Defaults to 4
+        """
+        self.load = load
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._futures: Dict[str, "concurrent.futures.Future[Optional[T]]"] = {}
+        self._stats = {"prefetched": 0, "hits": 0, "misses": 0, "cancelled": 0}
+
+    def prefetch(self, keys: List[str]) -> None:
+        """Cancel the current generation, and start loading `keys` in a new one."""
+        with self._lock:
+            self._cancel()
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="prefetch")
+            generation = self._generation
+            for key in dict.fromkeys(keys):
+                self._futures[key] = self._executor.submit(self._run, key, generation)
+            self._stats["prefetched"] += len(self._futures)
+
+    def take(self, key: str, timeout: Optional[float] = None) -> Optional[T]:
+        """
+        Return the value loaded for `key`, waiting for its load if it is still in progress, or None if `key` is not in
+        the current generation or could not be loaded. Asking for another key cancels the current generation.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                if self._futures:
+                    self._cancel()
+                self._stats["misses"] += 1
+                return None
+
+        try:
+            value = future.result(timeout)
+        except (concurrent.futures.CancelledError, concurrent.futures.TimeoutError, Exception):
+            value = None
+        with self._lock:
+            self._stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def cancel(self) -> None:
+        """Cancel the current generation."""
+        with self._lock:
+            self._cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of keys prefetched, taken with or without a loaded value, and cancelled."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Cancel the current generation, and stop the worker threads once their loads end."""
+        with self._lock:
+            self._cancel()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _cancel(self) -> None:
+        """Start a new, empty generation. Must be called with the lock held."""
+        self._generation += 1
+        for future in self._futures.values():
+            if future.cancel() or future.running():
+                self._stats["cancelled"] += 1
+        self._futures.clear()
+
+    def _run(self, key: str, generation: int) -> Optional[T]:
+        if generation != self._generation:
+            return None
+        return self.load(key, lambda: generation != self._generation)
@@ -0,0 +1,31 @@
+import base64
+import io
+import pptx
+from pptx.util import Inches
+
+# A 2x2 red PNG
+PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAIAAAACCAIAAAD91JpzAAAAFklEQVR4nGP8z8DAwMDAxMDAwMDAAAANHQEDasKb6QAAAABJRU5ErkJggg=="
+)
+
+def make_pptx(num_slides, table_rows=3):
+    """Build a deck where every slide has a title, a text box, a table, a picture, and notes on every other slide."""
+    presentation = pptx.Presentation()
+    layout = presentation.slide_layouts[5]  # Title only
+    for i in range(1, num_slides + 1):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"  Slide *{i}* title"
+        slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(4), Inches(1)).text = f"Body of slide {i}  \nsecond line "
+
+        table = slide.shapes.add_table(table_rows, 3, Inches(1), Inches(3), Inches(6), Inches(2)).table
+        for r in range(table_rows):
+            for c in range(3):
+                table.cell(r, c).text = f"h_{c}" if r == 0 else f"<{r},{c}> a*b\nnext"
+
+        slide.shapes.add_picture(io.BytesIO(PNG_BYTES), Inches(7), Inches(1), Inches(1), Inches(1))
+        if i % 2 == 0:
+            slide.notes_slide.notes_text_frame.text = f"Notes for slide {i}\n\n"
+
+    stream = io.BytesIO()
+    presentation.save(stream)
+    return stream.getvalue()
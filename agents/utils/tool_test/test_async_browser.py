@@ -0,0 +1,146 @@
+import unittest
+import asyncio
+import os
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from agents.utils.http_cache import HttpCache
+from agents.utils.mdconvert import ConversionCache
+from agents.WebBrowserAgent.tools.async_text_web_browser import AsyncTextBrowser, AsyncVisitTool
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves HTML pages, a slow page, a plain text download and a 404, and counts the requests it handles."""
+
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        PageHandler.hits += 1
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/missing":
+            status, content_type, body = 404, "text/html", b"<html><body><h1>Nothing here</h1></body></html>"
+        elif self.path == "/data.csv":
+            status, content_type, body = 200, "application/octet-stream", b"name,value\nalpha,1\n"
+        else:
+            status, content_type = 200, "text/html; charset=utf-8"
+            body = f"<html><head><title>Page {self.path}</title></head><body><h1>Page {self.path}</h1><p>Needle in {self.path}</p></body></html>".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=600")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestAsyncTextBrowser(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        PageHandler.hits = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def browser(self, **kwargs):
+        return AsyncTextBrowser(
+            downloads_folder=self.test_dir,
+            http_cache=HttpCache(os.path.join(self.test_dir, "http")),
+            conversion_cache=ConversionCache(os.path.join(self.test_dir, "mdconvert")),
+            **kwargs,
+        )
+
+    def test_visit_and_history(self):
+        """Test that pages are converted, searched and kept in history as with SimpleTextBrowser"""
+        async def browse():
+            browser = self.browser()
+            content = await browser.visit_page(f"{self.base}/first")
+            self.assertIn("Needle in /first", content)
+            self.assertEqual(browser.page_title, "Page /first")
+            self.assertIn("Needle", browser.find_on_page("Needle"))
+
+            await browser.visit_page("second")
+            self.assertEqual(browser.address, f"{self.base}/second")
+            self.assertEqual([address for address, _ in browser.history], [
+                "about:blank", f"{self.base}/first", f"{self.base}/second"])
+
+            await browser.visit_page(f"{self.base}/missing")
+            self.assertEqual(browser.page_title, "Error 404")
+            self.assertIn("Nothing here", browser.page_content)
+
+            await browser.visit_page(f"{self.base}/data.csv")
+            self.assertTrue(browser.address.startswith("file://"))
+            self.assertIn("alpha", browser.page_content)
+
+            await browser.visit_page("http://127.0.0.1:9/unreachable")
+            self.assertEqual(browser.page_title, "Error")
+            await browser.aclose()
+
+        asyncio.run(browse())
+
+    def test_failed_downloads_release_their_connection(self):
+        """Test that a download that can't be saved still closes its streamed response"""
+        async def browse():
+            browser = AsyncTextBrowser(downloads_folder=os.path.join(self.test_dir, "missing"))
+            responses = []
+            send = browser._send
+
+            async def recording_send(*args, **kwargs):
+                responses.append(await send(*args, **kwargs))
+                return responses[-1]
+
+            browser._send = recording_send
+            await browser.visit_page(f"{self.base}/data.csv")
+            self.assertEqual(browser.page_title, "Error 404")
+            self.assertTrue(responses[0]._httpx_response.is_closed)
+            await browser.aclose()
+
+        asyncio.run(browse())
+
+    def test_concurrent_sessions(self):
+        """Test that sessions on one event loop wait on their own requests, and share the cache"""
+        async def browse():
+            browsers = [self.browser() for _ in range(4)]
+            start = time.time()
+            contents = await asyncio.gather(*[browser.visit_page(f"{self.base}/slow") for browser in browsers])
+            elapsed = time.time() - start
+            for browser in browsers:
+                await browser.aclose()
+            return contents, elapsed
+
+        contents, elapsed = asyncio.run(browse())
+        self.assertTrue(all("Needle in /slow" in content for content in contents))
+        self.assertLess(elapsed, 1.5)
+
+        async def revisit():
+            browser = self.browser()
+            await browser.visit_page(f"{self.base}/slow")
+            await browser.aclose()
+
+        hits = PageHandler.hits
+        asyncio.run(revisit())
+        self.assertEqual(PageHandler.hits, hits)
+
+    def test_synchronous_tools(self):
+        """Test that tools run the browser's coroutines on its loop, and that the loop can't block on itself"""
+        browser = self.browser()
+        self.assertIn("Needle in /tool", AsyncVisitTool(browser).forward(f"{self.base}/tool"))
+
+        async def blocking():
+            browser.run(browser.visit_page(f"{self.base}/tool"))
+
+        with self.assertRaises(RuntimeError):
+            browser.run(blocking())
+        browser.run(browser.aclose())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+import unittest
+import array
+import io
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import wave
+from unittest import mock
+from agents.utils import mdconvert
+from agents.utils.mdconvert import ConversionCache, MarkdownConverter, Mp3Converter, WavConverter
+
+SAMPLE_RATE = 16000
+
+def write_wav(path, pattern):
+    """Write a 16 kHz mono WAV from (seconds, loud) pairs: a 440 Hz tone when loud, silence otherwise."""
+    samples = array.array("h")
+    for seconds, loud in pattern:
+        for i in range(int(seconds * SAMPLE_RATE)):
+            samples.append(int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE)) if loud else 0)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+
+def count_words(audio):
+    """A local stand-in transcriber: one "word" per burst of tone in the segment."""
+    samples = array.array("h", audio.get_raw_data())
+    window = audio.sample_rate // 50
+    words, loud = 0, False
+    for offset in range(0, len(samples), window):
+        now_loud = max(map(abs, samples[offset : offset + window])) > 1000
+        words += now_loud and not loud
+        loud = now_loud
+    return " ".join(["word"] * words)
+
+# A stand-in for ffmpeg that "decodes" 16 kHz mono WAVs, from a path or stdin, and logs its arguments
+FAKE_FFMPEG = f"""#!{sys.executable}
+import io, sys, wave
+args = sys.argv[1:]
+with open(__file__ + ".args", "w") as fh:
+    fh.write(" ".join(args))
+source = args[args.index("-i") + 1]
+data = sys.stdin.buffer.read() if source in ["pipe:0", "cache:pipe:0"] else open(source, "rb").read()
+try:
+    with wave.open(io.BytesIO(data)) as wav:
+        sys.stdout.buffer.write(wav.readframes(wav.getnframes()))
+except wave.Error as e:
+    sys.stderr.write(str(e))
+    sys.exit(1)
+"""
+
+class TestWavConverter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.wav_path = os.path.join(self.test_dir, "speech.wav")
+        # Five 0.8 s words, each followed by 0.4 s of silence
+        write_wav(self.wav_path, [(0.8, True), (0.4, False)] * 5)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def convert(self, transcriber, **kwargs):
+        converter = MarkdownConverter()
+        converter.register_page_converter(WavConverter(transcriber=transcriber, **kwargs))
+        return converter.convert(self.wav_path).text_content
+
+    def test_segments_are_cut_between_words(self):
+        """Test that segments are cut in silences, and stitched in order with their start times"""
+        text = self.convert(count_words, segment_seconds=2.0)
+
+        self.assertEqual(
+            text,
+            "### Audio Transcript:\n[00:00:00] word\n[00:00:01] word\n[00:00:02] word\n[00:00:03] word\n[00:00:04] word",
+        )
+
+    def test_concurrent_segments_keep_their_order(self):
+        """Test that segments finishing out of order are stitched in order"""
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow_transcriber(audio):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(random.random() / 20)
+            with lock:
+                active[0] -= 1
+            return count_words(audio)
+
+        text = self.convert(slow_transcriber, segment_seconds=1.5, max_workers=3)
+
+        self.assertEqual(text.count("word"), 5)
+        starts = [line.split("]")[0] for line in text.splitlines()[1:]]
+        self.assertEqual(starts, sorted(starts))
+        self.assertLessEqual(peak[0], 3)
+
+    def test_failed_segments(self):
+        """Test that failed segments are noted, and that the whole transcription fails if every segment does"""
+        calls = []
+
+        def flaky_transcriber(audio):
+            calls.append(audio)
+            if len(calls) == 2:
+                raise RuntimeError("Recognition service unavailable")
+            return count_words(audio)
+
+        text = self.convert(flaky_transcriber, segment_seconds=2.0, max_workers=1)
+        self.assertIn("[00:00:01] [Could not transcribe this segment]\n[00:00:02] word", text)
+
+        def broken_transcriber(audio):
+            raise RuntimeError("Recognition service unavailable")
+
+        text = self.convert(broken_transcriber, segment_seconds=2.0)
+        self.assertEqual(text, "### Audio Transcript:\nError. Could not transcribe this audio.")
+
+    def test_failures_are_not_cached(self):
+        """Test that transcripts with failed segments are converted again, and complete ones are cached"""
+        service = {"up": False, "calls": 0}
+
+        def transcriber(audio):
+            service["calls"] += 1
+            if not service["up"]:
+                raise RuntimeError("Recognition service unavailable")
+            return count_words(audio)
+
+        cache = ConversionCache(os.path.join(self.test_dir, "cache"))
+        converter = MarkdownConverter(cache=cache)
+        converter.register_page_converter(WavConverter(transcriber=transcriber, segment_seconds=2.0))
+
+        self.assertIn("Could not transcribe", converter.convert(self.wav_path).text_content)
+        service["up"] = True
+        self.assertIn("[00:00:00] word", converter.convert(self.wav_path).text_content)
+        calls = service["calls"]
+        self.assertIn("[00:00:00] word", converter.convert(self.wav_path).text_content)
+        self.assertEqual(service["calls"], calls)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["entries"]), (1, 1))
+
+    def test_no_speech(self):
+        """Test that silent audio is reported as such"""
+        write_wav(self.wav_path, [(3.0, False)])
+        self.assertEqual(self.convert(count_words), "### Audio Transcript:\n[No speech detected]")
+
+class TestMp3Converter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.audio_path = os.path.join(self.test_dir, "speech.mp3")
+        write_wav(self.audio_path, [(0.8, True), (0.4, False)] * 3)
+
+        self.ffmpeg = os.path.abspath(os.path.join(self.test_dir, "ffmpeg"))
+        with open(self.ffmpeg, "w") as fh:
+            fh.write(FAKE_FFMPEG)
+        os.chmod(self.ffmpeg, 0o755)
+        which = lambda name: self.ffmpeg if name == "ffmpeg" else None
+        patcher = mock.patch.object(mdconvert.shutil, "which", side_effect=which)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.converter = MarkdownConverter()
+        self.converter.register_page_converter(Mp3Converter(transcriber=count_words, segment_seconds=2.0))
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_ffmpeg_pipe(self):
+        """Test that files are decoded by ffmpeg to 16 kHz mono PCM through a pipe"""
+        text = self.converter.convert(self.audio_path).text_content
+
+        self.assertEqual(text, "### Audio Transcript:\n[00:00:00] word\n[00:00:01] word\n[00:00:02] word")
+        with open(self.ffmpeg + ".args") as fh:
+            args = fh.read()
+        self.assertIn(f"-i {self.audio_path} -vn -f s16le -ac 1 -ar 16000 pipe:1", args)
+
+    def test_streams_are_piped(self):
+        """
+        Test that in-memory audio is fed to ffmpeg's stdin rather than written to a temporary file, in formats beyond
+        mp3 and m4a. Only MP4 containers go through ffmpeg's cache protocol, which spools them to disk to seek back
+        """
+        with open(self.audio_path, "rb") as fh:
+            data = fh.read()
+
+        for extension, source in [(".ogg", "-i pipe:0 "), (".m4a", "-i cache:pipe:0 ")]:
+            with self.subTest(extension=extension):
+                with mock.patch.object(tempfile, "mkstemp", side_effect=AssertionError("wrote a temporary file")):
+                    text = self.converter.convert_stream(io.BytesIO(data), file_extension=extension).text_content
+
+                self.assertEqual(text, "### Audio Transcript:\n[00:00:00] word\n[00:00:01] word\n[00:00:02] word")
+                with open(self.ffmpeg + ".args") as fh:
+                    self.assertIn(source, fh.read())
+
+    def test_without_a_decoder(self):
+        """Test that without ffmpeg, or avconv for pydub, the transcript says that a decoder is missing"""
+        with mock.patch.object(mdconvert.shutil, "which", return_value=None):
+            text = self.converter.convert(self.audio_path).text_content
+        self.assertEqual(
+            text, "### Audio Transcript:\nError. Could not transcribe this audio: decoding it requires ffmpeg or avconv."
+        )
+
+    def test_decoding_errors(self):
+        """Test that audio ffmpeg cannot decode is reported as such"""
+        with open(self.audio_path, "wb") as fh:
+            fh.write(b"not audio")
+
+        text = self.converter.convert(self.audio_path).text_content
+        self.assertEqual(text, "### Audio Transcript:\nError. Could not transcribe this audio.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import io
+import os
+import shutil
+from unittest import mock
+from agents.utils.mdconvert import ConversionCache, MarkdownConverter
+from agents.utils.tool_test.pdf_samples import make_pdf
+
+class TestConversionCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        os.makedirs(self.test_dir, exist_ok=True)
+
+        self.text_path = os.path.join(self.test_dir, "notes.txt")
+        with open(self.text_path, "w", encoding="utf-8") as fh:
+            fh.write("Hello   \nWorld\n\n\n\nBye")
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_repeat_conversion_is_a_hit(self):
+        """Test that converting the same bytes twice is served from the cache"""
+        cache = ConversionCache(self.cache_dir)
+        converter = MarkdownConverter(cache=cache)
+
+        first = converter.convert(self.text_path)
+        second = converter.convert(self.text_path)
+
+        self.assertEqual(first.text_content, "Hello\nWorld\n\nBye")
+        self.assertEqual(second.text_content, first.text_content)
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_cache_survives_new_instances(self):
+        """Test that cached conversions persist on disk"""
+        MarkdownConverter(cache=ConversionCache(self.cache_dir)).convert(self.text_path)
+
+        cache = ConversionCache(self.cache_dir)
+        MarkdownConverter(cache=cache).convert(self.text_path)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_changed_content_is_a_miss(self):
+        """Test that the key follows the file bytes, not the path"""
+        cache = ConversionCache(self.cache_dir)
+        converter = MarkdownConverter(cache=cache)
+        converter.convert(self.text_path)
+
+        with open(self.text_path, "w", encoding="utf-8") as fh:
+            fh.write("Something else")
+
+        result = converter.convert(self.text_path)
+        self.assertEqual(result.text_content, "Something else")
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted beyond max_bytes"""
+        cache = ConversionCache(self.cache_dir, max_bytes=400)
+        converter = MarkdownConverter(cache=cache)
+
+        for i in range(5):
+            path = os.path.join(self.test_dir, f"file_{i}.txt")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(f"File number {i}")
+            converter.convert(path)
+
+        stats = cache.stats()
+        self.assertGreater(stats["evictions"], 0)
+        self.assertLessEqual(stats["bytes"], 400)
+
+    def test_options_are_keyed_by_value(self):
+        """Test that conversions with different page ranges are cached apart"""
+        pdf_path = os.path.join(self.test_dir, "report.pdf")
+        with open(pdf_path, "wb") as fh:
+            fh.write(make_pdf([f"This is page number {i}" for i in range(1, 11)]))
+        cache = ConversionCache(self.cache_dir)
+        converter = MarkdownConverter(cache=cache)
+
+        first = converter.convert(pdf_path, pdf_page_range=(1, 2))
+        second = converter.convert(pdf_path, pdf_page_range=(8, 9))
+        self.assertIn("page number 2", first.text_content)
+        self.assertIn("page number 8", second.text_content)
+        self.assertNotIn("page number 2", second.text_content)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["entries"]), (0, 2))
+
+        self.assertEqual(converter.convert(pdf_path, pdf_page_range=[8, 9]).text_content, second.text_content)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_youtube_pages_without_their_transcript(self):
+        """Test that a YouTube page is only cached without its transcript if the video has none"""
+        class TranscriptsDisabled(Exception):
+            pass
+
+        page = b"<html><head><title>Video</title></head><body></body></html>"
+        for error, cached in [(ConnectionError("offline"), False), (TranscriptsDisabled("video"), True)]:
+            with self.subTest(error=type(error).__name__):
+                cache = ConversionCache(os.path.join(self.cache_dir, type(error).__name__))
+                converter = MarkdownConverter(cache=cache)
+                with mock.patch("youtube_transcript_api.YouTubeTranscriptApi.get_transcript", side_effect=error):
+                    result = converter.convert_stream(
+                        io.BytesIO(page), file_extension=".html", url="https://www.youtube.com/watch?v=abc"
+                    )
+                self.assertIn("# YouTube", result.text_content)
+                self.assertEqual(cache.stats()["entries"], int(cached))
+
+if __name__ == '__main__':
+    unittest.main()
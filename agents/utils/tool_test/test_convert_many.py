@@ -0,0 +1,153 @@
+import unittest
+import os
+import pickle
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from agents.utils.http_client import shared_http_client
+from agents.utils.mdconvert import ConversionCache, DocumentConverter, DocumentConverterResult, MarkdownConverter
+from agents.utils.worker_pool import WorkerCrashedError
+
+class SlowConverter(DocumentConverter):
+    """Takes `seconds` to convert ".slow" files."""
+
+    file_extensions = [".slow"]
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def convert(self, local_path, **kwargs):
+        if kwargs.get("file_extension") != ".slow":
+            return None
+        time.sleep(self.seconds)
+        return DocumentConverterResult(text_content=f"slept in {os.getpid()}")
+
+class CrashingConverter(DocumentConverter):
+    """Kills its worker process on ".crash" files, as the kernel's OOM killer or a segfault in a parser would."""
+
+    file_extensions = [".crash"]
+
+    def convert(self, local_path, **kwargs):
+        if kwargs.get("file_extension") != ".crash":
+            return None
+        os._exit(9)
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves a page named after its path over HTTP/1.1 keep-alive, and records the client port of each request."""
+
+    protocol_version = "HTTP/1.1"
+    ports = []
+
+    def do_GET(self):
+        PageHandler.ports.append(self.client_address[1])
+        body = f"<html><body><h1>Page {self.path[1:]}</h1></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestConvertMany(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.paths = []
+        for i in range(6):
+            path = os.path.join(self.test_dir, f"doc{i}.html")
+            with open(path, "w") as fh:
+                fh.write(f"<html><body><h1>Document {i}</h1></body></html>")
+            self.paths.append(path)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_ordered_results_and_errors(self):
+        """Test that results come back in order, with the errors of the files that failed"""
+        missing = os.path.join(self.test_dir, "missing.docx")
+        progress = []
+        results = MarkdownConverter().convert_many(
+            self.paths + [missing], max_workers=2, progress=lambda *args: progress.append(args)
+        )
+
+        self.assertEqual([r.text_content.strip() for r in results[:-1]], [f"# Document {i}" for i in range(6)])
+        self.assertIsInstance(results[-1], Exception)
+        self.assertEqual([(done, total) for done, total, _ in progress], [(n, 7) for n in range(1, 8)])
+        self.assertEqual(sorted(source for _, _, source in progress), sorted(self.paths + [missing]))
+
+    def test_serial_matches_pool(self):
+        """Test that converting in this process gives the same results as the pool"""
+        converter = MarkdownConverter()
+        serial = converter.convert_many(self.paths, max_workers=0)
+        pooled = converter.convert_many(self.paths, max_workers=3)
+        self.assertEqual([r.text_content for r in serial], [r.text_content for r in pooled])
+
+    def test_streaming_and_timeouts(self):
+        """Test that conversions over the timeout are abandoned while the others complete"""
+        slow_path = os.path.join(self.test_dir, "stuck.slow")
+        with open(slow_path, "w") as fh:
+            fh.write("zzz")
+        converter = MarkdownConverter()
+        converter.register_page_converter(SlowConverter(60))
+
+        start = time.monotonic()
+        finished = list(converter.iter_convert_many([slow_path] + self.paths, max_workers=2, timeout=2))
+
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertEqual(sorted(index for index, _ in finished), list(range(7)))
+        results = dict(finished)
+        self.assertIsInstance(results[0], TimeoutError)
+        self.assertEqual(results[6].text_content.strip(), "# Document 5")
+        # The stuck conversion finished last
+        self.assertEqual(finished[-1][0], 0)
+
+    def test_dead_workers(self):
+        """Test that a conversion whose worker dies is reported as failed, without a timeout, and the others complete"""
+        crash_path = os.path.join(self.test_dir, "parser.crash")
+        with open(crash_path, "w") as fh:
+            fh.write("data")
+        converter = MarkdownConverter()
+        converter.register_page_converter(CrashingConverter())
+
+        start = time.monotonic()
+        results = converter.convert_many([crash_path] + self.paths, max_workers=2)
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertIsInstance(results[0], WorkerCrashedError)
+        self.assertIn("parser.crash", str(results[0]))
+        self.assertEqual([r.text_content.strip() for r in results[1:]], [f"# Document {i}" for i in range(6)])
+
+    def test_urls_after_the_shared_client_was_used(self):
+        """Test that workers open connections of their own rather than using those pooled by this process"""
+        PageHandler.ports = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            client = shared_http_client()
+            self.assertIn("Page home", client.get(f"{base}/home").text)
+            parent_port = PageHandler.ports[0]
+
+            converter = MarkdownConverter(requests_session=client)
+            results = converter.convert_many([f"{base}/{i}" for i in range(4)], max_workers=2, timeout=20)
+            self.assertEqual([r.text_content.strip() for r in results], [f"# Page {i}" for i in range(4)])
+            self.assertNotIn(parent_port, PageHandler.ports[1:])
+
+            # The connection kept alive by this process still works
+            self.assertIn("Page again", client.get(f"{base}/again").text)
+            self.assertEqual(PageHandler.ports[-1], parent_port)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_converters_can_be_pickled(self):
+        """Test that converters, caches included, can be shipped to spawned worker processes"""
+        cache = ConversionCache(os.path.join(self.test_dir, "cache"))
+        converter = pickle.loads(pickle.dumps(MarkdownConverter(cache=cache)))
+        self.assertEqual(converter.convert(self.paths[0]).text_content.strip(), "# Document 0")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import shutil
+from agents.utils.mdconvert import DocumentConverter, DocumentConverterResult, MarkdownConverter
+
+class CsvConverter(DocumentConverter):
+    file_extensions = [".csv"]
+
+    def convert(self, local_path, **kwargs):
+        if kwargs.get("file_extension", "").lower() != ".csv":
+            return None
+        return DocumentConverterResult(title=None, text_content="csv!")
+
+class TestDispatch(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.converter = MarkdownConverter()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        return path
+
+    def test_html_goes_straight_to_html_converter(self):
+        """Test that an HTML file is only probed by the HTML converter"""
+        path = self._write("page.html", "<html><head><title>T</title></head><body><h1>Hi</h1></body></html>")
+        result = self.converter.convert(path)
+
+        self.assertEqual(result.title, "T")
+        stats = self.converter.dispatch_stats()
+        self.assertEqual(stats["HtmlConverter"], {"probes": 1, "hits": 1, "errors": 0})
+        self.assertNotIn("PdfConverter", stats)
+        self.assertNotIn("WikipediaConverter", stats)
+        self.assertNotIn("YouTubeConverter", stats)
+
+    def test_url_patterns_route_to_specialized_converters(self):
+        """Test that URL patterns filter the HTML-family converters"""
+        self.assertEqual(
+            [type(c).__name__ for c in self.converter._converters_for(".html", "https://en.wikipedia.org/wiki/X")],
+            ["WikipediaConverter", "HtmlConverter", "PlainTextConverter"],
+        )
+        self.assertEqual(
+            [type(c).__name__ for c in self.converter._converters_for(".html", "https://example.com")],
+            ["HtmlConverter", "PlainTextConverter"],
+        )
+
+    def test_unknown_extensions_fall_back_to_generic_converters(self):
+        """Test that an undeclared extension only reaches converters without declared extensions"""
+        path = self._write("data.json", '{"a": 1}')
+        result = self.converter.convert(path)
+
+        self.assertEqual(result.text_content, '{"a": 1}')
+        self.assertEqual(list(self.converter.dispatch_stats()), ["PlainTextConverter"])
+
+    def test_duplicate_extensions_are_probed_once(self):
+        """Test that repeated extension guesses do not trigger repeated attempts"""
+        extensions = []
+        self.converter._append_ext(extensions, ".txt")
+        self.converter._append_ext(extensions, ".txt")
+        self.assertEqual(extensions, [".txt"])
+
+    def test_registered_converters_join_the_index(self):
+        """Test that later registrations are indexed with the highest priority"""
+        self.converter.register_page_converter(CsvConverter())
+        path = self._write("table.csv", "a,b\n1,2")
+
+        self.assertEqual(self.converter.convert(path).text_content, "csv!")
+        self.assertEqual(self.converter.dispatch_stats()["CsvConverter"]["hits"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
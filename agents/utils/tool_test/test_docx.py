@@ -0,0 +1,60 @@
+import unittest
+import io
+import os
+import shutil
+import mammoth
+from agents.utils.mdconvert import DocxConverter, HtmlConverter
+from agents.utils.tool_test.docx_samples import make_docx
+
+class TestDocxConverter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        self.image_dir = os.path.join(self.test_dir, "images")
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.docx = make_docx(3, distinct_images=2)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def convert(self, **kwargs):
+        return DocxConverter(**kwargs).convert(io.BytesIO(self.docx), file_extension=".docx").text_content
+
+    def test_truncated_images_match_data_uris(self):
+        """Test that the default mode gives the output of mammoth's data URIs, without encoding the images"""
+        html_content = mammoth.convert_to_html(io.BytesIO(self.docx)).value
+        expected = HtmlConverter()._convert(html_content).text_content
+
+        self.assertEqual(self.convert(), expected)
+        self.assertIn("![Figure 1](data:image/png;base64...)", expected)
+
+    def test_saved_images(self):
+        """Test that each distinct image is written once and referenced by path"""
+        text = self.convert(image_mode="save", image_dir=self.image_dir)
+
+        self.assertEqual(len(os.listdir(self.image_dir)), 2)
+        paths = [line[line.index("(") + 1 : -1] for line in text.splitlines() if line.startswith("![")]
+        self.assertEqual(len(paths), 3)
+        self.assertEqual(paths[0], paths[2])
+        with open(paths[1], "rb") as fh:
+            self.assertTrue(fh.read().startswith(b"\x89PNG"))
+        self.assertFalse(DocxConverter(image_mode="save").cacheable)
+
+    def test_dropped_images_and_mammoth_engine(self):
+        """Test dropping images, with both engines"""
+        text = self.convert(image_mode="drop")
+        self.assertNotIn("![", text)
+        self.assertIn("| a | b |\n| --- | --- |\n| 1 | 2 |\n\nParagraph 1\n\nParagraph 2", text)
+
+        text = self.convert(image_mode="drop", engine="mammoth")
+        self.assertEqual(text, "# Report\n\na\n\nb\n\n1\n\n2\n\nParagraph 1\n\nParagraph 2\n\nParagraph 3")
+
+    def test_invalid_options(self):
+        """Test that unknown modes and engines are rejected"""
+        with self.assertRaises(ValueError):
+            DocxConverter(image_mode="inline")
+        with self.assertRaises(ValueError):
+            DocxConverter(engine="pandoc")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import shutil
+import sys
+import threading
+from unittest import mock
+from agents.utils import mdconvert
+from agents.utils.exiftool import ExifTool
+from agents.utils.mdconvert import MarkdownConverter
+
+# A stand-in for exiftool that speaks the -stay_open protocol, and counts how many times it was started
+FAKE_EXIFTOOL = f"""#!{sys.executable}
+import json, os, sys
+with open(__file__ + ".starts", "a") as fh:
+    fh.write("x")
+args = []
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if args[-1:] == ["-stay_open"] and line == "False":
+        break
+    if not line.startswith("-execute"):
+        args.append(line)
+        continue
+    if "crash" in args:
+        sys.exit(1)
+    paths = [arg for arg in args if not arg.startswith("-") and os.path.exists(arg)]
+    if paths:
+        print(json.dumps([{{"SourceFile": p, "ImageSize": f"{{os.path.getsize(p)}}x1"}} for p in paths]))
+    print("{{ready" + line[len("-execute"):] + "}}", flush=True)
+    args = []
+"""
+
+class TestExifTool(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.executable = os.path.abspath(os.path.join(self.test_dir, "exiftool"))
+        with open(self.executable, "w") as fh:
+            fh.write(FAKE_EXIFTOOL)
+        os.chmod(self.executable, 0o755)
+
+        self.paths = []
+        for i in range(1, 6):
+            path = os.path.join(self.test_dir, f"photo{i}.png")
+            with open(path, "wb") as fh:
+                fh.write(b"x" * i)
+            self.paths.append(path)
+
+        self.exiftool = ExifTool(self.executable)
+        self.addCleanup(self.exiftool.close)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def starts(self):
+        with open(self.executable + ".starts") as fh:
+            return len(fh.read())
+
+    def test_requests_share_one_process(self):
+        """Test that single and batch requests are answered in order by a single exiftool process"""
+        self.assertEqual(self.exiftool.get_metadata(self.paths[0])["ImageSize"], "1x1")
+
+        missing = os.path.join(self.test_dir, "missing.png")
+        results = self.exiftool.get_metadata_batch([self.paths[2], missing, self.paths[1]])
+        self.assertEqual([r and r["ImageSize"] for r in results], ["3x1", None, "2x1"])
+        self.assertEqual(self.starts(), 1)
+
+    def test_concurrent_requests(self):
+        """Test that requests from many threads are serialized"""
+        results = {}
+
+        def worker(n):
+            for i in range(10):
+                path = self.paths[(n + i) % len(self.paths)]
+                results[(n, i)] = (path, self.exiftool.get_metadata(path))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 80)
+        for path, metadata in results.values():
+            self.assertEqual(metadata["SourceFile"], path)
+        self.assertEqual(self.starts(), 1)
+
+    def test_restart_after_crash(self):
+        """Test that a dead process is restarted by the next request"""
+        self.assertEqual(self.exiftool.get_metadata("crash"), None)
+        self.assertEqual(self.exiftool.get_metadata(self.paths[4])["ImageSize"], "5x1")
+        self.assertEqual(self.starts(), 2)
+
+    def test_not_installed(self):
+        """Test that metadata is skipped when exiftool is not installed"""
+        with mock.patch.object(mdconvert.shutil, "which", return_value=None):
+            exiftool = ExifTool()
+        self.assertFalse(exiftool.available)
+        self.assertEqual(exiftool.get_metadata_batch(self.paths[:2]), [None, None])
+
+    def test_media_converters_use_the_shared_process(self):
+        """Test that image conversions read their metadata from the shared process"""
+        converter = MarkdownConverter()
+        with mock.patch.object(mdconvert, "shared_exiftool", return_value=self.exiftool):
+            texts = [converter.convert(path).text_content for path in self.paths[:3]]
+
+        self.assertEqual(texts, ["ImageSize: 1x1\n", "ImageSize: 2x1\n", "ImageSize: 3x1\n"])
+        self.assertEqual(self.starts(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
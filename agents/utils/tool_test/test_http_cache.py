@@ -0,0 +1,120 @@
+import unittest
+import email.utils
+import io
+import os
+import shutil
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from agents.utils.http_cache import HttpCache
+from agents.WebBrowserAgent.tools.text_web_browser import SimpleTextBrowser
+
+class FakeServer:
+    """A stand-in for requests.get, which serves one page and records the headers of every request."""
+
+    def __init__(self, body=b"<html><body>Reference</body></html>", **headers):
+        self.body = body
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **headers}
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        response = requests.Response()
+        response.url = url
+        response.headers = CaseInsensitiveDict(self.headers)
+        if "ETag" in self.headers and headers.get("If-None-Match") == self.headers["ETag"]:
+            response.status_code = 304
+            response.raw = io.BytesIO(b"")
+        else:
+            response.status_code = 200
+            response.reason = "OK"
+            response.raw = io.BytesIO(self.body)
+        return response
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.cache_dir = os.path.join(self.test_dir, "http")
+        self.url = "https://example.com/reference"
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_fresh_responses_are_replayed(self):
+        """Test that responses within their max-age are replayed without a request"""
+        server = FakeServer(**{"Cache-Control": "max-age=600"})
+        cache = HttpCache(self.cache_dir)
+
+        first = cache.get(self.url, fetch=server.get, headers={"User-Agent": "test"})
+        second = cache.get(self.url, fetch=server.get, headers={"User-Agent": "test"})
+
+        self.assertEqual(len(server.requests), 1)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(b"".join(second.iter_content(chunk_size=4)), server.body)
+
+        # The cache outlives the instance
+        self.assertTrue(HttpCache(self.cache_dir).get(self.url, fetch=server.get).from_cache)
+
+    def test_stale_responses_are_revalidated(self):
+        """Test that stale responses are revalidated with their ETag, and replayed on a 304"""
+        server = FakeServer(**{"Cache-Control": "no-cache", "ETag": '"v1"'})
+        cache = HttpCache(self.cache_dir)
+
+        cache.get(self.url, fetch=server.get)
+        response = cache.get(self.url, fetch=server.get)
+        self.assertEqual(server.requests[1]["If-None-Match"], '"v1"')
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.status_code, 200)
+
+        server.headers["ETag"] = '"v2"'
+        server.body = b"<html><body>Updated</body></html>"
+        self.assertEqual(cache.get(self.url, fetch=server.get).content, server.body)
+        self.assertEqual(cache.stats()["revalidated"], 1)
+        self.assertEqual(cache.stats()["fetched"], 2)
+
+    def test_freshness_headers(self):
+        """Test freshness from Expires and Last-Modified, and that no-store and downloads are not stored"""
+        now = time.time()
+        expires = FakeServer(**{"Date": email.utils.formatdate(now, usegmt=True), "Expires": email.utils.formatdate(now + 600, usegmt=True)})
+        self.assertTrue(HttpCache(self.cache_dir).get(self.url, fetch=expires.get).content)
+        self.assertTrue(HttpCache(self.cache_dir).get(self.url, fetch=expires.get).from_cache)
+
+        modified = FakeServer(**{"Last-Modified": email.utils.formatdate(now - 10 * 24 * 3600, usegmt=True)})
+        cache = HttpCache(os.path.join(self.test_dir, "modified"))
+        cache.get(self.url, fetch=modified.get)
+        self.assertTrue(cache.get(self.url, fetch=modified.get).from_cache)
+
+        for headers in [{"Cache-Control": "no-store, max-age=600"}, {"Content-Type": "application/pdf", "Cache-Control": "max-age=600"}]:
+            server = FakeServer(**headers)
+            cache = HttpCache(os.path.join(self.test_dir, "uncached"))
+            cache.get(self.url, fetch=server.get)
+            cache.get(self.url, fetch=server.get)
+            self.assertEqual(len(server.requests), 2)
+
+    def test_ttl_override(self):
+        """Test that a TTL makes responses fresh regardless of their headers, and only for that long"""
+        server = FakeServer()
+        cache = HttpCache(self.cache_dir, ttl=0.5)
+        cache.get(self.url, fetch=server.get)
+        self.assertTrue(cache.get(self.url, fetch=server.get).from_cache)
+        time.sleep(0.6)
+        self.assertFalse(cache.get(self.url, fetch=server.get).from_cache)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_browsers_cache_pages_only_when_given_a_cache(self):
+        """Test that a browser fetches every visit without a cache, and replays fresh pages with one"""
+        for http_cache, expected_requests in [(None, 2), (HttpCache(self.cache_dir), 1)]:
+            with self.subTest(cached=http_cache is not None):
+                server = FakeServer(**{"Cache-Control": "max-age=600"})
+                browser = SimpleTextBrowser(request_kwargs={}, http_cache=http_cache, http_client=server)
+                for _ in range(2):
+                    self.assertIn("Reference", browser.visit_page(self.url))
+                self.assertEqual(len(server.requests), expected_requests)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from agents.utils.http_client import HttpClient
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Serves the request's cookies over HTTP/1.1 keep-alive, and records how many requests it handles at once."""
+
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        with self.lock:
+            KeepAliveHandler.active += 1
+            KeepAliveHandler.peak = max(KeepAliveHandler.peak, KeepAliveHandler.active)
+        if self.path == "/slow":
+            time.sleep(0.2)
+        body = f"cookies: {self.headers.get('Cookie', '')}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.lock:
+            KeepAliveHandler.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        KeepAliveHandler.peak = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.host = f"127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        """Test that both backends send sequential requests to a host over one connection"""
+        for backend in ["requests", "httpx"]:
+            with self.subTest(backend=backend):
+                client = HttpClient(backend=backend)
+                for i in range(5):
+                    response = client.get(f"http://{self.host}/page", cookies={"session": "abc"}, stream=i % 2 == 0)
+                    self.assertEqual(response.text, "cookies: session=abc")
+                    self.assertEqual(response.headers["content-type"], "text/plain")
+
+                stats = client.stats()[self.host]
+                self.assertEqual((stats["requests"], stats["connections_opened"], stats["in_flight"]), (5, 1, 0))
+                client.close()
+
+    def test_per_host_limit(self):
+        """Test that no more than max_connections_per_host requests are sent to a host at once"""
+        client = HttpClient(max_connections_per_host=2)
+        with ThreadPoolExecutor(6) as executor:
+            responses = list(executor.map(lambda _: client.get(f"http://{self.host}/slow"), range(6)))
+
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertEqual(KeepAliveHandler.peak, 2)
+        self.assertLessEqual(client.stats()[self.host]["connections_opened"], 2)
+
+    def test_configuration(self):
+        """Test that invalid backends are rejected, and that copies of a client open their own connections"""
+        with self.assertRaises(ValueError):
+            HttpClient(backend="urllib")
+        with self.assertRaises(ValueError):
+            HttpClient(http2=True)
+
+        client = pickle.loads(pickle.dumps(HttpClient(max_connections_per_host=3, headers={"User-Agent": "test"})))
+        self.assertEqual(client.max_connections_per_host, 3)
+        self.assertEqual(client.get(f"http://{self.host}/page").status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
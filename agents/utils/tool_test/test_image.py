@@ -0,0 +1,78 @@
+import unittest
+import base64
+import io
+import os
+import shutil
+from types import SimpleNamespace
+from PIL import Image
+from agents.utils.mdconvert import ImageConverter, MarkdownConverter
+
+class FakeMlmClient:
+    """A stand-in for an OpenAI client, which records the images it is sent."""
+
+    def __init__(self):
+        self.images = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages):
+        prompt, image = messages[0]["content"]
+        header, data = image["image_url"]["url"].split(",", 1)
+        self.images.append((header, base64.b64decode(data)))
+        message = SimpleNamespace(content=f"Description {len(self.images)} of: {prompt['text']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+class TestImageConverter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.photo_path = os.path.join(self.test_dir, "photo.jpg")
+        Image.new("RGB", (3000, 2000), (200, 30, 30)).save(self.photo_path, quality=95)
+
+        self.client = FakeMlmClient()
+        self.converter = MarkdownConverter(mlm_client=self.client, mlm_model="test-model")
+        self.converter.register_page_converter(ImageConverter(max_dimension=512))
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_large_images_are_downscaled(self):
+        """Test that large images are downscaled and re-encoded before they are sent"""
+        self.converter.convert(self.photo_path)
+
+        header, data = self.client.images[0]
+        self.assertEqual(header, "data:image/jpeg;base64")
+        with Image.open(io.BytesIO(data)) as sent:
+            self.assertEqual(sent.size, (512, 341))
+
+    def test_small_and_transparent_images(self):
+        """Test that small images are sent as they are, and that transparency is kept"""
+        small_path = os.path.join(self.test_dir, "small.png")
+        Image.new("RGB", (100, 80)).save(small_path)
+        self.converter.convert(small_path)
+        with open(small_path, "rb") as fh:
+            self.assertEqual(self.client.images[0], ("data:image/png;base64", fh.read()))
+
+        logo_path = os.path.join(self.test_dir, "logo.png")
+        Image.new("RGBA", (1024, 1024), (0, 0, 0, 0)).save(logo_path)
+        self.converter.convert(logo_path)
+        header, data = self.client.images[1]
+        self.assertEqual(header, "data:image/png;base64")
+        with Image.open(io.BytesIO(data)) as sent:
+            self.assertEqual((sent.mode, sent.size), ("RGBA", (512, 512)))
+
+    def test_descriptions_are_cached(self):
+        """Test that descriptions are cached by image content and prompt"""
+        first = self.converter.convert(self.photo_path).text_content
+        copy_path = os.path.join(self.test_dir, "copy.jpg")
+        shutil.copy(self.photo_path, copy_path)
+        second = self.converter.convert(copy_path).text_content
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.client.images), 1)
+
+        self.converter.convert(self.photo_path, mlm_prompt="What color is it?")
+        self.assertEqual(len(self.client.images), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import io
+import os
+import tempfile
+from unittest import mock
+import requests
+from agents.utils.mdconvert import MarkdownConverter, PdfConverter
+from agents.utils.tool_test.pdf_samples import make_pdf
+
+def make_response(content, content_type, url):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["content-type"] = content_type
+    response.url = url
+    response.raw = io.BytesIO(content)
+    return response
+
+class TestInMemoryConversion(unittest.TestCase):
+    def setUp(self):
+        self.html = b"<html><head><title>Page</title></head><body><h1>Title</h1><p>Some text</p></body></html>"
+
+    def test_small_responses_do_not_touch_disk(self):
+        """Test that small responses are converted without a temporary file"""
+        converter = MarkdownConverter()
+        response = make_response(self.html, "text/html; charset=utf-8", "https://example.com/page.html")
+
+        with mock.patch.object(tempfile, "mkstemp", side_effect=AssertionError("wrote a temporary file")):
+            result = converter.convert_response(response)
+
+        self.assertEqual(result.title, "Page")
+        self.assertIn("# Title", result.text_content)
+
+    def test_large_responses_spill_to_disk(self):
+        """Test that payloads above the spill threshold are converted from a temporary file"""
+        converter = MarkdownConverter(spill_threshold=16)
+        response = make_response(self.html, "text/html", "https://example.com/page.html")
+
+        real_mkstemp = tempfile.mkstemp
+        created = []
+
+        def _mkstemp(*args, **kwargs):
+            handle, path = real_mkstemp(*args, **kwargs)
+            created.append(path)
+            return handle, path
+
+        with mock.patch.object(tempfile, "mkstemp", side_effect=_mkstemp):
+            result = converter.convert_response(response)
+
+        self.assertIn("# Title", result.text_content)
+        self.assertEqual(len(created), 1)
+        self.assertFalse(os.path.exists(created[0]))
+
+    def test_text_and_binary_streams(self):
+        """Test converting text and binary streams"""
+        converter = MarkdownConverter()
+
+        text_result = converter.convert_stream(io.StringIO("a  \r\nb"), file_extension=".txt")
+        self.assertEqual(text_result.text_content, "a\nb")
+
+        pdf_result = converter.convert_stream(io.BytesIO(make_pdf(["First page", "Second page"])))
+        self.assertIn("Second page", pdf_result.text_content)
+        self.assertEqual([page for page, _ in pdf_result.page_offsets], [1, 2])
+
+    def test_parallel_pdf_from_memory(self):
+        """Test that in-memory PDFs can be handed to the parallel engine"""
+        converter = MarkdownConverter()
+        converter.register_page_converter(PdfConverter(parallel_workers=2, parallel_min_pages=1))
+
+        pages = [f"Page {i}" for i in range(1, 6)]
+        result = converter.convert_stream(io.BytesIO(make_pdf(pages)))
+        self.assertEqual([page for page, _ in result.page_offsets], [1, 2, 3, 4, 5])
+
+if __name__ == '__main__':
+    unittest.main()
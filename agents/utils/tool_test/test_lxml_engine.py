@@ -0,0 +1,114 @@
+import unittest
+import io
+import random
+from unittest import mock
+import agents.utils.mdconvert as mdconvert
+from agents.utils.mdconvert import HtmlConverter, MarkdownConverter
+
+CASES = {
+    "headings": "<h1>Title</h1><h2> Sub  title </h2><h3>Third<br>line</h3><h6>Six</h6><p>After</p>",
+    "links": (
+        "<p>See <a href='https://example.com/a b'>the docs</a>, <a href='javascript:void(0)'>js</a>, "
+        "<a href='https://example.com'>https://example.com</a> and <a href='/rel' title='A \"T\"'>rel</a>.</p>"
+    ),
+    "images": (
+        "<p><img src='data:image/png;base64,AAAA' alt='inline data'> <img src='pic.png' alt='Pic' title='The pic'></p>"
+        "<h2>Icon <img src='i.png' alt='icon'></h2>"
+    ),
+    "tables": (
+        "<table><thead><tr><th>Name</th><th>Value</th></tr></thead><tbody><tr><td>a_b</td><td>1</td></tr>"
+        "<tr><td colspan='2'>wide</td></tr></tbody></table><table><tr><td>x</td><td>y</td></tr></table>"
+    ),
+    "lists": (
+        "<ul>\n  <li>One</li>\n  <li>Two\n    <ul>\n      <li>Nested</li>\n    </ul>\n  </li>\n</ul>\n"
+        "<ol start='3'>\n <li>Three</li>\n <li>Four</li>\n</ol>\n<p>End</p>"
+    ),
+    "inline": (
+        "<p>Some <b>bold</b>, <em> emphasis </em>, <code>x_y*z</code> and <del>gone</del>.</p>"
+        "<pre><code>def f(x):\n    return x_1\n</code></pre><blockquote><p>Quoted\ntext</p></blockquote><hr>"
+    ),
+}
+
+TAGS = [
+    "p", "div", "span", "a", "b", "em", "code", "pre", "ul", "ol", "li", "h1", "h3", "table", "thead", "tbody",
+    "tr", "td", "th", "blockquote", "br", "hr", "img", "sup", "script",
+]
+TEXTS = ["hello", " spaced  out ", "\n  ", " ", "under_score", "a*b", "x\ty", "https://example.com/x", "\n\nline\n"]
+ATTRIBUTES = {
+    "a": ['', ' href="https://example.com/a b"', ' href="javascript:x()"', ' href="hello"', ' href="/p" title="T"'],
+    "img": ['', ' src="data:image/png;base64,AAAA" alt="A"', ' src="x.png" title="t"'],
+    "td": ['', ' colspan="2"'],
+    "ol": ['', ' start="3"'],
+}
+
+def random_html(rng, depth=0):
+    """Generate a random, possibly ill-nested, HTML fragment."""
+    parts = []
+    for _ in range(rng.randint(0, 4)):
+        if depth > 4 or rng.random() < 0.35:
+            parts.append(rng.choice(TEXTS))
+        elif rng.random() < 0.1:
+            parts.append("<!-- comment -->")
+        else:
+            tag = rng.choice(TAGS)
+            attributes = rng.choice(ATTRIBUTES.get(tag, [""]))
+            if tag in ("br", "hr", "img"):
+                parts.append(f"<{tag}{attributes}>")
+            else:
+                parts.append(f"<{tag}{attributes}>{random_html(rng, depth + 1)}</{tag}>")
+    return "".join(parts)
+
+class TestLxmlEngine(unittest.TestCase):
+    def setUp(self):
+        self.converter = HtmlConverter()
+
+    def wrap(self, body):
+        return f"<html><head><title>Doc</title><style>p {{}}</style></head><body>\n{body}\n<script>var x;</script></body></html>"
+
+    def test_same_markdown_as_markdownify(self):
+        """Test that both engines produce the same Markdown for headings, links, images, tables and lists"""
+        for name, body in CASES.items():
+            with self.subTest(name):
+                expected = self.converter._convert(self.wrap(body))
+                actual = self.converter._convert(self.wrap(body), markdown_engine="lxml")
+                self.assertEqual(actual.text_content, expected.text_content)
+                self.assertEqual(actual.title, "Doc")
+
+    def test_same_markdown_on_random_documents(self):
+        """Test that both engines agree on random markup, given the same tree (both parsed by lxml)"""
+        for seed in range(300):
+            html = self.wrap(random_html(random.Random(seed)))
+            expected = self.converter._convert(html, html_parser="lxml")
+            actual = self.converter._convert(html, markdown_engine="lxml")
+            self.assertEqual(actual.text_content, expected.text_content, html)
+
+    def test_engine_selection(self):
+        """Test that the engine is selected per MarkdownConverter instance, without BeautifulSoup"""
+        page = self.wrap(CASES["tables"]).encode("utf-8")
+        expected = MarkdownConverter().convert_stream(io.BytesIO(page), file_extension=".html")
+
+        with mock.patch.object(mdconvert, "BeautifulSoup", side_effect=AssertionError("parsed with BeautifulSoup")):
+            result = MarkdownConverter(markdown_engine="lxml").convert_stream(io.BytesIO(page), file_extension=".html")
+
+        self.assertEqual(result.text_content, expected.text_content)
+        self.assertEqual(result.title, "Doc")
+        self.assertRaises(ValueError, MarkdownConverter, markdown_engine="html2text")
+
+    def test_wikipedia_pages(self):
+        """Test the Wikipedia converter with the lxml engine"""
+        page = (
+            "<html><head><title>Python - Wikipedia</title></head><body><div id='nav'>Menu</div>"
+            "<span class='mw-page-title-main'>Python</span><div id='mw-content-text'><p>A <b>language</b>.</p>"
+            "<ul><li>Fast</li><li>Fun</li></ul></div></body></html>"
+        ).encode("utf-8")
+        url = "https://en.wikipedia.org/wiki/Python"
+
+        expected = MarkdownConverter().convert_stream(io.BytesIO(page), file_extension=".html", url=url)
+        result = MarkdownConverter(markdown_engine="lxml").convert_stream(io.BytesIO(page), file_extension=".html", url=url)
+
+        self.assertEqual(result.title, "Python")
+        self.assertEqual(result.text_content, expected.text_content)
+        self.assertNotIn("Menu", result.text_content)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import random
+import re
+from agents.utils.mdconvert import DocumentConverterResult, MarkdownConverter, _TextNormalizer
+
+def regex_normalize(text):
+    """The normalization MarkdownConverter used to apply, with three full copies of the text."""
+    text = "\n".join([line.rstrip() for line in re.split(r"\r?\n", text)])
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+def random_text(rng, length):
+    alphabet = ["a", "b", " ", " ", "\t", "\n", "\n", "\n", "\r", "\r\n", "\x0b", " ", "\xa0", "é"]
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+def random_chunks(rng, text):
+    chunks = []
+    while text:
+        size = rng.randint(1, 8)
+        chunks.append(text[:size])
+        text = text[size:]
+    return chunks
+
+class TestTextNormalization(unittest.TestCase):
+    def test_matches_regex_normalization(self):
+        """Test that the single-pass normalizer matches the regex normalization exactly"""
+        rng = random.Random(0)
+        samples = ["", "\n", "\n\n\n", "a", "a  \r\n\r\n\r\n\r\nb \n", " \n \n \nx\n\n\n"]
+        samples += [random_text(rng, rng.randint(0, 200)) for _ in range(500)]
+
+        for text in samples:
+            expected = regex_normalize(text)
+            self.assertEqual("".join(_TextNormalizer().normalize([text])), expected, repr(text))
+            self.assertEqual("".join(_TextNormalizer().normalize(random_chunks(rng, text))), expected, repr(text))
+
+    def test_offsets_follow_the_text(self):
+        """Test that offsets of non-whitespace characters point at the same characters after normalization"""
+        rng = random.Random(1)
+        for _ in range(200):
+            text = random_text(rng, 150)
+            offsets = [i for i, char in enumerate(text) if not char.isspace()]
+            normalizer = _TextNormalizer(offsets)
+            normalized = "".join(normalizer.normalize(random_chunks(rng, text)))
+
+            self.assertEqual(len(normalizer.mapped_offsets), len(offsets))
+            for offset, mapped in zip(offsets, normalizer.mapped_offsets):
+                self.assertEqual(normalized[mapped], text[offset])
+
+    def test_converter_normalizes_results(self):
+        """Test that conversion results are normalized, with clamped page offsets"""
+        res = DocumentConverterResult(text_content="Page one   \n\n\n\n\nPage two\n", page_offsets=[(1, 0), (2, 16)])
+        MarkdownConverter()._normalize_result(res)
+
+        self.assertEqual(res.text_content, "Page one\n\nPage two\n")
+        self.assertEqual(res.page_offsets, [(1, 0), (2, 10)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def run_python(code):
+    """Run code in a fresh interpreter, whose imports are not affected by those of the test run."""
+    return subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+
+class TestPackageExports(unittest.TestCase):
+    def test_tools_do_not_build_the_agent(self):
+        """Test that importing a tool of the agent doesn't import the agent's module, which builds its model"""
+        output = run_python(
+            "import sys\n"
+            "import agents.WebBrowserAgent.tools.text_inspector_tool\n"
+            "print('agents.WebBrowserAgent.WebBrowserAgent' in sys.modules)"
+        )
+        self.assertEqual(output.strip(), "False")
+
+    def test_utilities_do_not_import_the_agent(self):
+        """Test that importing mdconvert doesn't import the agent and smolagents"""
+        output = run_python(
+            "import sys\n"
+            "import agents.utils.mdconvert\n"
+            "print('smolagents' in sys.modules, 'agents.WebBrowserAgent' in sys.modules)"
+        )
+        self.assertEqual(output.strip(), "False False")
+
+if __name__ == '__main__':
+    unittest.main()
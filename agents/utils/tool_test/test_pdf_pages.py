@@ -0,0 +1,81 @@
+import unittest
+import os
+import re
+import shutil
+import pdfminer.high_level
+from agents.utils.mdconvert import MarkdownConverter, PdfConverter
+from agents.utils.tool_test.pdf_samples import make_pdf
+
+class TestPdfPages(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.pdf_path = os.path.join(self.test_dir, "report.pdf")
+        with open(self.pdf_path, "wb") as fh:
+            fh.write(make_pdf([f"This is page number {i}" for i in range(1, 11)]))
+        self.converter = MarkdownConverter()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_full_extraction_matches_pdfminer(self):
+        """Test that page-by-page extraction matches a whole-document extraction"""
+        result = self.converter.convert(self.pdf_path)
+        raw = pdfminer.high_level.extract_text(self.pdf_path)
+        expected = re.sub(r"\n{3,}", "\n\n", "\n".join([line.rstrip() for line in re.split(r"\r?\n", raw)]))
+
+        self.assertEqual(result.text_content, expected)
+        self.assertEqual(len(result.page_offsets), 10)
+
+    def test_page_offsets_point_at_pages(self):
+        """Test that every recorded offset points at the start of its page's text"""
+        result = self.converter.convert(self.pdf_path)
+
+        for page, offset in result.page_offsets:
+            self.assertTrue(result.text_content[offset:].startswith(f"This is page number {page}"))
+
+    def test_page_range(self):
+        """Test extracting a subset of pages"""
+        result = self.converter.convert(self.pdf_path, pdf_page_range=(3, 5))
+
+        self.assertEqual([page for page, _ in result.page_offsets], [3, 4, 5])
+        self.assertIn("This is page number 3", result.text_content)
+        self.assertNotIn("This is page number 6", result.text_content)
+        self.assertNotIn("This is page number 2", result.text_content)
+
+    def test_character_budget_stops_early(self):
+        """Test that extraction stops once the character budget is reached"""
+        result = self.converter.convert(self.pdf_path, pdf_max_chars=40)
+
+        self.assertEqual([page for page, _ in result.page_offsets], [1, 2])
+        self.assertNotIn("This is page number 3", result.text_content)
+
+    def test_character_budget_counts_normalized_text(self):
+        """Test that a budget yields at least that much text once normalized, with lines padded with spaces"""
+        padded_path = os.path.join(self.test_dir, "padded.pdf")
+        with open(padded_path, "wb") as fh:
+            fh.write(make_pdf([f"Heading {i}\n" + "\n".join(["word" + " " * 40] * 10) for i in range(1, 11)]))
+        full_length = len(self.converter.convert(padded_path).text_content)
+
+        for text_limit in [1, 100, 400, 700, 1000]:
+            with self.subTest(text_limit=text_limit):
+                result = self.converter.convert(padded_path, pdf_max_chars=text_limit)
+                self.assertGreaterEqual(len(result.text_content), min(text_limit, full_length))
+
+    def test_parallel_engine_matches_serial(self):
+        """Test that the process-pool engine reassembles pages in order"""
+        serial = self.converter.convert(self.pdf_path)
+
+        parallel_converter = MarkdownConverter()
+        parallel_converter.register_page_converter(PdfConverter(parallel_workers=3, parallel_min_pages=2))
+        parallel = parallel_converter.convert(self.pdf_path)
+
+        self.assertEqual(parallel.text_content, serial.text_content)
+        self.assertEqual(parallel.page_offsets, serial.page_offsets)
+
+        ranged = parallel_converter.convert(self.pdf_path, pdf_page_range=(4, 9))
+        self.assertEqual([page for page, _ in ranged.page_offsets], [4, 5, 6, 7, 8, 9])
+
+if __name__ == '__main__':
+    unittest.main()
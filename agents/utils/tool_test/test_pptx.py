@@ -0,0 +1,58 @@
+import unittest
+import html
+import io
+import re
+import pptx
+from agents.utils.mdconvert import HtmlConverter, MarkdownConverter, PptxConverter
+from agents.utils.tool_test.pptx_samples import make_pptx
+
+def legacy_convert(data):
+    """The previous PptxConverter output: HTML tables, and the whole output stripped after every slide."""
+    converter = PptxConverter()
+    md_content = ""
+    for slide_num, slide in enumerate(pptx.Presentation(io.BytesIO(data)).slides, start=1):
+        md_content += f"\n\n<!-- Slide number: {slide_num} -->\n"
+        title = slide.shapes.title
+        for shape in slide.shapes:
+            if converter._is_picture(shape):
+                alt_text = shape._element._nvXxPr.cNvPr.attrib.get("descr", "")
+                filename = re.sub(r"\W", "", shape.name) + ".jpg"
+                md_content += "\n![" + (alt_text if alt_text else shape.name) + "](" + filename + ")\n"
+            if converter._is_table(shape):
+                html_table = "<html><body><table>"
+                for r, row in enumerate(shape.table.rows):
+                    tag = "th" if r == 0 else "td"
+                    html_table += "<tr>" + "".join(f"<{tag}>{html.escape(c.text)}</{tag}>" for c in row.cells) + "</tr>"
+                html_table += "</table></body></html>"
+                md_content += "\n" + HtmlConverter()._convert(html_table).text_content.strip() + "\n"
+            elif shape.has_text_frame:
+                md_content += ("# " + shape.text.lstrip() if shape == title else shape.text) + "\n"
+        md_content = md_content.strip()
+        if slide.has_notes_slide:
+            md_content += "\n\n### Notes:\n" + slide.notes_slide.notes_text_frame.text
+            md_content = md_content.strip()
+    return md_content.strip()
+
+class TestPptxConverter(unittest.TestCase):
+    def setUp(self):
+        self.deck = make_pptx(6)
+
+    def test_output_matches_previous_builder(self):
+        """Test that the linear builder and direct tables produce the previous output"""
+        result = PptxConverter().convert(io.BytesIO(self.deck), file_extension=".pptx")
+
+        self.assertEqual(result.text_content, legacy_convert(self.deck))
+        self.assertIn("| h\\_0 | h\\_1 | h\\_2 |\n| --- | --- | --- |\n| <1,0> a\\*b next |", result.text_content)
+
+    def test_parallel_slides_match_serial(self):
+        """Test that slides rendered in a process pool are reassembled in order"""
+        serial = MarkdownConverter().convert_stream(io.BytesIO(self.deck), file_extension=".pptx")
+
+        converter = MarkdownConverter()
+        converter.register_page_converter(PptxConverter(parallel_workers=2, parallel_min_slides=2))
+        parallel = converter.convert_stream(io.BytesIO(self.deck), file_extension=".pptx")
+
+        self.assertEqual(parallel.text_content, serial.text_content)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from agents.utils.http_cache import HttpCache
+from agents.utils.http_client import HttpClient
+from agents.utils.mdconvert import ConversionCache
+from agents.utils.prefetcher import Prefetcher
+from agents.WebBrowserAgent.tools.text_web_browser import SimpleTextBrowser
+
+class SlowPageHandler(BaseHTTPRequestHandler):
+    """Serves an HTML page per path after a delay, and records the paths it was asked for."""
+
+    protocol_version = "HTTP/1.1"
+    paths = []
+
+    def do_GET(self):
+        SlowPageHandler.paths.append(self.path)
+        time.sleep(0.3)
+        body = f"<html><head><title>Result {self.path}</title></head><body><p>Body of {self.path}</p></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        SlowPageHandler.paths = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_generations(self):
+        """Test that keys are loaded ahead of time, and that a new batch or another key cancels the current one"""
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+        seen_cancelled = []
+
+        def load(key, cancelled):
+            if key == "blocked":
+                started.set()
+                release.wait(5)
+                seen_cancelled.append(cancelled())
+                finished.set()
+            return key.upper()
+
+        prefetcher = Prefetcher(load, max_workers=1)
+        prefetcher.prefetch(["a", "b", "a"])
+        self.assertEqual(prefetcher.take("b"), "B")
+        self.assertEqual(prefetcher.take("a"), "A")
+
+        prefetcher.prefetch(["blocked", "queued"])
+        started.wait(5)
+        self.assertIsNone(prefetcher.take("elsewhere"))
+        release.set()
+        self.assertIsNone(prefetcher.take("queued"))
+        prefetcher.close()
+
+        finished.wait(5)
+        self.assertEqual(seen_cancelled, [True])
+        stats = prefetcher.stats()
+        self.assertEqual((stats["prefetched"], stats["hits"], stats["cancelled"]), (4, 2, 2))
+
+    def test_search_results_are_prefetched(self):
+        """Test that visiting a prefetched search result doesn't wait on a fetch, and that other visits cancel them"""
+        browser = SimpleTextBrowser(
+            downloads_folder=self.test_dir,
+            request_kwargs={},
+            http_cache=HttpCache(os.path.join(self.test_dir, "http")),
+            http_client=HttpClient(),
+            conversion_cache=ConversionCache(os.path.join(self.test_dir, "mdconvert")),
+            prefetch_results=2,
+        )
+        results = "".join(
+            f'<div class="g"><a href="{self.base}/{i}"><h3>Result {i}</h3></a><div class="VwiC3b">Snippet {i}</div></div>'
+            for i in range(1, 5)
+        )
+        browser._show_search_results("query", None, f"<html><body>{results}</body></html>")
+        self.assertIn("found 4 results", browser.page_content)
+        time.sleep(0.6)
+
+        start = time.time()
+        browser.visit_page(f"{self.base}/2")
+        self.assertLess(time.time() - start, 0.2)
+        self.assertEqual(browser.page_title, "Result /2")
+        self.assertIn("Body of /2", browser.viewport)
+        self.assertEqual(sorted(SlowPageHandler.paths), ["/1", "/2"])
+
+        browser.visit_page(f"{self.base}/3")
+        self.assertIn("Body of /3", browser.viewport)
+        self.assertIsNone(browser._prefetcher.take(f"{self.base}/1"))
+        self.assertEqual(SlowPageHandler.paths.count("/1"), 1)
+
+if __name__ == '__main__':
+    unittest.main()
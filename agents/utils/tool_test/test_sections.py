@@ -0,0 +1,81 @@
+import unittest
+import io
+import json
+import os
+import shutil
+import pandas as pd
+from agents.utils.mdconvert import ConversionCache, DocumentConverterResult, DocumentSection, MarkdownConverter
+from agents.utils.tool_test.pdf_samples import make_pdf
+from agents.utils.tool_test.pptx_samples import make_pptx
+
+HTML = (
+    "<html><body><h1>Intro</h1><p>Hello</p><h2>Setup_step</h2><pre><code># not a heading\nx = 1</code></pre>"
+    "<table><tr><th>a</th><th>b</th></tr><tr><td>1</td><td>2</td></tr></table>"
+    "<h2>Usage</h2><p>Use it</p><h1>End</h1></body></html>"
+)
+
+class TestSections(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.converter = MarkdownConverter()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def text_of(self, result, query):
+        section = result.find_section(query)
+        return result.text_content[section.start : section.end]
+
+    def test_headings_and_tables(self):
+        """Test that headings span up to the next heading of the same level, skipping code blocks"""
+        result = self.converter.convert_stream(io.BytesIO(HTML.encode()), file_extension=".html")
+
+        self.assertEqual(
+            [(s.kind, s.title, s.level) for s in result.sections],
+            [("heading", "Intro", 1), ("heading", "Setup_step", 2), ("table", "1", 0), ("heading", "Usage", 2), ("heading", "End", 1)],
+        )
+        self.assertTrue(self.text_of(result, "intro").endswith("Use it\n\n"))
+        self.assertTrue(self.text_of(result, "Setup_step").startswith("## Setup\\_step\n\n```\n# not a heading"))
+        self.assertEqual(self.text_of(result, "table 1"), "| a | b |\n| --- | --- |\n| 1 | 2 |")
+        self.assertEqual(self.text_of(result, "usag"), "## Usage\n\nUse it\n\n")
+        self.assertIsNone(result.find_section("Install"))
+
+    def test_pages_slides_and_sheets(self):
+        """Test the sections of paged documents, decks and workbooks"""
+        result = self.converter.convert_stream(io.BytesIO(make_pdf(["a", "b", "c"])), file_extension=".pdf")
+        self.assertEqual([s.name for s in result.sections], ["page 1", "page 2", "page 3"])
+        self.assertEqual(self.text_of(result, "page 2").strip(), "b")
+
+        result = self.converter.convert_stream(io.BytesIO(make_pptx(2)), file_extension=".pptx")
+        slide = self.text_of(result, "slide 2")
+        self.assertTrue(slide.startswith("<!-- Slide number: 2 -->"))
+        self.assertIn("Notes for slide 2", slide)
+        # Headings don't run past the end of their slide
+        self.assertNotIn("Slide number: 2", self.text_of(result, "Slide *1* title"))
+
+        xlsx_path = os.path.join(self.test_dir, "book.xlsx")
+        with pd.ExcelWriter(xlsx_path) as writer:
+            pd.DataFrame({"n": [1, 2]}).to_excel(writer, sheet_name="Sales", index=False)
+            pd.DataFrame({"m": [3]}).to_excel(writer, sheet_name="Costs", index=False)
+        result = self.converter.convert(xlsx_path)
+        self.assertEqual(self.text_of(result, "sheet sales"), "## Sales\n| n |\n| --- |\n| 1 |\n| 2 |\n\n")
+        self.assertEqual(self.text_of(result, "sheet Costs"), "## Costs\n| m |\n| --- |\n| 3 |")
+
+    def test_round_trip(self):
+        """Test that sections survive serialization and the conversion cache"""
+        result = self.converter.convert_stream(io.BytesIO(HTML.encode()), file_extension=".html")
+        restored = DocumentConverterResult.from_dict(json.loads(json.dumps(result.to_dict())))
+        self.assertEqual(restored.sections, result.sections)
+        self.assertIsInstance(restored.sections[0], DocumentSection)
+
+        html_path = os.path.join(self.test_dir, "page.html")
+        with open(html_path, "w") as fh:
+            fh.write(HTML)
+        converter = MarkdownConverter(cache=ConversionCache(os.path.join(self.test_dir, "cache")))
+        first = converter.convert(html_path)
+        self.assertEqual(converter.convert(html_path).sections, first.sections)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import io
+from unittest import mock
+import agents.utils.mdconvert as mdconvert
+from agents.utils.mdconvert import MarkdownConverter
+
+class TestSharedDom(unittest.TestCase):
+    def setUp(self):
+        self.html = (
+            "<html><head><title>Doc</title><script>var x = 1;</script></head>"
+            "<body><h2>Section</h2><p>Hello <a href='https://example.com/a b'>link</a></p></body></html>"
+        )
+
+    def test_html_family_converters_share_one_parse(self):
+        """Test that a YouTube page falling back to the HTML converter is only parsed once"""
+        converter = MarkdownConverter()
+        parses = []
+        real_soup = mdconvert.BeautifulSoup
+
+        def _counting_soup(*args, **kwargs):
+            parses.append(args[1])
+            return real_soup(*args, **kwargs)
+
+        # Without a <title>, the YouTube converter fails its title assertion and the HTML converter takes over
+        page = self.html.replace("<title>Doc</title>", "")
+        with mock.patch.object(mdconvert, "BeautifulSoup", side_effect=_counting_soup):
+            result = converter.convert_stream(
+                io.BytesIO(page.encode("utf-8")),
+                file_extension=".html",
+                url="https://www.youtube.com/watch?v=abc",
+            )
+
+        self.assertIn("## Section", result.text_content)
+        self.assertEqual(parses, ["html.parser"])
+        stats = converter.dispatch_stats()
+        self.assertEqual(stats["YouTubeConverter"]["errors"], 1)
+        self.assertEqual(stats["HtmlConverter"]["hits"], 1)
+
+    def test_lxml_parser_switch(self):
+        """Test that the lxml parser can be selected and produces the same Markdown"""
+        default = MarkdownConverter().convert_stream(io.BytesIO(self.html.encode("utf-8")), file_extension=".html")
+        fast = MarkdownConverter(html_parser="lxml").convert_stream(
+            io.BytesIO(self.html.encode("utf-8")), file_extension=".html"
+        )
+
+        self.assertEqual(fast.title, "Doc")
+        self.assertEqual(fast.text_content, default.text_content)
+        self.assertNotIn("var x", fast.text_content)
+
+if __name__ == '__main__':
+    unittest.main()
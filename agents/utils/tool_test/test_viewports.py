@@ -0,0 +1,37 @@
+import unittest
+import random
+from agents.WebBrowserAgent.tools.text_web_browser import split_viewports
+
+def reference_split(content, viewport_size):
+    """The character-by-character splitter that split_viewports replaces."""
+    bounds = []
+    start_idx = 0
+    while start_idx < len(content):
+        end_idx = min(start_idx + viewport_size, len(content))
+        while end_idx < len(content) and content[end_idx - 1] not in [" ", "\t", "\r", "\n"]:
+            end_idx += 1
+        bounds.append((start_idx, end_idx))
+        start_idx = end_idx
+    return bounds
+
+class TestSplitViewports(unittest.TestCase):
+    def test_matches_reference(self):
+        """Test that viewports end on the same whitespace as with the character-by-character splitter"""
+        rng = random.Random(0)
+        alphabet = "abcdefghij" * 5 + " \t\r\n" + "é中"
+        for _ in range(300):
+            content = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+            for viewport_size in [1, 2, 7, 50, 1000]:
+                with self.subTest(content=content, viewport_size=viewport_size):
+                    self.assertEqual(split_viewports(content, viewport_size), reference_split(content, viewport_size))
+
+    def test_edge_cases(self):
+        """Test words longer than a viewport, breaks on the last character of a viewport, and text with no breaks"""
+        cases = ["", "word", "a" * 30 + " tail", "abcd efgh ijkl", "abc\n" * 10, "x" * 25, " " * 12]
+        for content in cases:
+            with self.subTest(content=content):
+                self.assertEqual(split_viewports(content, 4), reference_split(content, 4))
+        self.assertEqual(split_viewports("abcd efgh", 4), [(0, 5), (5, 9)])
+
+if __name__ == '__main__':
+    unittest.main()
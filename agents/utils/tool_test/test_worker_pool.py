@@ -0,0 +1,167 @@
+import unittest
+import os
+import shutil
+import time
+from agents.utils.mdconvert import (
+    DocumentConverter,
+    DocumentConverterResult,
+    FileConversionException,
+    MarkdownConverter,
+    PdfConverter,
+    WavConverter,
+)
+from agents.utils.tool_test.pdf_samples import make_pdf
+from agents.utils.exiftool import shared_exiftool
+from agents.utils.worker_pool import WorkerCrashedError, WorkerPool
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+def _allocate(megabytes):
+    block = bytearray(megabytes * 1024 * 1024)
+    time.sleep(5)
+    return len(block)
+
+def _fail():
+    raise ValueError("bad input")
+
+def _exit():
+    os._exit(3)
+
+def _exiftool_lock_is_free():
+    lock = shared_exiftool()._lock
+    if not lock.acquire(timeout=1):
+        return False
+    lock.release()
+    return True
+
+class PathologicalConverter(DocumentConverter):
+    """Hangs on ".hang" files, and runs out of memory on ".bloat" files."""
+
+    file_extensions = [".hang", ".bloat"]
+
+    def convert(self, local_path, **kwargs):
+        if kwargs.get("file_extension") == ".hang":
+            time.sleep(60)
+        elif kwargs.get("file_extension") == ".bloat":
+            _allocate(512)
+        else:
+            return None
+        return DocumentConverterResult(text_content="done")
+
+class SlowConverter(DocumentConverter):
+    """Takes three seconds over ".slow" files, which it is given ten seconds for in isolated workers."""
+
+    file_extensions = [".slow"]
+    min_isolation_timeout = 10.0
+
+    def convert(self, local_path, **kwargs):
+        if kwargs.get("file_extension") != ".slow":
+            return None
+        time.sleep(3)
+        return DocumentConverterResult(text_content="slow but done")
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.pool = WorkerPool(max_workers=1, timeout=2, max_rss_bytes=256 * 1024 * 1024)
+
+    def tearDown(self):
+        self.pool.close()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_workers_are_reused(self):
+        """Test that calls run in the same worker, and that their exceptions are raised without losing it"""
+        pid = self.pool.run(_sleep, 0)
+        self.assertNotEqual(pid, os.getpid())
+        with self.assertRaises(ValueError):
+            self.pool.run(_fail)
+        self.assertEqual(self.pool.run(_sleep, 0), pid)
+        self.assertEqual(self.pool.stats()["started"], 1)
+
+    def test_hung_bloated_and_crashed_workers_are_replaced(self):
+        """Test that workers are killed on timeouts, memory overruns and crashes, and replaced on the next call"""
+        pid = self.pool.run(_sleep, 0)
+
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            self.pool.run(_sleep, 60)
+        self.assertLess(time.monotonic() - start, 10)
+
+        with self.assertRaises(MemoryError):
+            self.pool.run(_allocate, 512)
+        with self.assertRaises(WorkerCrashedError):
+            self.pool.run(_exit)
+
+        self.assertNotIn(self.pool.run(_sleep, 0), [pid, os.getpid()])
+        stats = self.pool.stats()
+        self.assertEqual((stats["timeouts"], stats["memory_kills"], stats["crashes"], stats["started"]), (1, 1, 1, 4))
+
+    def test_workers_are_not_forked(self):
+        """Test that workers don't inherit locks held by this process's threads when they start"""
+        with shared_exiftool()._lock:
+            self.assertTrue(self.pool.run(_exiftool_lock_is_free))
+
+    def test_isolated_conversions(self):
+        """Test that a converter that hangs or bloats fails its own conversion, and not the next ones"""
+        converter = MarkdownConverter(isolation_workers=1, isolation_timeout=2, isolation_max_rss=256 * 1024 * 1024)
+        converter.register_page_converter(PathologicalConverter())
+        paths = {}
+        for name in ["stuck.hang", "huge.bloat", "page.html"]:
+            paths[name] = os.path.join(self.test_dir, name)
+            with open(paths[name], "w") as fh:
+                fh.write("<html><body><h1>Fine</h1></body></html>")
+
+        with self.assertRaisesRegex(FileConversionException, "more than 2 seconds"):
+            converter.convert(paths["stuck.hang"])
+        with self.assertRaisesRegex(FileConversionException, "over the limit"):
+            converter.convert(paths["huge.bloat"])
+
+        result = converter.convert(paths["page.html"])
+        self.assertEqual(result.text_content.strip(), "# Fine")
+        self.assertEqual([s.title for s in result.sections], ["Fine"])
+        self.assertEqual(converter.dispatch_stats()["HtmlConverter"]["hits"], 1)
+        converter.close()
+
+    def test_timeouts_per_call_and_converter(self):
+        """Test that calls and converters can be given longer than the pool's timeout"""
+        self.assertNotEqual(self.pool.run(_sleep, 3, timeout=10), os.getpid())
+        with self.assertRaises(TimeoutError):
+            self.pool.run(_sleep, 60)
+
+        converter = MarkdownConverter(isolation_workers=1, isolation_timeout=2)
+        converter.register_page_converter(PathologicalConverter())
+        converter.register_page_converter(SlowConverter())
+        for name in ["recording.slow", "stuck.hang"]:
+            with open(os.path.join(self.test_dir, name), "w") as fh:
+                fh.write("data")
+
+        self.assertEqual(converter.convert(os.path.join(self.test_dir, "recording.slow")).text_content, "slow but done")
+        with self.assertRaisesRegex(FileConversionException, "more than 2 seconds"):
+            converter.convert(os.path.join(self.test_dir, "stuck.hang"))
+        converter.close()
+
+        # Audio converters are given hours by default, which can be configured
+        self.assertEqual(converter._isolation_timeout([".mp3"], None), 4 * 60 * 60)
+        converter.register_page_converter(WavConverter(min_isolation_timeout=8 * 60 * 60))
+        self.assertEqual(converter._isolation_timeout([".wav"], None), 8 * 60 * 60)
+
+    def test_parallel_converters_in_isolated_workers(self):
+        """Test that converters with a process pool of their own work in isolated workers, which can't start one"""
+        pdf_path = os.path.join(self.test_dir, "report.pdf")
+        with open(pdf_path, "wb") as fh:
+            fh.write(make_pdf([f"This is page number {i}" for i in range(1, 7)]))
+
+        converter = MarkdownConverter(isolation_workers=1)
+        converter.register_page_converter(PdfConverter(parallel_workers=2, parallel_min_pages=1))
+        text = converter.convert(pdf_path).text_content
+        self.assertEqual([n for n in range(1, 7) if f"page number {n}" in text], list(range(1, 7)))
+        stats = converter.dispatch_stats()["PdfConverter"]
+        self.assertEqual((stats["hits"], stats["errors"]), (1, 0))
+        converter.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from agents.utils.mdconvert import HtmlConverter, MarkdownConverter, XlsxConverter
+
+class TestXlsxConverter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.xlsx_path = os.path.join(self.test_dir, "book.xlsx")
+        self.frames = {
+            "mixed": pd.DataFrame({
+                "id": range(5),
+                "name_x": ["a*b", " x\n y ", "", None, "<tag> & </td>"],
+                "amount": [1.5, 10.123456789, np.nan, 3, 1e12],
+                "flag": [True, False, True, None, False],
+            }),
+            "empty": pd.DataFrame({"A": [], "B": []}),
+            "numbers": pd.DataFrame({"n": range(100), "half": np.arange(100) / 2}),
+        }
+        with pd.ExcelWriter(self.xlsx_path) as writer:
+            for name, frame in self.frames.items():
+                frame.to_excel(writer, sheet_name=name, index=False)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_direct_rendering_matches_html_rendering(self):
+        """Test that sheets rendered straight to Markdown match the DataFrame -> HTML -> Markdown output"""
+        expected = ""
+        for name, frame in pd.read_excel(self.xlsx_path, sheet_name=None).items():
+            html_content = frame.to_html(index=False)
+            expected += f"## {name}\n" + HtmlConverter()._convert(html_content).text_content.strip() + "\n\n"
+
+        result = MarkdownConverter().convert(self.xlsx_path)
+        self.assertEqual(result.text_content, expected.strip())
+
+    def test_row_and_column_caps(self):
+        """Test capping the rows and columns of each sheet"""
+        for read_only in (False, True):
+            converter = XlsxConverter(read_only=read_only, max_rows=3, max_cols=1)
+            text = converter.convert(self.xlsx_path, file_extension=".xlsx").text_content
+
+            self.assertIn("| n |\n| --- |\n| 0 |\n| 1 |\n| 2 |\n\nShowing the first 3 rows", text)
+            self.assertIn("the first 1 of 2 columns", text)
+            self.assertNotIn("| 3 |", text)
+
+    def test_head_tail_summary(self):
+        """Test keeping the first and last rows of long sheets, with their shape"""
+        for read_only in (False, True):
+            converter = XlsxConverter(read_only=read_only, head_tail_rows=2)
+            text = converter.convert(self.xlsx_path, file_extension=".xlsx").text_content
+            numbers = text.split("## numbers\n")[1]
+
+            self.assertEqual(
+                [line.split(" | ")[0] for line in numbers.split("\n")[2:7]], ["| 0", "| 1", "| ...", "| 98", "| 99"]
+            )
+            self.assertIn("Shape: 100 rows x 2 columns. Showing rows 1-2 and 99-100.", numbers)
+            self.assertIn("Shape: 0 rows x 2 columns.", text)
+
+    def test_read_only_streaming(self):
+        """Test converting a workbook streamed with openpyxl"""
+        text = XlsxConverter(read_only=True).convert(self.xlsx_path, file_extension=".xlsx").text_content
+
+        self.assertIn("## mixed\n| id | name\\_x | amount | flag |\n| --- | --- | --- | --- |", text)
+        self.assertIn("| 1 | x y | 10.123456789 | False |", text)
+        self.assertIn("| 3 | NaN | 3 | NaN |", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import io
+import os
+import shutil
+import zipfile
+from agents.utils.mdconvert import FileConversionException, MarkdownConverter, ZipConverter
+
+class TestZipConverter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        self.extract_dir = os.path.join(self.test_dir, "extracted")
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.zip_path = os.path.join(self.test_dir, "archive.zip")
+        with zipfile.ZipFile(self.zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("notes.txt", "Hello from the archive")
+            zf.writestr("data/table.csv", "a,b\n1,2\n")
+            zf.writestr("data/big.txt", "x" * 10000)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def make_converter(self, **kwargs):
+        converter = MarkdownConverter()
+        converter.register_page_converter(ZipConverter(extract_dir=self.extract_dir, **kwargs))
+        return converter
+
+    def test_eager_extraction(self):
+        """Test that archives are extracted and listed by default"""
+        result = self.make_converter().convert(self.zip_path)
+
+        self.assertEqual(result.title, "Extracted Files")
+        self.assertIn(f"* {self.extract_dir}/data/big.txt", result.text_content)
+        self.assertTrue(os.path.exists(os.path.join(self.extract_dir, "notes.txt")))
+
+    def test_lazy_listing_and_on_demand_extraction(self):
+        """Test that lazy archives are listed from the central directory, and members extracted when converted"""
+        converter = self.make_converter(lazy=True)
+        result = converter.convert(self.zip_path)
+
+        self.assertEqual(result.title, "Archive Contents")
+        self.assertIn(f"* {self.extract_dir}/data/big.txt (10000 bytes)", result.text_content)
+        self.assertEqual(os.listdir(self.extract_dir), [])
+
+        member = converter.convert(f"{self.extract_dir}/notes.txt")
+        self.assertEqual(member.text_content, "Hello from the archive")
+        self.assertEqual(os.listdir(self.extract_dir), ["notes.txt"])
+
+    def test_lazy_streams(self):
+        """Test listing an in-memory archive lazily"""
+        converter = self.make_converter(lazy=True)
+        with open(self.zip_path, "rb") as fh:
+            converter.convert_stream(io.BytesIO(fh.read()), file_extension=".zip")
+
+        member = converter.convert(f"{self.extract_dir}/data/table.csv")
+        self.assertIn("1,2", member.text_content)
+
+    def test_limits(self):
+        """Test that archives over the member or size limits are not extracted"""
+        result = self.make_converter(max_members=2).convert(self.zip_path)
+        self.assertIn("It was not extracted, since it exceeds the limit of 2 files.", result.text_content)
+        self.assertIn("* ... and 1 more files", result.text_content)
+        self.assertFalse(os.path.exists(os.path.join(self.extract_dir, "notes.txt")))
+
+        converter = self.make_converter(max_total_size=5000)
+        result = converter.convert(self.zip_path)
+        self.assertIn("10030 bytes uncompressed. It was not extracted, since it exceeds the limit of 5000", result.text_content)
+
+        converter.convert(f"{self.extract_dir}/notes.txt")
+        with self.assertRaises(FileConversionException):
+            converter.convert(f"{self.extract_dir}/data/big.txt")
+
+if __name__ == '__main__':
+    unittest.main()
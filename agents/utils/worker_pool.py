@@ -0,0 +1,267 @@
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Stands for the pool's own timeout in calls that don't override it
+_POOL_TIMEOUT: Any = object()
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process exits while running a call."""
+
+
+def _read_rss(pid: int) -> Optional[int]:
+    """Return the resident memory of a process in bytes, or None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid}/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def worker_context(start_method: Optional[str] = None) -> Any:
+    """
+    Return the multiprocessing context of `start_method`, or by default of "forkserver", or "spawn" where it is not
+    available. Worker processes are not forked from this one by default: its threads (prefetching, HTTP requests, the
+    exiftool daemon) may hold locks, pipes and pooled sockets at the time of the fork, which a forked child inherits.
+    """
+    if start_method is None:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
+
+def _worker_main(conn: Connection, initializer: Optional[Callable[..., None]], initargs: Tuple[Any, ...]) -> None:
+    """
+    Run the calls received on `conn` one at a time, and send back whether each succeeded and its result. An empty
+    message tells the parent that the worker is set up, so that its startup doesn't count towards a call's timeout.
+    """
+    if initializer is not None:
+        initializer(*initargs)
+    conn.send(None)
+    while True:
+        try:
+            call = conn.recv()
+        except EOFError:
+            return
+        if call is None:
+            return
+
+        func, args = call
+        try:
+            reply = (True, func(*args))
+        except BaseException as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception:
+            # The result or exception could not be pickled: nothing was written, so report that instead
+            conn.send((False, RuntimeError(f"The worker could not send back its reply:\n{traceback.format_exc()}")))
+
+
+class _Worker:
+    """A worker process, and the parent's end of the pipe it receives calls on."""
+
+    def __init__(
+        self, context: Any, initializer: Optional[Callable[..., None]], initargs: Tuple[Any, ...], generation: int
+    ):
+        # Workers started before the pool was last closed are stopped rather than reused
+        self.generation = generation
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, initargs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def call(
+        self, func: Callable[..., Any], args: Tuple[Any, ...], timeout: Optional[float], max_rss_bytes: Optional[int]
+    ) -> Tuple[bool, Any]:
+        """
+        Send a call, and wait for its reply while watching the worker's clock and memory. Raises TimeoutError,
+        MemoryError or WorkerCrashedError if the worker has to be given up on.
+        """
+        if not self.ready:
+            try:
+                self.conn.recv()
+            except (EOFError, OSError):
+                raise WorkerCrashedError(f"The worker process exited with code {self.exitcode()} while starting")
+            self.ready = True
+
+        self.conn.send((func, args))
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            # Memory is sampled every tenth of a second; without a cap, just wait for the reply or the deadline
+            wait = 0.1 if max_rss_bytes is not None else None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+                wait = remaining if wait is None else min(wait, remaining)
+
+            if self.conn.poll(wait):
+                try:
+                    return self.conn.recv()
+                except (EOFError, OSError):
+                    raise WorkerCrashedError(f"The worker process exited with code {self.exitcode()}")
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"The worker process took more than {timeout} seconds")
+            rss = self.rss()
+            if max_rss_bytes is not None and rss is not None and rss > max_rss_bytes:
+                raise MemoryError(f"The worker process used {rss} bytes of memory, over the limit of {max_rss_bytes}")
+
+    def rss(self) -> Optional[int]:
+        return _read_rss(self.process.pid)
+
+    def exitcode(self) -> Optional[int]:
+        self.process.join(1)
+        return self.process.exitcode
+
+    def stop(self) -> None:
+        """Ask the worker to exit, and kill it if it doesn't."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    A pool of reusable worker processes, each running one call at a time with a wall-clock timeout and a cap on its
+    resident memory.
+
+    Unlike multiprocessing.Pool, a worker that hangs or grows too large is killed on its own, and replaced on the next
+    call, while the other workers carry on. Workers are started on first use, and stay up between calls so that what
+    they import and initialize is paid for once. Calls may be made from many threads: each borrows an idle worker, and
+    waits for one if all `max_workers` are busy.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        timeout: Optional[float] = 120.0,
+        max_rss_bytes: Optional[int] = 2 * 1024 * 1024 * 1024,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize the pool, without starting any process.
+
+        Args:
+            max_workers: The number of worker processes. Defaults to 2
+            timeout: The number of seconds after which a call is abandoned and its worker killed, or None to wait for
+                it. Defaults to 120
+            max_rss_bytes: The resident memory above which a worker is killed, during a call, or recycled, after one,
+                or None for no limit. Only enforced where /proc is available. Defaults to 2 GiB
+            initializer: Called with `initargs` in each worker process when it starts
+            initargs: The arguments of `initializer`
+            start_method: The multiprocessing start method of the workers. Defaults to that of `worker_context`
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_bytes
+        self._initializer = initializer
+        self._initargs = initargs
+        self._start_method = start_method
+        self._context = worker_context(start_method)
+
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._generation = 0
+        self._stats = {"calls": 0, "started": 0, "timeouts": 0, "memory_kills": 0, "crashes": 0, "recycled": 0}
+
+    def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = _POOL_TIMEOUT) -> Any:
+        """
+        Call a picklable function in a worker process, and return its result or raise its exception. `timeout`
+        overrides the pool's for this call.
+
+        Raises:
+            TimeoutError: If the call took more than `timeout` seconds
+            MemoryError: If the worker grew beyond `max_rss_bytes` during the call
+            WorkerCrashedError: If the worker exited during the call
+        """
+        if timeout is _POOL_TIMEOUT:
+            timeout = self.timeout
+        with self._slots:
+            worker = self._checkout()
+            try:
+                succeeded, value = worker.call(func, args, timeout, self.max_rss_bytes)
+            except BaseException as e:
+                worker.kill()
+                with self._lock:
+                    self._stats["calls"] += 1
+                    if isinstance(e, TimeoutError):
+                        self._stats["timeouts"] += 1
+                    elif isinstance(e, MemoryError):
+                        self._stats["memory_kills"] += 1
+                    elif isinstance(e, WorkerCrashedError):
+                        self._stats["crashes"] += 1
+                raise
+
+            # Workers that kept too much memory after a call are replaced rather than reused
+            rss = worker.rss()
+            recycle = self.max_rss_bytes is not None and rss is not None and rss > self.max_rss_bytes
+            with self._lock:
+                self._stats["calls"] += 1
+                self._stats["recycled"] += recycle
+                reuse = not recycle and worker.generation == self._generation
+                if reuse:
+                    self._idle.append(worker)
+            if not reuse:
+                worker.stop()
+
+        if not succeeded:
+            raise value
+        return value
+
+    def close(self) -> None:
+        """Stop the idle workers. Workers busy with a call are stopped when they are done with it."""
+        with self._lock:
+            workers, self._idle = self._idle, []
+            self._generation += 1
+        for worker in workers:
+            worker.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters of calls, started workers, and workers killed or recycled."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _checkout(self) -> _Worker:
+        """Take an idle worker that is still alive, or start a new one."""
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.conn.close()
+            self._stats["started"] += 1
+            generation = self._generation
+        return _Worker(self._context, self._initializer, self._initargs, generation)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Processes, pipes and locks stay with the process that started them: copies start their own workers
+        state = self.__dict__.copy()
+        for attribute in ["_slots", "_lock", "_idle", "_context"]:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._context = worker_context(self._start_method)
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self._idle = []
@@ -0,0 +1,67 @@
+"""
+Time DocxConverter on a synthetic image-heavy document, with mammoth's default data URIs and each image mode.
+
+    python -m benchmarks.bench_docx_images --images 200 --image-kib 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Tuple
+
+import mammoth
+
+from agents.utils.mdconvert import DocxConverter, HtmlConverter, MarkdownConverter
+from agents.utils.tool_test.docx_samples import make_docx
+from agents.utils.tool_test.pptx_samples import PNG_BYTES
+
+
+class DataUriDocxConverter(DocxConverter):
+    """The previous converter: every image inlined as a data URI in the intermediate HTML."""
+
+    def convert(self, local_path, **kwargs):
+        if kwargs.get("file_extension", "").lower() != ".docx":
+            return None
+        with open(local_path, "rb") as docx_file:
+            return HtmlConverter._convert(self, mammoth.convert_to_html(docx_file).value, **kwargs)
+
+
+def _time_conversion(converter: MarkdownConverter, path: str, repeat: int) -> Tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = converter.convert(path)
+        best = min(best, time.perf_counter() - start)
+    return best, len(result.text_content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--image-kib", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    image = PNG_BYTES + os.urandom(args.image_kib * 1024)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "images.docx")
+        with open(path, "wb") as fh:
+            fh.write(make_docx(args.images, image_bytes=image, distinct_images=args.images))
+
+        variants = [
+            ("data URIs (previous)", DataUriDocxConverter()),
+            ("truncate", DocxConverter()),
+            ("save", DocxConverter(image_mode="save", image_dir=os.path.join(temp_dir, "images"))),
+            ("drop", DocxConverter(image_mode="drop")),
+            ("drop, mammoth engine", DocxConverter(image_mode="drop", engine="mammoth")),
+        ]
+        print(f"{'mode':<22} {'time (s)':>9} {'output chars':>13}")
+        for name, docx_converter in variants:
+            converter = MarkdownConverter()
+            converter.register_page_converter(docx_converter)
+            elapsed, size = _time_conversion(converter, path, args.repeat)
+            print(f"{name:<22} {elapsed:>9.2f} {size:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare the throughput of the HTML-to-Markdown engines of MarkdownConverter, on a synthetic page or on HTML files.
+
+    python -m benchmarks.bench_html_engines --sections 2000
+    python -m benchmarks.bench_html_engines --files page1.html page2.html
+"""
+import argparse
+import io
+import time
+
+from agents.utils.mdconvert import MarkdownConverter
+
+ENGINES = {
+    "markdownify (html.parser)": MarkdownConverter(),
+    "markdownify (lxml parser)": MarkdownConverter(html_parser="lxml"),
+    "lxml engine": MarkdownConverter(markdown_engine="lxml"),
+}
+
+SECTION = """
+<h2>Section {i}</h2>
+<p>Paragraph {i} with <a href="https://example.com/page/{i}">a link</a>, some <b>bold</b> and <em>emphasized</em> text,
+and an image <img src="data:image/png;base64,{data}" alt="inline {i}">.</p>
+<ul>
+  <li>First item of list {i}</li>
+  <li>Second item <code>snake_case_{i}</code>
+    <ol><li>Nested one</li><li>Nested two</li></ol>
+  </li>
+</ul>
+<table>
+  <thead><tr><th>Key</th><th>Value</th><th>Notes</th></tr></thead>
+  <tbody>
+    <tr><td>alpha</td><td>{i}</td><td>first row</td></tr>
+    <tr><td>beta</td><td>{j}</td><td colspan="1">second row</td></tr>
+  </tbody>
+</table>
+"""
+
+
+def _synthetic_page(num_sections: int) -> bytes:
+    body = "".join(SECTION.format(i=i, j=i * 2, data="A" * 200) for i in range(num_sections))
+    return f"<html><head><title>Synthetic</title></head><body>{body}</body></html>".encode("utf-8")
+
+
+def _time_conversion(converter: MarkdownConverter, page: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert_stream(io.BytesIO(page), file_extension=".html")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=1000, help="Size of the synthetic page")
+    parser.add_argument("--files", nargs="*", default=[], help="HTML files to convert instead of the synthetic page")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.files:
+        with open(path, "rb") as fh:
+            pages.append((path, fh.read()))
+    if not pages:
+        pages.append((f"synthetic ({args.sections} sections)", _synthetic_page(args.sections)))
+
+    for name, page in pages:
+        print(f"{name}: {len(page) / 1e6:.1f} MB")
+        baseline = None
+        for engine, converter in ENGINES.items():
+            elapsed = _time_conversion(converter, page, args.repeat)
+            baseline = baseline or elapsed
+            print(f"  {engine:<28} {elapsed:>7.2f} s {len(page) / 1e6 / elapsed:>7.2f} MB/s {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
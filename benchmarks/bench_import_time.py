@@ -0,0 +1,71 @@
+"""
+Measure the cold import cost of mdconvert, and of the converter backends it now imports on first use, with
+`python -X importtime` in fresh interpreters.
+
+    python -m benchmarks.bench_import_time --repeat 5 --top 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = [
+    "mammoth",
+    "openpyxl",
+    "pandas",
+    "pdfminer.pdfinterp",
+    "pptx",
+    "pydub",
+    "speech_recognition",
+    "youtube_transcript_api",
+]
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Import `module` in a fresh interpreter, and return the cumulative import time of every module, in microseconds."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _best_import_times(module: str, repeat: int) -> Dict[str, int]:
+    runs = [_import_times(module) for _ in range(repeat)]
+    return {name: min(run.get(name, 0) for run in runs) for name in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="agents.utils.mdconvert")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    times = _best_import_times(args.module, args.repeat)
+    print(f"{'module':<40} {'cumulative (ms)':>16}")
+    for name, cumulative in sorted(times.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<40} {cumulative / 1000:>16.1f}")
+
+    print()
+    print(f"{'backend imported on first use':<40} {'cumulative (ms)':>16} {'at import':>10}")
+    for backend in BACKENDS:
+        cumulative = _best_import_times(backend, args.repeat)[backend]
+        print(f"{backend:<40} {cumulative / 1000:>16.1f} {'yes' if backend in times else 'no':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compare the serial and the parallel PDF engines of PdfConverter on synthetic documents.
+
+    python -m benchmarks.bench_pdf_parallel --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from agents.utils.mdconvert import MarkdownConverter, PdfConverter
+from agents.utils.tool_test.pdf_samples import make_pdf
+
+
+def _synthetic_pdf(num_pages: int, lines_per_page: int) -> bytes:
+    line = "The quick brown fox jumps over the lazy dog, page %d line %d."
+    return make_pdf(["\n".join(line % (p, i) for i in range(lines_per_page)) for p in range(num_pages)])
+
+
+def _time_conversion(converter: MarkdownConverter, path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--lines-per-page", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    serial = MarkdownConverter()
+    parallel = MarkdownConverter()
+    parallel.register_page_converter(PdfConverter(parallel_workers=args.workers, parallel_min_pages=1))
+
+    print(f"{'pages':>6} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_pages in args.pages:
+            path = os.path.join(temp_dir, f"synthetic_{num_pages}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(_synthetic_pdf(num_pages, args.lines_per_page))
+
+            serial_time = _time_conversion(serial, path, args.repeat)
+            parallel_time = _time_conversion(parallel, path, args.repeat)
+            print(f"{num_pages:>6} {serial_time:>11.2f} {parallel_time:>13.2f} {serial_time / parallel_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Time PptxConverter on synthetic decks, rendering slides serially and in a process pool.
+
+    python -m benchmarks.bench_pptx --slides 100 500 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from agents.utils.mdconvert import MarkdownConverter, PptxConverter
+from agents.utils.tool_test.pptx_samples import make_pptx
+
+
+def _time_conversion(converter: MarkdownConverter, path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--slides", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--table-rows", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    serial = MarkdownConverter()
+    parallel = MarkdownConverter()
+    parallel.register_page_converter(PptxConverter(parallel_workers=args.workers, parallel_min_slides=1))
+
+    print(f"{'slides':>6} {'serial (s)':>11} {'slides/s':>9} {'parallel (s)':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_slides in args.slides:
+            path = os.path.join(temp_dir, f"synthetic_{num_slides}.pptx")
+            with open(path, "wb") as fh:
+                fh.write(make_pptx(num_slides, table_rows=args.table_rows))
+
+            serial_time = _time_conversion(serial, path, args.repeat)
+            parallel_time = _time_conversion(parallel, path, args.repeat)
+            print(
+                f"{num_slides:>6} {serial_time:>11.2f} {num_slides / serial_time:>9.0f} "
+                f"{parallel_time:>13.2f} {serial_time / parallel_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
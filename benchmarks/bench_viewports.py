@@ -0,0 +1,82 @@
+"""
+Time the browser's viewport splitting on large synthetic pages, against the character-by-character splitter it
+replaced.
+
+    python -m benchmarks.bench_viewports --megabytes 1 5 --viewport-size 5120
+"""
+import argparse
+import random
+import time
+
+from agents.WebBrowserAgent.tools.text_web_browser import split_viewports
+
+
+def _reference_split(content: str, viewport_size: int):
+    bounds = []
+    start_idx = 0
+    while start_idx < len(content):
+        end_idx = min(start_idx + viewport_size, len(content))
+        while end_idx < len(content) and content[end_idx - 1] not in [" ", "\t", "\r", "\n"]:
+            end_idx += 1
+        bounds.append((start_idx, end_idx))
+        start_idx = end_idx
+    return bounds
+
+
+def _make_page(num_chars: int, dense: bool = False, seed: int = 0) -> str:
+    """
+    Markdown-like text: words, lines and paragraphs, plus the occasional long URL. Dense pages are mostly long runs
+    without whitespace, like inlined data URIs or text extracted without spaces.
+    """
+    rng = random.Random(seed)
+    words = ["the", "conversion", "of", "documents", "into", "markdown", "text", "viewport", "page", "browser"]
+    parts = []
+    size = 0
+    while size < num_chars:
+        if dense and rng.random() < 0.5:
+            part = "data:image/png;base64," + "A" * rng.randint(2000, 20000)
+        elif rng.random() < 0.01:
+            part = "https://example.com/" + "x" * rng.randint(50, 300)
+        else:
+            part = rng.choice(words)
+        part += rng.choice([" "] * 12 + ["\n", "\n\n"])
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:num_chars]
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _compare(content: str, megabytes: float, dense: bool, args: argparse.Namespace) -> None:
+    bounds = split_viewports(content, args.viewport_size)
+    assert bounds == _reference_split(content, args.viewport_size)
+
+    reference_time = _best_of(lambda: _reference_split(content, args.viewport_size), args.repeat)
+    fast_time = _best_of(lambda: split_viewports(content, args.viewport_size), args.repeat)
+    print(
+        f"{megabytes:>5g} {'dense' if dense else 'prose':>6} {len(bounds):>10} "
+        f"{reference_time:>14.3f} {fast_time:>10.4f} {reference_time / fast_time:>7.0f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, nargs="+", default=[1, 5])
+    parser.add_argument("--viewport-size", type=int, default=1024 * 5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'MB':>5} {'page':>6} {'viewports':>10} {'reference (s)':>14} {'regex (s)':>10} {'speedup':>8}")
+    for megabytes in args.megabytes:
+        for dense in [False, True]:
+            _compare(_make_page(int(megabytes * 1024 * 1024), dense=dense), megabytes, dense, args)
+
+if __name__ == "__main__":
+    main()